@@ -0,0 +1,126 @@
+"""Benchmark ``compute_file_diff`` engines on large synthetic edits.
+
+Builds generated-looking files of 10k-200k lines, applies an edit pattern and
+times the previous approach (materialize ``difflib.unified_diff``, then
+truncate) against the diff engine in patience and Myers mode, with the text
+truncated to the preview size and untruncated.
+
+Usage:
+    python benchmarks/bench_diff.py [--sizes 10000,50000,200000]
+        [--max-lines 100] [--skip-difflib-above LINES]
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import time
+from collections.abc import Callable
+
+from deepagents_cli.diff_engine import DiffAlgorithm
+from deepagents_cli.file_ops import compute_file_diff
+
+
+def build_file(lines: int, seed: int = 0) -> list[str]:
+    """Generate source-like lines with realistic repetition (blank lines, braces)."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(lines):
+        kind = i % 10
+        if kind == 0:
+            out.append("")
+        elif kind == 9:
+            out.append("    }")
+        else:
+            out.append(f"    value_{i} = compute({rng.randint(0, 999)}, scale={i % 7})")
+    return out
+
+
+def scattered_edit(lines: list[str], seed: int = 1) -> list[str]:
+    """Change one line in every ~100."""
+    rng = random.Random(seed)
+    edited = list(lines)
+    for i in range(0, len(edited), 97):
+        edited[i] = f"    changed_{i} = {rng.random():.6f}"
+    return edited
+
+
+def block_edit(lines: list[str]) -> list[str]:
+    """Insert a 500-line block in the middle and delete 300 lines near the end."""
+    middle = len(lines) // 2
+    tail = len(lines) * 4 // 5
+    inserted = [f"    inserted_{i} = {i}" for i in range(500)]
+    return lines[:middle] + inserted + lines[middle:tail] + lines[tail + 300 :]
+
+
+def legacy_diff(before: str, after: str, max_lines: int | None) -> str | None:
+    """The previous implementation: full difflib diff, then truncation."""
+    diff_lines = list(
+        difflib.unified_diff(
+            before.splitlines(),
+            after.splitlines(),
+            fromfile="f (before)",
+            tofile="f (after)",
+            lineterm="",
+            n=3,
+        )
+    )
+    if not diff_lines:
+        return None
+    if max_lines is not None and len(diff_lines) > max_lines:
+        return "\n".join([*diff_lines[: max_lines - 1], "..."])
+    return "\n".join(diff_lines)
+
+
+def diff_text(
+    before: str, after: str, max_lines: int | None, algorithm: DiffAlgorithm
+) -> str | None:
+    """The engine: structured diff, then text truncated to ``max_lines``."""
+    diff = compute_file_diff(before, after, "f", algorithm=algorithm)
+    return None if diff is None else diff.text(max_lines)
+
+
+def timed(fn: Callable[[], object]) -> float:
+    """Return the wall time of one call in milliseconds."""
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,50000,200000", help="Comma-separated line counts")
+    parser.add_argument("--max-lines", type=int, default=100, help="Preview truncation")
+    parser.add_argument(
+        "--skip-difflib-above",
+        type=int,
+        default=50000,
+        help="Skip the difflib baseline above this many lines",
+    )
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    header = f"{'lines':>8} {'edit':>10} {'variant':>26} {'truncated':>11} {'full':>11}"
+    print(header)
+    print("-" * len(header))
+    for size in sizes:
+        original = build_file(size)
+        before = "\n".join(original)
+        for edit_name, edit in (("scattered", scattered_edit), ("block", block_edit)):
+            after = "\n".join(edit(original))
+            variants: list[tuple[str, Callable[[int | None], object]]] = [
+                ("engine (patience)", lambda n: diff_text(before, after, n, "patience")),
+                ("engine (myers)", lambda n: diff_text(before, after, n, "myers")),
+            ]
+            if size <= args.skip_difflib_above:
+                variants.insert(0, ("difflib + truncate", lambda n: legacy_diff(before, after, n)))
+            for label, run in variants:
+                truncated = timed(lambda run=run: run(args.max_lines))
+                full = timed(lambda run=run: run(None))
+                print(f"{size:>8,} {edit_name:>10} {label:>26} {truncated:>9.1f}ms {full:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
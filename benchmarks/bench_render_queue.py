@@ -0,0 +1,168 @@
+"""Benchmark chunk consumption with inline vs. offloaded rendering.
+
+A synthetic model stream produces chunks at a fixed rate: markdown text
+fragments, with a large diff rendered every few hundred chunks. The terminal
+is simulated by a file whose writes take time proportional to their size (a
+slow SSH link). Chunks that are due but not yet read by the consumer are the
+backlog; with inline rendering every terminal write delays the next read,
+with ``RenderQueue`` the consumer only enqueues work.
+
+Usage:
+    python benchmarks/bench_render_queue.py [--chunks N] [--rate PER_SECOND]
+        [--bandwidth BYTES_PER_SECOND] [--diff-every N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import statistics
+import time
+from collections.abc import AsyncIterator
+
+from rich.console import Console
+from rich.syntax import Syntax
+
+from deepagents_cli.markdown_stream import MarkdownStream
+from deepagents_cli.render_queue import RenderQueue
+
+_WORDS = "the agent streams **markdown** with `code` and lists of items while it works".split()
+
+
+class SlowTerminal(io.StringIO):
+    """Text sink that blocks like a terminal with limited bandwidth."""
+
+    def __init__(self, bandwidth: float) -> None:
+        super().__init__()
+        self.bandwidth = bandwidth
+        self.bytes_written = 0
+
+    def write(self, text: str) -> int:
+        self.bytes_written += len(text)
+        time.sleep(len(text) / self.bandwidth)
+        return len(text)
+
+
+def build_chunks(count: int, diff_every: int) -> list[tuple[str, str]]:
+    """Build the chunk sequence: ("text", fragment) and ("diff", diff text)."""
+    chunks: list[tuple[str, str]] = []
+    diff = "\n".join(
+        f"{'+' if i % 3 else '-'} value_{i} = compute({i}, scale=2.5)  # line {i}"
+        for i in range(400)
+    )
+    for i in range(count):
+        if diff_every and i and i % diff_every == 0:
+            chunks.append(("diff", diff))
+            continue
+        fragment = " ".join(_WORDS[(i + j) % len(_WORDS)] for j in range(4))
+        if i % 25 == 24:
+            fragment += "\n\n"
+        elif i % 40 == 39:
+            fragment += "\n- item\n"
+        chunks.append(("text", fragment + " "))
+    return chunks
+
+
+async def fixed_rate_stream(
+    chunks: list[tuple[str, str]], rate: float
+) -> AsyncIterator[tuple[float, tuple[str, str]]]:
+    """Yield chunks no earlier than their scheduled time, with that time."""
+    interval = 1 / rate
+    start = time.perf_counter()
+    for index, chunk in enumerate(chunks):
+        due = start + index * interval
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield due, chunk
+
+
+async def consume(
+    chunks: list[tuple[str, str]], rate: float, bandwidth: float, *, offload: bool
+) -> dict:
+    """Consume the stream, rendering inline or through a RenderQueue."""
+    console = Console(file=SlowTerminal(bandwidth), width=100, force_terminal=False)
+    stream = MarkdownStream(console, use_live=False)
+    interval = 1 / rate
+
+    def render_diff(text: str) -> None:
+        stream.finish()
+        console.print(Syntax(text, "diff", theme="monokai"))
+
+    queue = RenderQueue() if offload else None
+    lags: list[float] = []
+    started = time.perf_counter()
+    async for due, (kind, payload) in fixed_rate_stream(chunks, rate):
+        lags.append(time.perf_counter() - due)
+        if queue is not None:
+            await queue.throttle()
+            if kind == "text":
+                queue.append("markdown", stream.feed, payload)
+            else:
+                queue.call(render_diff, payload)
+        elif kind == "text":
+            stream.feed(payload)
+        else:
+            render_diff(payload)
+    consumed = time.perf_counter() - started
+
+    if queue is not None:
+        queue.call(stream.finish)
+        await queue.aclose()
+    else:
+        stream.finish()
+    rendered = time.perf_counter() - started
+
+    lags.sort()
+    return {
+        "consumed_s": consumed,
+        "rendered_s": rendered,
+        "lag_p50_ms": statistics.median(lags) * 1000,
+        "lag_p95_ms": lags[int(len(lags) * 0.95) - 1] * 1000,
+        "lag_max_ms": lags[-1] * 1000,
+        "max_backlog": max(int(lag / interval) for lag in lags),
+        "stats": queue.stats if queue is not None else None,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000, help="Number of chunks")
+    parser.add_argument("--rate", type=float, default=200, help="Chunks per second")
+    parser.add_argument(
+        "--bandwidth", type=float, default=200_000, help="Terminal bytes per second"
+    )
+    parser.add_argument("--diff-every", type=int, default=250, help="Chunks between diffs")
+    args = parser.parse_args()
+
+    chunks = build_chunks(args.chunks, args.diff_every)
+    ideal = len(chunks) / args.rate
+    print(
+        f"Streaming {len(chunks):,} chunks at {args.rate:g}/s ({ideal:.1f} s) "
+        f"to a {args.bandwidth / 1000:g} KB/s terminal"
+    )
+
+    for label, offload in (("inline rendering", False), ("RenderQueue", True)):
+        result = asyncio.run(consume(chunks, args.rate, args.bandwidth, offload=offload))
+        print(f"  {label}:")
+        print(
+            f"    stream consumed in {result['consumed_s']:6.2f} s, "
+            f"output done in {result['rendered_s']:6.2f} s"
+        )
+        print(
+            f"    read lag p50 {result['lag_p50_ms']:8.1f} ms   p95 {result['lag_p95_ms']:8.1f} ms"
+            f"   max {result['lag_max_ms']:8.1f} ms"
+        )
+        print(f"    max chunk backlog: {result['max_backlog']:,}")
+        stats = result["stats"]
+        if stats is not None:
+            print(
+                f"    render ops: {stats.submitted:,} submitted, {stats.coalesced:,} coalesced, "
+                f"{stats.batches:,} batches, max queue depth {stats.max_backlog:,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
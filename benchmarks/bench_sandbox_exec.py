@@ -0,0 +1,63 @@
+"""Benchmark sandbox command throughput: one at a time vs. batched execution.
+
+Runs the same short commands through ``LocalSandboxBackend`` (a local stand-in
+for a remote sandbox that adds a simulated round-trip latency to every call)
+with sequential ``execute`` calls, ``execute_many`` on worker threads and
+``aexecute_many`` on the event loop, and reports throughput for each.
+
+Usage:
+    python benchmarks/bench_sandbox_exec.py [--commands 200] [--latency 0.05]
+        [--concurrency 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from deepagents_cli.integrations.local import LocalSandboxBackend
+
+_COMMANDS = ["echo hello", "pwd", "true", "ls", "test -e missing-file"]
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=200, help="Number of commands")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Simulated round trip in seconds"
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Commands in flight")
+    args = parser.parse_args()
+
+    commands = [_COMMANDS[i % len(_COMMANDS)] for i in range(args.commands)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        backend = LocalSandboxBackend(temp_dir, latency=args.latency)
+        print(
+            f"Running {args.commands:,} commands with {args.latency * 1000:.0f} ms "
+            f"simulated latency, concurrency {args.concurrency}"
+        )
+        runs = {
+            "sequential execute": lambda: [backend.execute(command) for command in commands],
+            "execute_many": lambda: backend.execute_many(
+                commands, max_concurrency=args.concurrency
+            ),
+            "aexecute_many": lambda: asyncio.run(
+                backend.aexecute_many(commands, max_concurrency=args.concurrency)
+            ),
+        }
+        for label, run in runs.items():
+            start = time.perf_counter()
+            responses = run()
+            total = time.perf_counter() - start
+            failures = sum(response.exit_code not in (0, 1) for response in responses)
+            print(
+                f"  {label:>20}: {total:6.2f} s total, "
+                f"{len(responses) / total:8.1f} commands/s, {failures} failures"
+            )
+
+
+if __name__ == "__main__":
+    main()
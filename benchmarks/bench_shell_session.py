@@ -0,0 +1,63 @@
+"""Benchmark the shell tool with a fresh shell per command vs. persistent sessions.
+
+Runs the same sequence of short commands (``echo``, ``pwd``, ``true``, a
+failing ``test``) through ``ShellMiddleware`` with and without
+``persistent_sessions`` and reports total wall time and per-command latency.
+
+Usage:
+    python benchmarks/bench_shell_session.py [--commands 500] [--workspace DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from deepagents_cli.shell import ShellMiddleware
+
+_COMMANDS = ["echo hello", "pwd", "true", "test -e missing-file", "echo $HOME"]
+
+
+def run(middleware: ShellMiddleware, count: int) -> list[float]:
+    """Run ``count`` commands and return their latencies in milliseconds."""
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        middleware._run_shell_command(_COMMANDS[i % len(_COMMANDS)], tool_call_id=str(i))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=500, help="Number of commands")
+    parser.add_argument("--workspace", default=None, help="Working directory (default: temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace = args.workspace or temp_dir
+        print(f"Running {args.commands:,} short commands in {workspace}")
+        for label, persistent in (("fresh shell per command", False), ("persistent session", True)):
+            middleware = ShellMiddleware(
+                workspace_root=workspace, env=dict(os.environ), persistent_sessions=persistent
+            )
+            start = time.perf_counter()
+            latencies = run(middleware, args.commands)
+            total = time.perf_counter() - start
+            if middleware._sessions is not None:
+                middleware._sessions.close()
+            latencies.sort()
+            print(
+                f"  {label:>24}: {total:6.2f} s total, "
+                f"p50 {statistics.median(latencies):6.2f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95) - 1]:6.2f} ms, "
+                f"max {latencies[-1]:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
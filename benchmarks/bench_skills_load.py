@@ -0,0 +1,165 @@
+"""Benchmark SKILL.md frontmatter parsing: full-file regex vs streaming reader.
+
+Generates a skills library of mixed sizes (mostly small SKILL.md files, some
+with long instructions, a few very large ones) where a share of the skills
+have multi-line descriptions (plain continuation lines, ``|`` and ``>`` block
+scalars and quoted values). Parses every SKILL.md with the previous approach
+(read the whole file, then match ``key: value`` lines with a regex) and with
+the streaming frontmatter reader, then lists the library with ``list_skills``
+without an index and with a warm ``SkillsIndex``. Reports timings and how many
+descriptions each parser recovered in full.
+
+Usage:
+    python benchmarks/bench_skills_load.py [--skills 1000] [--small 2048]
+        [--medium 65536] [--large 1048576] [--multiline 0.3] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from deepagents_cli.skills.index import SKILLS_INDEX_FILE_NAME, SkillsIndex
+from deepagents_cli.skills.load import _parse_skill_metadata, list_skills
+
+WORDS = ("skill", "agent", "review", "deploy", "report", "query", "format", "check", "data")
+
+# Share of files with long instructions, and with very large ones
+MEDIUM_SHARE = 0.15
+LARGE_SHARE = 0.02
+
+
+def describe(rng: random.Random, words: int) -> str:
+    """A description of ``words`` random words."""
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def frontmatter(rng: random.Random, name: str, multiline: bool) -> tuple[str, str]:
+    """YAML frontmatter of one skill and the description a YAML parser reads from it."""
+    first, second = describe(rng, 8), describe(rng, 8)
+    if not multiline:
+        return f"name: {name}\ndescription: {first} {second}\n", f"{first} {second}"
+    style = rng.randrange(4)
+    if style == 0:
+        return f"name: {name}\ndescription: {first}\n  {second}\n", f"{first} {second}"
+    if style == 1:
+        return f"name: {name}\ndescription: |\n  {first}\n  {second}\n", f"{first}\n{second}"
+    if style == 2:
+        return f"name: {name}\ndescription: >-\n  {first}\n  {second}\n", f"{first} {second}"
+    return f'name: {name}\ndescription: "{first}\n  {second}"\n', f"{first} {second}"
+
+
+def make_library(
+    root: Path, skills: int, sizes: tuple[int, int, int], multiline: float
+) -> dict[str, str]:
+    """Write a synthetic skills library; returns the expected description of each skill."""
+    rng = random.Random(0)
+    small, medium, large = sizes
+    expected = {}
+    for i in range(skills):
+        name = f"skill-{i}"
+        header, description = frontmatter(rng, name, rng.random() < multiline)
+        roll = rng.random()
+        size = large if roll < LARGE_SHARE else medium if roll < MEDIUM_SHARE else small
+        body = f"\n# {name}\n\n" + describe(rng, size // 6)[:size] + "\n"
+        (root / name).mkdir()
+        (root / name / "SKILL.md").write_text(f"---\n{header}---\n{body}")
+        expected[name] = description
+    return expected
+
+
+def parse_full_read(skill_md_path: Path) -> dict[str, str] | None:
+    """The previous parser: read the whole file and match single-line ``key: value``."""
+    try:
+        content = skill_md_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    match = re.match(r"^---\s*\n(.*?)\n---\s*\n", content, re.DOTALL)
+    if not match:
+        return None
+    metadata: dict[str, str] = {}
+    for line in match.group(1).split("\n"):
+        kv_match = re.match(r"^(\w+):\s*(.+)$", line.strip())
+        if kv_match:
+            key, value = kv_match.groups()
+            metadata[key] = value.strip()
+    if "name" not in metadata or "description" not in metadata:
+        return None
+    return metadata
+
+
+def parse_streaming(skill_md_path: Path) -> dict[str, str] | None:
+    """The streaming frontmatter reader used by the skills loader."""
+    skill = _parse_skill_metadata(skill_md_path, "user")
+    return dict(skill) if skill is not None else None
+
+
+def median_of(repeat: int, run: Callable[[], object]) -> tuple[float, object]:
+    """Median seconds of ``repeat`` runs, and the result of the last one."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, default=1000, help="Number of skills")
+    parser.add_argument("--small", type=int, default=2048, help="Bytes of a typical SKILL.md")
+    parser.add_argument("--medium", type=int, default=64 * 1024, help="Bytes of a long SKILL.md")
+    parser.add_argument("--large", type=int, default=1024 * 1024, help="Bytes of a huge SKILL.md")
+    parser.add_argument(
+        "--multiline", type=float, default=0.3, help="Share of multi-line descriptions"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "skills"
+        root.mkdir()
+        sizes = (args.small, args.medium, args.large)
+        expected = make_library(root, args.skills, sizes, args.multiline)
+        paths = sorted(root.glob("*/SKILL.md"))
+        total = sum(path.stat().st_size for path in paths)
+        print(
+            f"Parsing {len(paths):,} SKILL.md files ({total / 1024 / 1024:.1f} MiB, "
+            f"{args.multiline:.0%} multi-line descriptions), median of {args.repeat} runs"
+        )
+
+        parsers = (("full read + regex", parse_full_read), ("streaming", parse_streaming))
+        for label, parse in parsers:
+            seconds, results = median_of(
+                args.repeat, lambda parse=parse: [parse(path) for path in paths]
+            )
+            correct = sum(
+                meta is not None and meta["description"] == expected[meta["name"]]
+                for meta in results
+            )
+            print(
+                f"  {label:>24}: {seconds * 1000:8.1f} ms  "
+                f"{correct:,}/{len(paths):,} descriptions in full"
+            )
+
+        seconds, _ = median_of(args.repeat, lambda: list_skills(user_skills_dir=root))
+        print(f"  {'list_skills, no index':>24}: {seconds * 1000:8.1f} ms")
+
+        index_path = Path(tmp) / SKILLS_INDEX_FILE_NAME
+        list_skills(user_skills_dir=root, index=SkillsIndex(index_path))
+        seconds, _ = median_of(
+            args.repeat, lambda: list_skills(user_skills_dir=root, index=SkillsIndex(index_path))
+        )
+        print(f"  {'list_skills, warm index':>24}: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark parsing of streamed tool-call arguments.
+
+Replays the argument stream of a large ``write_file`` call and compares the
+incremental ``ToolArgsParser`` with the previous approach of re-joining every
+fragment and calling ``json.loads`` on the whole buffer after each chunk.
+
+Usage:
+    python benchmarks/bench_tool_args.py [--size BYTES] [--chunk-size CHARS]
+    python benchmarks/bench_tool_args.py --replay chunks.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from deepagents_cli.tool_args import ToolArgsParser
+
+
+def build_chunk_stream(size: int, chunk_size: int, seed: int = 0) -> list[str]:
+    """Build a chunk stream resembling a streamed 1 MB ``write_file`` call."""
+    rng = random.Random(seed)
+    line = 'print("hello, world")  # \\ "quoted" \t tabbed\n'
+    content = (line * (size // len(line) + 1))[:size]
+    payload = json.dumps({"file_path": "/workspace/generated/big_module.py", "content": content})
+    chunks = []
+    i = 0
+    while i < len(payload):
+        step = rng.randint(max(1, chunk_size // 2), chunk_size * 3 // 2)
+        chunks.append(payload[i : i + step])
+        i += step
+    return chunks
+
+
+def run_legacy(chunks: list[str]) -> tuple[float, float | None]:
+    """Join-and-parse on every chunk (the pre-incremental behavior)."""
+    start = time.perf_counter()
+    parts: list[str] = []
+    for chunk in chunks:
+        parts.append(chunk)
+        try:
+            json.loads("".join(parts))
+        except json.JSONDecodeError:
+            continue
+    return time.perf_counter() - start, None
+
+
+def run_incremental(chunks: list[str]) -> tuple[float, float | None]:
+    """Feed each chunk to a ToolArgsParser, recording when file_path is known."""
+    start = time.perf_counter()
+    parser = ToolArgsParser()
+    first_display: float | None = None
+    for chunk in chunks:
+        parser.feed(chunk)
+        if first_display is None and "file_path" in parser.fields:
+            first_display = time.perf_counter() - start
+    if not parser.complete:
+        msg = "Replay stream did not form a complete JSON object"
+        raise RuntimeError(msg)
+    return time.perf_counter() - start, first_display
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="Content size in bytes")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Average chunk size")
+    parser.add_argument("--replay", type=Path, help="JSON file containing a list of chunks")
+    args = parser.parse_args()
+
+    if args.replay:
+        chunks = json.loads(args.replay.read_text())
+    else:
+        chunks = build_chunk_stream(args.size, args.chunk_size)
+
+    total = sum(len(chunk) for chunk in chunks)
+    print(f"Replaying {len(chunks):,} chunks ({total:,} chars)")
+
+    legacy_time, _ = run_legacy(chunks)
+    incremental_time, first_display = run_incremental(chunks)
+
+    print(f"  join + json.loads per chunk: {legacy_time * 1000:10.1f} ms")
+    print(f"  ToolArgsParser.feed:         {incremental_time * 1000:10.1f} ms")
+    if first_display is not None:
+        print(f"  file_path available after:   {first_display * 1000:10.3f} ms")
+    if incremental_time:
+        print(f"  speedup: {legacy_time / incremental_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark workspace sync into a sandbox: initial, no-op and incremental pushes.
+
+Generates a project (source files plus an ignored ``build/`` directory) and
+mirrors it with ``WorkspaceSync`` into ``LocalSandboxBackend`` (a local
+stand-in for a remote sandbox that adds a simulated round-trip latency to
+every call and every file). Reports the initial push, a push with nothing
+changed, a push after editing a few files, and, for comparison, uploading every
+file with ``upload_files``.
+
+Usage:
+    python benchmarks/bench_workspace_sync.py [--files 2000] [--size 4096]
+        [--edits 10] [--latency 0.02]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from deepagents_cli.integrations.local import LocalSandboxBackend
+from deepagents_cli.integrations.workspace_sync import WorkspaceSync
+
+
+def make_project(root: Path, files: int, size: int) -> list[Path]:
+    """Write a synthetic project and return its (non-ignored) source files."""
+    rng = random.Random(0)
+    (root / ".gitignore").write_text("build/\n*.pyc\n")
+    sources = []
+    for i in range(files):
+        path = root / f"pkg{i % 25}" / f"module_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Source-like text so compression has something realistic to work on
+        words = [rng.choice(("def", "return", "self", "value", "import")) for _ in range(size // 6)]
+        path.write_text(" ".join(words)[:size])
+        sources.append(path)
+        if i % 4 == 0:
+            (root / "build" / f"module_{i}.pyc").parent.mkdir(exist_ok=True)
+            (root / "build" / f"module_{i}.pyc").write_bytes(b"\0" * size)
+    return sources
+
+
+def report(label: str, seconds: float, detail: str) -> None:
+    """Print one result line."""
+    print(f"  {label:>22}: {seconds:6.2f} s  {detail}")
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="Number of source files")
+    parser.add_argument("--size", type=int, default=4096, help="Bytes per file")
+    parser.add_argument("--edits", type=int, default=10, help="Files edited before re-sync")
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Simulated round trip in seconds"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as local, tempfile.TemporaryDirectory() as remote:
+        sources = make_project(Path(local), args.files, args.size)
+        backend = LocalSandboxBackend(remote, latency=args.latency)
+        sync = WorkspaceSync(backend, local, remote)
+        print(
+            f"Syncing {args.files:,} files of {args.size:,} bytes with "
+            f"{args.latency * 1000:.0f} ms simulated latency"
+        )
+
+        result = sync.push()
+        report("initial push", result.seconds, result.describe())
+        result = sync.push()
+        report("push, nothing changed", result.seconds, result.describe())
+
+        for path in random.Random(1).sample(sources, args.edits):
+            path.write_text(path.read_text() + "\n# edited " + random.choice(string.ascii_letters))
+        sources[0].unlink()
+        result = sync.push()
+        report(f"push, {args.edits} edits", result.seconds, result.describe())
+
+        reconnect = WorkspaceSync(backend, local, remote)
+        result = reconnect.push()
+        report("push to synced sandbox", result.seconds, result.describe())
+
+        files = [
+            (str(Path(remote) / path.relative_to(local)), path.read_bytes()) for path in sources[1:]
+        ]
+        start = time.perf_counter()
+        backend.upload_files(files)
+        report("upload_files, all files", time.perf_counter() - start, f"{len(files):,} files sent")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ from deepagents.backends.sandbox import SandboxBackendProtocol
 from langchain.agents.middleware import (
     InterruptOnConfig,
 )
-from langchain.agents.middleware.types import AgentState
+from langchain.agents.middleware.types import AgentMiddleware, AgentState
 from langchain.messages import ToolCall
 from langchain.tools import BaseTool
 from langchain_core.language_models import BaseChatModel
@@ -23,7 +23,9 @@ from deepagents_cli.agent_memory import AgentMemoryMiddleware
 from deepagents_cli.config import COLORS, config, console, get_default_coding_instructions, settings
 from deepagents_cli.integrations.sandbox_factory import get_default_working_dir
 from deepagents_cli.shell import ShellMiddleware
+from deepagents_cli.shell_cache import ShellResultCache
 from deepagents_cli.skills import SkillsMiddleware
+from deepagents_cli.skills.index import SKILLS_INDEX_FILE_NAME
 
 
 def list_agents() -> None:
@@ -335,6 +337,10 @@ def create_cli_agent(
     enable_memory: bool = True,
     enable_skills: bool = True,
     enable_shell: bool = True,
+    persistent_shell: bool = False,
+    cache_shell_results: bool = False,
+    cache_prompt_layout: bool = False,
+    max_concurrent_shell_commands: int = 4,
 ) -> tuple[Pregel, CompositeBackend]:
     """Create a CLI-configured agent with flexible options.
 
@@ -356,6 +362,15 @@ def create_cli_agent(
         enable_memory: Enable AgentMemoryMiddleware for persistent memory
         enable_skills: Enable SkillsMiddleware for custom agent skills
         enable_shell: Enable ShellMiddleware for local shell execution (only in local mode)
+        persistent_shell: Run local shell commands in long-lived bash sessions that keep
+                          the working directory and exported variables between commands
+        cache_shell_results: Answer repeated read-only shell commands (git status, ls,
+                             cat, ...) from a short-lived cache
+        cache_prompt_layout: Order the system prompt for provider prompt caching:
+                             static parts first, user-editable memory last, with
+                             an explicit cache breakpoint for Anthropic models
+        max_concurrent_shell_commands: Maximum number of local shell commands running
+                                       at once when the agent issues several in one turn
 
     Returns:
         2-tuple of (agent_graph, composite_backend)
@@ -383,6 +398,29 @@ def create_cli_agent(
     # Build middleware stack based on enabled features
     agent_middleware = []
 
+    # Middleware extending the system prompt (outermost first)
+    prompt_middleware: list[AgentMiddleware] = []
+    if enable_memory:
+        prompt_middleware.append(
+            AgentMemoryMiddleware(
+                settings=settings,
+                assistant_id=assistant_id,
+                cache_layout=cache_prompt_layout,
+            )
+        )
+    if enable_skills:
+        prompt_middleware.append(
+            SkillsMiddleware(
+                skills_dir=skills_dir,
+                assistant_id=assistant_id,
+                project_skills_dir=project_skills_dir,
+                index_path=settings.get_agent_dir(assistant_id) / SKILLS_INDEX_FILE_NAME,
+            )
+        )
+    if cache_prompt_layout:
+        # The skills list then lands in the static part, ahead of the memory
+        prompt_middleware.reverse()
+
     # CONDITIONAL SETUP: Local vs Remote Sandbox
     if sandbox is None:
         # ========== LOCAL MODE ==========
@@ -391,21 +429,8 @@ def create_cli_agent(
             routes={},  # No virtualization - use real paths
         )
 
-        # Add memory middleware
-        if enable_memory:
-            agent_middleware.append(
-                AgentMemoryMiddleware(settings=settings, assistant_id=assistant_id)
-            )
-
-        # Add skills middleware
-        if enable_skills:
-            agent_middleware.append(
-                SkillsMiddleware(
-                    skills_dir=skills_dir,
-                    assistant_id=assistant_id,
-                    project_skills_dir=project_skills_dir,
-                )
-            )
+        # Add memory and skills middleware
+        agent_middleware.extend(prompt_middleware)
 
         # Add shell middleware (only in local mode)
         if enable_shell:
@@ -413,6 +438,9 @@ def create_cli_agent(
                 ShellMiddleware(
                     workspace_root=str(Path.cwd()),
                     env=os.environ,
+                    persistent_sessions=persistent_shell,
+                    max_concurrent_commands=max_concurrent_shell_commands,
+                    result_cache=ShellResultCache() if cache_shell_results else None,
                 )
             )
     else:
@@ -422,21 +450,8 @@ def create_cli_agent(
             routes={},  # No virtualization
         )
 
-        # Add memory middleware
-        if enable_memory:
-            agent_middleware.append(
-                AgentMemoryMiddleware(settings=settings, assistant_id=assistant_id)
-            )
-
-        # Add skills middleware
-        if enable_skills:
-            agent_middleware.append(
-                SkillsMiddleware(
-                    skills_dir=skills_dir,
-                    assistant_id=assistant_id,
-                    project_skills_dir=project_skills_dir,
-                )
-            )
+        # Add memory and skills middleware
+        agent_middleware.extend(prompt_middleware)
 
         # Note: Shell middleware not used in sandbox mode
         # File operations and execute tool are provided by the sandbox backend
@@ -1,7 +1,7 @@
 """Middleware for loading agent-specific long-term memory into the system prompt."""
 
-import contextlib
 from collections.abc import Awaitable, Callable
+from pathlib import Path
 from typing import NotRequired, TypedDict, cast
 
 from langchain.agents.middleware.types import (
@@ -10,9 +10,15 @@ from langchain.agents.middleware.types import (
     ModelRequest,
     ModelResponse,
 )
+from langchain_core.messages import SystemMessage
 from langgraph.runtime import Runtime
 
 from deepagents_cli.config import Settings
+from deepagents_cli.prompt_cache import (
+    CACHE_BREAKPOINT,
+    PromptFragmentCache,
+    supports_cache_breakpoints,
+)
 
 
 class AgentMemoryState(AgentState):
@@ -168,12 +174,65 @@ DEFAULT_MEMORY_SNIPPET = """<user_memory>
 </project_memory>"""
 
 
+# Inode, size and mtime of a memory file when it was read
+_StatKey = tuple[int, int, int]
+
+
+class MemoryFileCache:
+    """Contents of memory files, re-read only when their stat changes.
+
+    A file is read again only when its inode, size or mtime differ from when
+    it was last read, so checking for edits costs one ``stat`` per file.
+    Unchanged memory is returned as the same string object.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._files: dict[Path, tuple[_StatKey, str]] = {}
+        # Last combined text by the stats of the files it was built from
+        self._combined: tuple[tuple[_StatKey, ...], str] | None = None
+
+    def read(self, path: Path) -> str | None:
+        """Return the text of ``path``, or None if it does not exist or is unreadable."""
+        try:
+            stat = path.stat()
+        except OSError:
+            self._files.pop(path, None)
+            return None
+        key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            text = path.read_text()
+        except (OSError, UnicodeDecodeError):
+            self._files.pop(path, None)
+            return None
+        self._files[path] = (key, text)
+        return text
+
+    def read_combined(self, paths: list[Path]) -> str | None:
+        """Return the texts of the existing ``paths`` joined by blank lines, or None."""
+        texts = [(path, text) for path in paths if (text := self.read(path)) is not None]
+        if not texts:
+            return None
+        key = tuple(self._files[path][0] for path, _text in texts)
+        if self._combined is None or self._combined[0] != key:
+            self._combined = (key, "\n\n".join(text for _path, text in texts))
+        return self._combined[1]
+
+
 class AgentMemoryMiddleware(AgentMiddleware):
     """Middleware for loading agent-specific long-term memory.
 
     This middleware loads the agent's long-term memory from a file (agent.md)
     and injects it into the system prompt. The memory is loaded once at the
     start of the conversation and stored in state.
+
+    By default the memory sections come first. With the cache-aware layout the
+    static part (base prompt and long-term memory docs) comes first and the
+    user-editable memory last, so a memory edit keeps the cached prompt
+    prefix; for Anthropic models the static part ends with a cache breakpoint.
     """
 
     state_schema = AgentMemoryState
@@ -184,6 +243,7 @@ class AgentMemoryMiddleware(AgentMiddleware):
         settings: Settings,
         assistant_id: str,
         system_prompt_template: str | None = None,
+        cache_layout: bool = False,
     ) -> None:
         """Initialize the agent memory middleware.
 
@@ -192,6 +252,8 @@ class AgentMemoryMiddleware(AgentMiddleware):
             assistant_id: The agent identifier.
             system_prompt_template: Optional custom template for injecting
                 agent memory into system prompt.
+            cache_layout: Put the memory sections after the static prompt, for
+                provider prompt caching.
         """
         self.settings = settings
         self.assistant_id = assistant_id
@@ -206,47 +268,86 @@ class AgentMemoryMiddleware(AgentMiddleware):
         self.project_root = settings.project_root
 
         self.system_prompt_template = system_prompt_template or DEFAULT_MEMORY_SNIPPET
+        self.cache_layout = cache_layout
+
+        # Composed system prompts by (base prompt, user memory, project memory)
+        self._prompt_cache = PromptFragmentCache()
+        # Static prompt parts by (base prompt, whether a project agent.md was loaded)
+        self._static_cache = PromptFragmentCache()
+        # Memory sections by (user memory, project memory)
+        self._memory_cache = PromptFragmentCache()
+        # Long-term memory docs by whether a project agent.md was loaded
+        self._longterm_cache = PromptFragmentCache(max_entries=2)
+
+        # agent.md contents, re-read only when the files change
+        self._user_memory_files = MemoryFileCache()
+        self._project_memory_files = MemoryFileCache()
+
+    def _refresh_memory(self, state: AgentMemoryState) -> AgentMemoryStateUpdate | None:
+        """Update the memory in state from the agent.md files that changed.
+
+        Only the keys whose content differs from the state are returned. A
+        memory file that was deleted clears its key.
+        """
+        result: AgentMemoryStateUpdate = {}
+
+        user_path = self.settings.get_user_agent_md_path(self.assistant_id)
+        user_memory = self._user_memory_files.read(user_path) or ""
+        if user_memory != state.get("user_memory", ""):
+            result["user_memory"] = user_memory
+
+        project_paths = self.settings.get_project_agent_md_paths()
+        project_memory = self._project_memory_files.read_combined(project_paths) or ""
+        if project_memory != state.get("project_memory", ""):
+            result["project_memory"] = project_memory
+
+        return result or None
 
     def before_agent(
         self,
         state: AgentMemoryState,
         runtime: Runtime,
-    ) -> AgentMemoryStateUpdate:
+    ) -> AgentMemoryStateUpdate | None:
         """Load agent memory from file before agent execution.
 
-        Loads both user agent.md and project-specific agent.md if available.
-        Only loads if not already present in state.
-
-        Dynamically checks for file existence on every call to catch user updates.
+        Loads both the user agent.md and the project agent.md files (from
+        ``.deepagents/agent.md`` and the project root, combined if both
+        exist). Files are re-read only when their stat changed since they
+        were last read.
 
         Args:
             state: Current agent state.
             runtime: Runtime context.
 
         Returns:
-            Updated state with user_memory and project_memory populated.
+            State update with the user_memory and project_memory that changed.
         """
-        result: AgentMemoryStateUpdate = {}
+        return self._refresh_memory(state)
 
-        # Load user memory if not already in state
-        if "user_memory" not in state:
-            user_path = self.settings.get_user_agent_md_path(self.assistant_id)
-            if user_path.exists():
-                with contextlib.suppress(OSError, UnicodeDecodeError):
-                    result["user_memory"] = user_path.read_text()
+    def before_model(
+        self,
+        state: AgentMemoryState,
+        runtime: Runtime,
+    ) -> AgentMemoryStateUpdate | None:
+        """Pick up memory edits made during the turn (e.g. by ``edit_file``).
+
+        Costs one ``stat`` per memory file unless a file changed.
 
-        # Load project memory if not already in state
-        if "project_memory" not in state:
-            project_path = self.settings.get_project_agent_md_path()
-            if project_path and project_path.exists():
-                with contextlib.suppress(OSError, UnicodeDecodeError):
-                    result["project_memory"] = project_path.read_text()
+        Args:
+            state: Current agent state.
+            runtime: Runtime context.
 
-        return result
+        Returns:
+            State update with the user_memory and project_memory that changed.
+        """
+        return self._refresh_memory(state)
 
     def _build_system_prompt(self, request: ModelRequest) -> str:
         """Build the complete system prompt with memory sections.
 
+        The prompt is memoized on its inputs, so while the memory and the base
+        prompt are unchanged every call gets the same string object.
+
         Args:
             request: The model request containing state and base system prompt.
 
@@ -259,8 +360,74 @@ class AgentMemoryMiddleware(AgentMiddleware):
         project_memory = state.get("project_memory")
         base_system_prompt = request.system_prompt
 
+        return self._prompt_cache.get(
+            (base_system_prompt, user_memory, project_memory),
+            lambda: self._compose_system_prompt(base_system_prompt, user_memory, project_memory),
+        )
+
+    def _compose_system_prompt(
+        self,
+        base_system_prompt: str | None,
+        user_memory: str | None,
+        project_memory: str | None,
+    ) -> str:
+        """Format the memory sections around the base system prompt."""
+        memory_section = self._memory_section(user_memory, project_memory)
+        static_prompt = self._static_prompt(base_system_prompt, bool(project_memory))
+        if self.cache_layout:
+            return static_prompt + "\n\n" + memory_section
+        return memory_section + "\n\n" + static_prompt
+
+    def _memory_section(self, user_memory: str | None, project_memory: str | None) -> str:
+        """Format the user and project memory sections."""
+        return self._memory_cache.get(
+            (user_memory, project_memory),
+            lambda: self.system_prompt_template.format(
+                user_memory=user_memory if user_memory else "(No user agent.md)",
+                project_memory=project_memory if project_memory else "(No project agent.md)",
+            ),
+        )
+
+    def _static_prompt(self, base_system_prompt: str | None, has_project_memory: bool) -> str:
+        """Join the base system prompt and the long-term memory docs."""
+
+        def build() -> str:
+            longterm_section = self._longterm_cache.get(
+                has_project_memory,
+                lambda: self._format_longterm_memory(has_project_memory=has_project_memory),
+            )
+            if base_system_prompt:
+                return base_system_prompt + "\n\n" + longterm_section
+            return longterm_section
+
+        return self._static_cache.get((base_system_prompt, has_project_memory), build)
+
+    def _apply_to_request(self, request: ModelRequest) -> ModelRequest:
+        """Return the request with memory injected into its system prompt.
+
+        With the cache-aware layout and an Anthropic model, the static part and
+        the memory sections become separate content blocks, and the static
+        block carries a cache breakpoint.
+        """
+        if not (self.cache_layout and supports_cache_breakpoints(request.model)):
+            return request.override(system_prompt=self._build_system_prompt(request))
+
+        state = cast("AgentMemoryState", request.state)
+        project_memory = state.get("project_memory")
+        static_prompt = self._static_prompt(request.system_prompt, bool(project_memory))
+        memory_section = self._memory_section(state.get("user_memory"), project_memory)
+        system_message = SystemMessage(
+            content=[
+                {"type": "text", "text": static_prompt, "cache_control": CACHE_BREAKPOINT},
+                {"type": "text", "text": memory_section},
+            ]
+        )
+        return request.override(system_message=system_message)
+
+    def _format_longterm_memory(self, *, has_project_memory: bool) -> str:
+        """Format the long-term memory documentation for this agent and project."""
         # Build project memory info for documentation
-        if self.project_root and project_memory:
+        if self.project_root and has_project_memory:
             project_memory_info = f"`{self.project_root}` (detected)"
         elif self.project_root:
             project_memory_info = f"`{self.project_root}` (no agent.md found)"
@@ -273,26 +440,13 @@ class AgentMemoryMiddleware(AgentMiddleware):
         else:
             project_deepagents_dir = "[project-root]/.deepagents (not in a project)"
 
-        # Format memory section with both memories
-        memory_section = self.system_prompt_template.format(
-            user_memory=user_memory if user_memory else "(No user agent.md)",
-            project_memory=project_memory if project_memory else "(No project agent.md)",
-        )
-
-        system_prompt = memory_section
-
-        if base_system_prompt:
-            system_prompt += "\n\n" + base_system_prompt
-
-        system_prompt += "\n\n" + LONGTERM_MEMORY_SYSTEM_PROMPT.format(
+        return LONGTERM_MEMORY_SYSTEM_PROMPT.format(
             agent_dir_absolute=self.agent_dir_absolute,
             agent_dir_display=self.agent_dir_display,
             project_memory_info=project_memory_info,
             project_deepagents_dir=project_deepagents_dir,
         )
 
-        return system_prompt
-
     def wrap_model_call(
         self,
         request: ModelRequest,
@@ -307,8 +461,7 @@ class AgentMemoryMiddleware(AgentMiddleware):
         Returns:
             The model response from the handler.
         """
-        system_prompt = self._build_system_prompt(request)
-        return handler(request.override(system_prompt=system_prompt))
+        return handler(self._apply_to_request(request))
 
     async def awrap_model_call(
         self,
@@ -324,5 +477,4 @@ class AgentMemoryMiddleware(AgentMiddleware):
         Returns:
             The model response from the handler.
         """
-        system_prompt = self._build_system_prompt(request)
-        return await handler(request.override(system_prompt=system_prompt))
+        return await handler(self._apply_to_request(request))
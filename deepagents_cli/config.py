@@ -6,11 +6,17 @@ import sys
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import dotenv
 from langchain_core.language_models import BaseChatModel
 from rich.console import Console
 
+from deepagents_cli.tracing import DISABLED_TRACER, SessionTracer
+
+if TYPE_CHECKING:
+    from deepagents_cli.integrations.workspace_sync import WorkspaceSync
+
 dotenv.load_dotenv()
 
 # Color scheme
@@ -235,6 +241,20 @@ class Settings:
             return None
         return self.project_root / ".deepagents" / "agent.md"
 
+    def get_project_agent_md_paths(self) -> list[Path]:
+        """Get every project-level agent.md location, in load order.
+
+        Returns paths regardless of whether the files exist; these are the
+        locations ``_find_project_agent_md`` checks.
+
+        Returns:
+            [{project_root}/.deepagents/agent.md, {project_root}/agent.md], or an
+            empty list if not in a project
+        """
+        if not self.project_root:
+            return []
+        return [self.project_root / ".deepagents" / "agent.md", self.project_root / "agent.md"]
+
     @staticmethod
     def _is_valid_agent_name(agent_name: str) -> bool:
         """Validate prevent invalid filesystem paths and security issues."""
@@ -346,12 +366,27 @@ settings = Settings.from_environment()
 class SessionState:
     """Holds mutable session state (auto-approve mode, etc)."""
 
-    def __init__(self, auto_approve: bool = False, no_splash: bool = False) -> None:
+    def __init__(
+        self,
+        auto_approve: bool = False,
+        no_splash: bool = False,
+        persistent_shell: bool = False,
+        shell_cache: bool = False,
+        cache_prompt: bool = False,
+        shell_concurrency: int = 4,
+    ) -> None:
         self.auto_approve = auto_approve
         self.no_splash = no_splash
+        self.persistent_shell = persistent_shell
+        self.shell_cache = shell_cache
+        self.cache_prompt = cache_prompt
+        self.shell_concurrency = shell_concurrency
         self.exit_hint_until: float | None = None
         self.exit_hint_handle = None
         self.thread_id = str(uuid.uuid4())
+        self.tracer: SessionTracer = DISABLED_TRACER
+        # Set when the project is mirrored into a remote sandbox (--sandbox-sync)
+        self.workspace_sync: "WorkspaceSync | None" = None
 
     def toggle_auto_approve(self) -> bool:
         """Toggle auto-approve and return new state."""
@@ -0,0 +1,454 @@
+"""Line diff engine used for file previews and file operation summaries.
+
+``difflib.SequenceMatcher`` is super-linear on large inputs. This engine:
+
+* interns every line to an integer once (the line-hash prefilter), so all
+  later comparisons are integer comparisons;
+* strips the common prefix and suffix of every region before diffing it;
+* aligns regions with patience diff (lines unique to both sides as anchors,
+  longest increasing subsequence), falling back to Myers' O(ND) algorithm for
+  regions without anchors, and to ``difflib`` when Myers' edit budget is
+  exhausted;
+* produces opcodes lazily and in order.
+
+``compute_diff`` returns a structured ``DiffResult`` (hunks plus exact
+addition and deletion counts for the whole change) whose text is only built
+when it is asked for.
+"""
+
+from __future__ import annotations
+
+import difflib
+import itertools
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Literal
+
+DiffAlgorithm = Literal["patience", "myers", "difflib"]
+
+# (tag, i1, i2, j1, j2) as produced by ``difflib.SequenceMatcher.get_opcodes``
+Opcode = tuple[str, int, int, int, int]
+
+DEFAULT_ALGORITHM: DiffAlgorithm = "patience"
+
+# Myers gives up after this many edits in one region
+_MYERS_MAX_COST = 2000
+
+# Regions Myers gave up on are handed to difflib up to this size; larger ones
+# are reported as a single replacement
+_DIFFLIB_FALLBACK_LINES = 20000
+
+
+def diff_opcodes(
+    a: Sequence[str],
+    b: Sequence[str],
+    *,
+    algorithm: DiffAlgorithm = DEFAULT_ALGORITHM,
+) -> Iterator[Opcode]:
+    """Yield difflib-style opcodes transforming ``a`` into ``b``, in order.
+
+    Adjacent opcodes of the same kind are merged and a deletion next to an
+    insertion is reported as ``replace``, as ``SequenceMatcher`` does.
+
+    Args:
+        a: Lines before.
+        b: Lines after.
+        algorithm: ``patience`` (default), ``myers`` or ``difflib``.
+
+    Yields:
+        Opcodes covering both sequences from start to end.
+    """
+    if algorithm == "difflib":
+        yield from difflib.SequenceMatcher(None, a, b).get_opcodes()
+        return
+
+    # Line-hash prefilter: compare small integers instead of strings
+    ids = {line: index for index, line in enumerate(dict.fromkeys(itertools.chain(a, b)))}
+    a_ids = list(map(ids.__getitem__, a))
+    b_ids = list(map(ids.__getitem__, b))
+
+    raw = (
+        _patience(a_ids, b_ids)
+        if algorithm == "patience"
+        else _diff_region(a_ids, b_ids, 0, len(a_ids), 0, len(b_ids))
+    )
+    yield from _merge(raw)
+
+
+def group_opcodes(opcodes: Iterator[Opcode], context: int = 3) -> Iterator[list[Opcode]]:
+    """Group opcodes into hunks with ``context`` lines of context.
+
+    Streaming equivalent of ``SequenceMatcher.get_grouped_opcodes``.
+    """
+    span = context * 2
+    group: list[Opcode] = []
+    first = True
+    for tag, i1, i2, j1, j2 in opcodes:
+        if first and tag == "equal":
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        first = False
+        if tag == "equal" and i2 - i1 > span:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            if any(op[0] != "equal" for op in group):
+                yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+
+    if group and group[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = group[-1]
+        group[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+    if any(op[0] != "equal" for op in group):
+        yield group
+
+
+@dataclass(frozen=True)
+class DiffHunk:
+    """One hunk of a unified diff: changed opcodes plus surrounding context."""
+
+    opcodes: tuple[Opcode, ...]
+
+    @property
+    def old_start(self) -> int:
+        """Zero-based first line of the hunk in the old text."""
+        return self.opcodes[0][1]
+
+    @property
+    def new_start(self) -> int:
+        """Zero-based first line of the hunk in the new text."""
+        return self.opcodes[0][3]
+
+    def header(self) -> str:
+        """Return the ``@@ -a,b +c,d @@`` line."""
+        first, last = self.opcodes[0], self.opcodes[-1]
+        return f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+
+    def lines(self, a: Sequence[str], b: Sequence[str]) -> Iterator[str]:
+        """Yield the header and the marked lines of the hunk."""
+        yield self.header()
+        for tag, i1, i2, j1, j2 in self.opcodes:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in {"replace", "delete"}:
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in {"replace", "insert"}:
+                for line in b[j1:j2]:
+                    yield "+" + line
+
+
+@dataclass
+class DiffResult:
+    """Structured line diff between two texts.
+
+    Attributes:
+        before: Lines of the old text.
+        after: Lines of the new text.
+        hunks: Hunks with context, in order.
+        additions: Lines added by the whole change.
+        deletions: Lines removed by the whole change.
+        fromfile: Label of the old side in the text view.
+        tofile: Label of the new side in the text view.
+    """
+
+    before: Sequence[str]
+    after: Sequence[str]
+    hunks: list[DiffHunk]
+    additions: int
+    deletions: int
+    fromfile: str = ""
+    tofile: str = ""
+    _text: str | None = field(default=None, init=False, repr=False)
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the unified diff lines, headers included, without building the text."""
+        yield f"--- {self.fromfile}"
+        yield f"+++ {self.tofile}"
+        for hunk in self.hunks:
+            yield from hunk.lines(self.before, self.after)
+
+    def text(self, max_lines: int | None = None) -> str:
+        """Return the unified diff text, truncated to ``max_lines`` with ``...``."""
+        if max_lines is None:
+            if self._text is None:
+                self._text = "\n".join(self.iter_lines())
+            return self._text
+        lines = list(itertools.islice(self.iter_lines(), max_lines + 1))
+        if len(lines) > max_lines:
+            lines = [*lines[: max_lines - 1], "..."]
+        return "\n".join(lines)
+
+
+def compute_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    fromfile: str = "",
+    tofile: str = "",
+    *,
+    context: int = 3,
+    algorithm: DiffAlgorithm = DEFAULT_ALGORITHM,
+) -> DiffResult | None:
+    """Diff two line sequences into a ``DiffResult``.
+
+    Args:
+        a: Lines before.
+        b: Lines after.
+        fromfile: Label of the old side.
+        tofile: Label of the new side.
+        context: Context lines around each change.
+        algorithm: ``patience`` (default), ``myers`` or ``difflib``.
+
+    Returns:
+        The diff, or None if the sequences are equal.
+    """
+    additions = 0
+    deletions = 0
+    opcodes = []
+    for opcode in diff_opcodes(a, b, algorithm=algorithm):
+        tag, i1, i2, j1, j2 = opcode
+        if tag != "equal":
+            deletions += i2 - i1
+            additions += j2 - j1
+        opcodes.append(opcode)
+    if not additions and not deletions:
+        return None
+    hunks = [DiffHunk(tuple(group)) for group in group_opcodes(iter(opcodes), context)]
+    return DiffResult(
+        before=a,
+        after=b,
+        hunks=hunks,
+        additions=additions,
+        deletions=deletions,
+        fromfile=fromfile,
+        tofile=tofile,
+    )
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a hunk range the way ``difflib.unified_diff`` does."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _merge(raw: Iterator[Opcode]) -> Iterator[Opcode]:
+    """Merge adjacent opcodes and fold delete/insert pairs into replace."""
+    pending: Opcode | None = None
+    for op in raw:
+        tag, i1, i2, j1, j2 = op
+        if i1 == i2 and j1 == j2:
+            continue
+        if pending is None:
+            pending = op
+            continue
+        p_tag, p_i1, _p_i2, p_j1, _p_j2 = pending
+        if p_tag == "equal" and tag == "equal":
+            pending = ("equal", p_i1, i2, p_j1, j2)
+        elif p_tag != "equal" and tag != "equal":
+            pending = (_change_tag(p_i1, i2, p_j1, j2), p_i1, i2, p_j1, j2)
+        else:
+            yield pending
+            pending = (_change_tag(i1, i2, j1, j2), i1, i2, j1, j2) if tag != "equal" else op
+    if pending is not None:
+        yield pending
+
+
+def _change_tag(i1: int, i2: int, j1: int, j2: int) -> str:
+    if i1 == i2:
+        return "insert"
+    if j1 == j2:
+        return "delete"
+    return "replace"
+
+
+def _patience(a: list[int], b: list[int]) -> Iterator[Opcode]:
+    """Patience diff over interned lines, processed left to right."""
+    # Stack of regions to diff and opcodes to emit, consumed in order
+    stack: list[tuple[bool, int, int, int, int]] = [(True, 0, len(a), 0, len(b))]
+    while stack:
+        is_region, alo, ahi, blo, bhi = stack.pop()
+        if not is_region:
+            yield ("equal", alo, ahi, blo, bhi)
+            continue
+
+        alo, ahi, blo, bhi, prefix, suffix = _trim(a, b, alo, ahi, blo, bhi)
+        if prefix:
+            yield prefix
+        if suffix:
+            stack.append((False, *suffix[1:]))
+
+        if alo == ahi or blo == bhi:
+            yield from _diff_region(a, b, alo, ahi, blo, bhi)
+            continue
+
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if not anchors:
+            yield from _diff_region(a, b, alo, ahi, blo, bhi)
+            continue
+
+        # Push the gaps between anchors in reverse so they pop in order
+        next_a, next_b = ahi, bhi
+        for i, j in reversed(anchors):
+            stack.append((True, i + 1, next_a, j + 1, next_b))
+            stack.append((False, i, i + 1, j, j + 1))
+            next_a, next_b = i, j
+        stack.append((True, alo, next_a, blo, next_b))
+
+
+def _trim(
+    a: list[int], b: list[int], alo: int, ahi: int, blo: int, bhi: int
+) -> tuple[int, int, int, int, Opcode | None, Opcode | None]:
+    """Strip the common prefix and suffix of a region."""
+    start_a, start_b = alo, blo
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        alo += 1
+        blo += 1
+    prefix = ("equal", start_a, alo, start_b, blo) if alo > start_a else None
+
+    end_a, end_b = ahi, bhi
+    while ahi > alo and bhi > blo and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+    suffix = ("equal", ahi, end_a, bhi, end_b) if ahi < end_a else None
+    return alo, ahi, blo, bhi, prefix, suffix
+
+
+def _unique_anchors(
+    a: list[int], b: list[int], alo: int, ahi: int, blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """Return matched lines unique on both sides, as a longest increasing run."""
+    a_count = Counter(a[alo:ahi])
+    b_count = Counter(b[blo:bhi])
+    unique = {line for line, count in a_count.items() if count == 1 and b_count[line] == 1}
+    if not unique:
+        return []
+    a_pos = {a[i]: i for i in range(alo, ahi) if a[i] in unique}
+    # (j, i) pairs in b order
+    matches = [(j, a_pos[b[j]]) for j in range(blo, bhi) if b[j] in unique]
+
+    # Longest increasing subsequence of a positions (patience sorting)
+    tails: list[int] = []
+    tail_index: list[int] = []
+    previous = [-1] * len(matches)
+    for index, (_j, i) in enumerate(matches):
+        pile = bisect_left(tails, i)
+        if pile == len(tails):
+            tails.append(i)
+            tail_index.append(index)
+        else:
+            tails[pile] = i
+            tail_index[pile] = index
+        previous[index] = tail_index[pile - 1] if pile else -1
+
+    anchors = []
+    index = tail_index[-1]
+    while index != -1:
+        j, i = matches[index]
+        anchors.append((i, j))
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _diff_region(
+    a: list[int], b: list[int], alo: int, ahi: int, blo: int, bhi: int
+) -> Iterator[Opcode]:
+    """Diff a region with Myers, falling back to difflib or a plain replace."""
+    alo, ahi, blo, bhi, prefix, suffix = _trim(a, b, alo, ahi, blo, bhi)
+    if prefix:
+        yield prefix
+    if alo == ahi or blo == bhi:
+        yield (_change_tag(alo, ahi, blo, bhi), alo, ahi, blo, bhi)
+    else:
+        ops = _myers(a, b, alo, ahi, blo, bhi, _MYERS_MAX_COST)
+        if ops is not None:
+            yield from ops
+        elif (ahi - alo) + (bhi - blo) <= _DIFFLIB_FALLBACK_LINES:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi])
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                yield (tag, alo + i1, alo + i2, blo + j1, blo + j2)
+        else:
+            yield ("replace", alo, ahi, blo, bhi)
+    if suffix:
+        yield suffix
+
+
+def _myers(
+    a: list[int], b: list[int], alo: int, ahi: int, blo: int, bhi: int, max_cost: int
+) -> list[Opcode] | None:
+    """Myers' greedy O(ND) diff of a region; None if it needs over max_cost edits."""
+    n = ahi - alo
+    m = bhi - blo
+    limit = min(n + m, max_cost)
+    # Furthest x reached on diagonal k is v[k + offset]
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    # Frontier before each round d, diagonals -d..d only: backtracking needs
+    # no more, and compact arrays keep the trace at 4 * D^2 bytes
+    trace: list[array[int]] = []
+    for d in range(limit + 1):
+        trace.append(array("i", v[offset - d : offset + d + 1]))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, n, m, alo, blo)
+    return None
+
+
+def _myers_backtrack(trace: list[array[int]], n: int, m: int, alo: int, blo: int) -> list[Opcode]:
+    ops: list[Opcode] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        # Diagonal k of round d is at index k + d of its frontier
+        frontier = trace[d]
+        k = x - y
+        if k == -d or (k != d and frontier[k - 1 + d] < frontier[k + 1 + d]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = frontier[prev_k + d]
+        prev_y = prev_x - prev_k
+        snake = min(x - prev_x, y - prev_y)
+        if snake > 0:
+            ops.append(("equal", alo + x - snake, alo + x, blo + y - snake, blo + y))
+            x -= snake
+            y -= snake
+        if x == prev_x:
+            ops.append(("insert", alo + x, alo + x, blo + prev_y, blo + y))
+        else:
+            ops.append(("delete", alo + prev_x, alo + x, blo + y, blo + y))
+        x, y = prev_x, prev_y
+    # Round 0 is the common prefix
+    if x > 0:
+        ops.append(("equal", alo, alo + x, blo, blo + y))
+    ops.reverse()
+    return ops
+
+
+__all__ = [
+    "DEFAULT_ALGORITHM",
+    "DiffAlgorithm",
+    "DiffHunk",
+    "DiffResult",
+    "Opcode",
+    "compute_diff",
+    "diff_opcodes",
+    "group_opcodes",
+]
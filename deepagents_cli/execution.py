@@ -5,6 +5,8 @@ import json
 import sys
 import termios
 import tty
+from collections.abc import Callable
+from typing import Any
 
 from langchain.agents.middleware.human_in_the_loop import (
     ActionRequest,
@@ -20,11 +22,18 @@ from pydantic import TypeAdapter, ValidationError
 from rich import box
 from rich.markdown import Markdown
 from rich.panel import Panel
+from rich.text import Text
 
 from deepagents_cli.config import COLORS, console
-from deepagents_cli.file_ops import FileOpTracker, build_approval_preview
+from deepagents_cli.file_ops import ApprovalPreviewCache, FileOpTracker
 from deepagents_cli.input import parse_file_mentions
+from deepagents_cli.markdown_stream import MarkdownStream
+from deepagents_cli.render_queue import RenderQueue
+from deepagents_cli.shell import SHELL_OUTPUT_EVENT
+from deepagents_cli.spinner import DEFAULT_MAX_REPAINTS_PER_SECOND, CoalescedSpinner
+from deepagents_cli.tool_args import ToolArgsParser
 from deepagents_cli.ui import (
+    ShellOutputTail,
     TokenTracker,
     format_tool_display,
     format_tool_message_content,
@@ -35,6 +44,36 @@ from deepagents_cli.ui import (
 
 _HITL_REQUEST_ADAPTER = TypeAdapter(HITLRequest)
 
+EventSink = Callable[[dict[str, Any]], None]
+"""Callback receiving structured execution events (see ``execute_task``)."""
+
+# Arguments that identify a tool call well enough to display it before the
+# remaining (possibly very large) arguments have finished streaming
+_EARLY_DISPLAY_KEYS: dict[str, tuple[str, ...]] = {
+    "read_file": ("file_path", "path"),
+    "write_file": ("file_path", "path"),
+    "edit_file": ("file_path", "path"),
+    "shell": ("command",),
+    "execute": ("command",),
+}
+
+
+# Approval previews are prefetched when an interrupt arrives and kept for the session
+_approval_previews = ApprovalPreviewCache()
+
+
+class _NullStatus:
+    """Stand-in for ``console.status`` when running without a terminal."""
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def update(self, *_args: Any, **_kwargs: Any) -> None:
+        pass
+
 
 def prompt_for_tool_approval(
     action_request: ActionRequest,
@@ -49,7 +88,7 @@ def prompt_for_tool_approval(
     description = action_request.get("description", "No description available")
     name = action_request["name"]
     args = action_request["args"]
-    preview = build_approval_preview(name, args, assistant_id) if name else None
+    preview = _approval_previews.get(name, args, assistant_id) if name else None
 
     body_lines = []
     if preview:
@@ -72,7 +111,9 @@ def prompt_for_tool_approval(
     )
     if preview and preview.diff and not preview.error:
         console.print()
-        render_diff_block(preview.diff, preview.diff_title or preview.title)
+        render_diff_block(
+            preview.diff, preview.diff_title or preview.title, max_lines=preview.diff_max_lines
+        )
 
     options = ["approve", "reject", "auto-accept all going forward"]
     selected = 0  # Start with approve selected
@@ -184,8 +225,25 @@ async def execute_task(
     session_state,
     token_tracker: TokenTracker | None = None,
     backend=None,
+    *,
+    event_sink: EventSink | None = None,
+    interactive: bool = True,
 ) -> None:
-    """Execute any task by passing it directly to the AI agent."""
+    """Execute any task by passing it directly to the AI agent.
+
+    Args:
+        user_input: Raw user prompt (may contain @file mentions).
+        agent: Compiled agent graph.
+        assistant_id: Agent identifier for memory paths.
+        session_state: Session state (thread id, auto-approve mode).
+        token_tracker: Optional tracker updated with the turn's token usage.
+        backend: Backend used to read files for diff display.
+        event_sink: Optional callback receiving one structured event per tool
+            call, tool result, text segment, interrupt and token-usage update.
+        interactive: If False, never touch the TTY: no spinner or live region,
+            and tool actions needing approval are rejected unless auto-approve
+            is enabled.
+    """
     # Parse file mentions and inject content if any
     prompt_text, mentioned_files = parse_file_mentions(user_input)
 
@@ -212,14 +270,31 @@ async def execute_task(
         "metadata": {"assistant_id": assistant_id} if assistant_id else {},
     }
 
+    tracer = session_state.tracer
+    turn_start = tracer.now()
+
     has_responded = False
     captured_input_tokens = 0
     captured_output_tokens = 0
+    # Prompt cache tokens (read, written) of every model call, by message id
+    cache_usage: dict[str, tuple[int, int]] = {}
     current_todos = None  # Track current todo list state
 
-    status = console.status(f"[bold {COLORS['thinking']}]Agent is thinking...", spinner="dots")
-    status.start()
-    spinner_active = True
+    thinking_message = f"[bold {COLORS['thinking']}]Agent is thinking..."
+    if interactive:
+        status = console.status(
+            thinking_message,
+            spinner="dots",
+            refresh_per_second=DEFAULT_MAX_REPAINTS_PER_SECOND,
+        )
+    else:
+        status = _NullStatus()
+    # All terminal output of the turn goes through the output task so that
+    # slow rendering never delays reading the model stream
+    output = RenderQueue(offload=interactive)
+    # Spinner changes are coalesced into a bounded number of repaints
+    spinner = CoalescedSpinner(status, output, message=thinking_message)
+    spinner.show()
 
     tool_icons = {
         "read_file": "📖",
@@ -242,23 +317,122 @@ async def execute_task(
     displayed_tool_ids = set()
     # Buffer partial tool-call chunks keyed by streaming index
     tool_call_buffers: dict[str | int, dict] = {}
-    # Buffer assistant text so we can render complete markdown segments
-    pending_text = ""
+    # Render assistant text block by block as it streams in
+    markdown_stream = MarkdownStream(
+        console, style=COLORS["agent"], use_live=None if interactive else False
+    )
+    # Text of the current segment, kept only when events are being emitted
+    segment_parts: list[str] = []
+    # Whether text was streamed since the markdown stream was last finished
+    text_pending = False
+    # Spinner message of each running tool call, and live output of running shells
+    running_messages: dict[str, str] = {}
+    shell_tails: dict[str, ShellOutputTail] = {}
+
+    def emit(event_type: str, **fields: Any) -> None:
+        """Forward a structured event to the event sink, if any."""
+        if event_sink is not None:
+            event_sink({"type": event_type, **fields})
+
+    def feed_markdown(text: str) -> None:
+        with tracer.span("render_markdown", "render", chars=len(text)):
+            markdown_stream.feed(text)
+
+    def finish_markdown() -> None:
+        with tracer.span("render_markdown", "render", final=True):
+            markdown_stream.finish()
+
+    def set_response_prefix() -> None:
+        markdown_stream.prefix = Text("●", style=COLORS["agent"])
+
+    def stream_text(text: str) -> None:
+        """Queue streamed assistant text for the incremental markdown renderer."""
+        nonlocal has_responded, text_pending
+        if not text:
+            return
+        # The live tail region replaces the spinner while text streams
+        spinner.hide()
+        if not has_responded:
+            output.call(set_response_prefix)
+            has_responded = True
+        if event_sink is not None:
+            segment_parts.append(text)
+        text_pending = True
+        # Fragments that arrive while the terminal is busy are fed as one
+        output.append("markdown", feed_markdown, text)
 
     def flush_text_buffer(*, final: bool = False) -> None:
-        """Flush accumulated assistant text as rendered markdown when appropriate."""
-        nonlocal pending_text, spinner_active, has_responded
-        if not final or not pending_text.strip():
+        """Commit the open markdown tail block at the end of a text segment."""
+        nonlocal text_pending
+        if not final:
             return
-        if spinner_active:
-            status.stop()
-            spinner_active = False
-        if not has_responded:
+        if text_pending:
+            spinner.hide()
+            text_pending = False
+        output.call(finish_markdown)
+        if segment_parts:
+            segment = "".join(segment_parts)
+            segment_parts.clear()
+            if segment.strip():
+                emit("text", text=segment)
+
+    def print_tool_call(line: str, tool_name: str, *, gap: bool) -> None:
+        with tracer.span("render_tool_call", "render", tool=tool_name):
+            if gap:
+                console.print()
+            console.print(line, style=f"dim {COLORS['tool']}", markup=False)
+
+    def show_tool_call(tool_name: str, tool_args: dict, tool_call_id: str | None) -> None:
+        """Queue the tool call line and point the spinner at the running tool."""
+        flush_text_buffer(final=True)
+        icon = tool_icons.get(tool_name, "🔧")
+
+        # Lines printed while the spinner runs appear above it, so the spinner
+        # is left up and only its message changes
+        display_str = format_tool_display(tool_name, tool_args)
+        output.call(print_tool_call, f"  {icon} {display_str}", tool_name, gap=has_responded)
+        message = f"[bold {COLORS['thinking']}]Executing {display_str}..."
+        if tool_call_id is not None:
+            running_messages[tool_call_id] = message
+        spinner.show(message)
+
+    def show_shell_output(tool_call_id: str | None, text: str) -> None:
+        """Show the tail of a running command's output under the spinner."""
+        if not interactive or tool_call_id is None or not text:
+            return
+        tail = shell_tails.get(tool_call_id)
+        if tail is None:
+            tail = shell_tails[tool_call_id] = ShellOutputTail()
+        tail.feed(text)
+        # Repaints of the panel are rate-limited with the rest of the spinner
+        spinner.update(tail.render(running_messages.get(tool_call_id, thinking_message)))
+
+    def print_todos(todos: list) -> None:
+        with tracer.span("render_todos", "render"):
+            console.print()
+            render_todo_list(todos)
+            console.print()
+
+    def print_file_operation(record) -> None:
+        with tracer.span("render_file_operation", "render"):
+            console.print()
+            render_file_operation(record)
+            console.print()
+
+    def print_tool_error(content: str) -> None:
+        console.print()
+        console.print(content, style="red", markup=False)
+        console.print()
+
+    def print_human_message(content: str, *, bullet: bool) -> None:
+        if bullet:
             console.print("●", style=COLORS["agent"], markup=False, end=" ")
-            has_responded = True
-        markdown = Markdown(pending_text.rstrip())
-        console.print(markdown, style=COLORS["agent"])
-        pending_text = ""
+        console.print(Markdown(content), style=COLORS["agent"])
+        console.print()
+
+    # Trace bookkeeping: start times of streaming model messages and running tools
+    message_starts: dict[str, float] = {}
+    tool_starts: dict[str, float] = {}
 
     # Stream input - may need to loop if there are interrupts
     stream_input = {"messages": [{"role": "user", "content": final_input}]}
@@ -270,18 +444,33 @@ async def execute_task(
             suppress_resumed_output = False
             # Track all pending interrupts: {interrupt_id: request_data}
             pending_interrupts: dict[str, HITLRequest] = {}
+            stream_start = tracer.now()
+            first_chunk_seen = False
 
             async for chunk in agent.astream(
                 stream_input,
-                stream_mode=["messages", "updates"],  # Dual-mode for HITL support
+                # Updates for HITL, messages for content, custom for live shell output
+                stream_mode=["messages", "updates", "custom"],
                 subgraphs=True,
                 config=config,
                 durability="exit",
             ):
-                # Unpack chunk - with subgraphs=True and dual-mode, it's (namespace, stream_mode, data)
+                # Unpack chunk - with subgraphs=True it's (namespace, stream_mode, data)
                 if not isinstance(chunk, tuple) or len(chunk) != 3:
                     continue
 
+                # Only wait on the terminal when the output backlog is full
+                await output.throttle()
+
+                if not first_chunk_seen:
+                    first_chunk_seen = True
+                    tracer.complete(
+                        "time_to_first_chunk",
+                        "model",
+                        stream_start,
+                        resumed=not isinstance(stream_input, dict),
+                    )
+
                 _namespace, current_stream_mode, data = chunk
 
                 # Handle UPDATES stream - for interrupts and todos
@@ -302,8 +491,16 @@ async def execute_task(
                                     )
                                     pending_interrupts[interrupt_obj.id] = validated_request
                                     interrupt_occurred = True
+                                    if interactive and not session_state.auto_approve:
+                                        # Build every diff of the batch while the
+                                        # stream finishes, before the first prompt
+                                        _approval_previews.prefetch(
+                                            validated_request["action_requests"],
+                                            assistant_id,
+                                        )
                                 except ValidationError as e:
-                                    console.print(
+                                    output.call(
+                                        console.print,
                                         f"[yellow]Warning: Invalid HITL request data: {e}[/yellow]",
                                         style="dim",
                                     )
@@ -317,13 +514,12 @@ async def execute_task(
                             new_todos = chunk_data["todos"]
                             if new_todos != current_todos:
                                 current_todos = new_todos
-                                # Stop spinner before rendering todos
-                                if spinner_active:
-                                    status.stop()
-                                    spinner_active = False
-                                console.print()
-                                render_todo_list(new_todos)
-                                console.print()
+                                output.call(print_todos, new_todos)
+
+                # Handle CUSTOM stream - live output of running shell commands
+                elif current_stream_mode == "custom":
+                    if isinstance(data, dict) and data.get("type") == SHELL_OUTPUT_EVENT:
+                        show_shell_output(data.get("tool_call_id"), data.get("text", ""))
 
                 # Handle MESSAGES stream - for content and tool calls
                 elif current_stream_mode == "messages":
@@ -337,15 +533,8 @@ async def execute_task(
                         content = message.text
                         if content:
                             flush_text_buffer(final=True)
-                            if spinner_active:
-                                status.stop()
-                                spinner_active = False
-                            if not has_responded:
-                                console.print("●", style=COLORS["agent"], markup=False, end=" ")
-                                has_responded = True
-                            markdown = Markdown(content)
-                            console.print(markdown, style=COLORS["agent"])
-                            console.print()
+                            output.call(print_human_message, content, bullet=not has_responded)
+                            has_responded = True
                         continue
 
                     if isinstance(message, ToolMessage):
@@ -354,43 +543,44 @@ async def execute_task(
                         tool_name = getattr(message, "name", "")
                         tool_status = getattr(message, "status", "success")
                         tool_content = format_tool_message_content(message.content)
+                        tool_call_id = getattr(message, "tool_call_id", None)
+                        if tool_call_id in tool_starts:
+                            tracer.async_span(
+                                f"tool:{tool_name}",
+                                "tools",
+                                tool_starts.pop(tool_call_id),
+                                id=tool_call_id,
+                                status=tool_status,
+                            )
                         record = file_op_tracker.complete_with_message(message)
-
-                        # Reset spinner message after tool completes
-                        if spinner_active:
-                            status.update(f"[bold {COLORS['thinking']}]Agent is thinking...")
+                        running_messages.pop(tool_call_id, None)
+                        shell_tails.pop(tool_call_id, None)
+                        emit(
+                            "tool_result",
+                            id=tool_call_id,
+                            name=tool_name,
+                            status=tool_status,
+                            content=tool_content,
+                        )
+
+                        # Reset spinner message after tool completes (this also
+                        # collapses the live output panel of a shell command)
+                        spinner.update(thinking_message)
 
                         if tool_name == "shell" and tool_status != "success":
                             flush_text_buffer(final=True)
                             if tool_content:
-                                if spinner_active:
-                                    status.stop()
-                                    spinner_active = False
-                                console.print()
-                                console.print(tool_content, style="red", markup=False)
-                                console.print()
+                                output.call(print_tool_error, tool_content)
                         elif tool_content and isinstance(tool_content, str):
                             stripped = tool_content.lstrip()
                             if stripped.lower().startswith("error"):
                                 flush_text_buffer(final=True)
-                                if spinner_active:
-                                    status.stop()
-                                    spinner_active = False
-                                console.print()
-                                console.print(tool_content, style="red", markup=False)
-                                console.print()
+                                output.call(print_tool_error, tool_content)
 
                         if record:
                             flush_text_buffer(final=True)
-                            if spinner_active:
-                                status.stop()
-                                spinner_active = False
-                            console.print()
-                            render_file_operation(record)
-                            console.print()
-                            if not spinner_active:
-                                status.start()
-                                spinner_active = True
+                            output.call(print_file_operation, record)
+                            spinner.show()
 
                         # For all other tools (web_search, http_request, etc.),
                         # results are hidden from user - agent will process and respond
@@ -401,15 +591,36 @@ async def execute_task(
                         # Fallback for messages without content_blocks
                         continue
 
+                    message_id = getattr(message, "id", None)
+                    if tracer.enabled and message_id and message_id not in message_starts:
+                        message_starts[message_id] = tracer.now()
+
                     # Extract token usage if available
-                    if token_tracker and hasattr(message, "usage_metadata"):
+                    if (token_tracker or event_sink) and hasattr(message, "usage_metadata"):
                         usage = message.usage_metadata
                         if usage:
                             input_toks = usage.get("input_tokens", 0)
                             output_toks = usage.get("output_tokens", 0)
+                            details = usage.get("input_token_details") or {}
+                            cache_read = details.get("cache_read") or 0
+                            cache_write = details.get("cache_creation") or 0
+                            if cache_read or cache_write:
+                                # Usage may repeat across the chunks of one call
+                                read, write = cache_usage.get(message_id or "", (0, 0))
+                                cache_usage[message_id or ""] = (
+                                    max(read, cache_read),
+                                    max(write, cache_write),
+                                )
                             if input_toks or output_toks:
+                                previous = (captured_input_tokens, captured_output_tokens)
                                 captured_input_tokens = max(captured_input_tokens, input_toks)
                                 captured_output_tokens = max(captured_output_tokens, output_toks)
+                                if (captured_input_tokens, captured_output_tokens) != previous:
+                                    emit(
+                                        "token_usage",
+                                        input_tokens=captured_input_tokens,
+                                        output_tokens=captured_output_tokens,
+                                    )
 
                     # Process content blocks (this is the key fix!)
                     for block in message.content_blocks:
@@ -419,15 +630,14 @@ async def execute_task(
                         if block_type == "text":
                             text = block.get("text", "")
                             if text:
-                                pending_text += text
+                                stream_text(text)
 
                         # Handle reasoning blocks
                         elif block_type == "reasoning":
                             flush_text_buffer(final=True)
                             reasoning = block.get("reasoning", "")
-                            if reasoning and spinner_active:
-                                status.stop()
-                                spinner_active = False
+                            if reasoning:
+                                spinner.hide()
                                 # Could display reasoning differently if desired
                                 # For now, skip it or handle minimally
 
@@ -451,7 +661,13 @@ async def execute_task(
 
                             buffer = tool_call_buffers.setdefault(
                                 buffer_key,
-                                {"name": None, "id": None, "args": None, "args_parts": []},
+                                {
+                                    "name": None,
+                                    "id": None,
+                                    "args": None,
+                                    "args_parts": [],
+                                    "parser": ToolArgsParser(),
+                                },
                             )
 
                             if chunk_name:
@@ -464,10 +680,11 @@ async def execute_task(
                                 buffer["args_parts"] = []
                             elif isinstance(chunk_args, str):
                                 if chunk_args:
-                                    parts: list[str] = buffer.setdefault("args_parts", [])
+                                    parts: list[str] = buffer["args_parts"]
                                     if not parts or chunk_args != parts[-1]:
                                         parts.append(chunk_args)
-                                    buffer["args"] = "".join(parts)
+                                        # Only the new fragment is scanned
+                                        buffer["parser"].feed(chunk_args)
                             elif chunk_args is not None:
                                 buffer["args"] = chunk_args
 
@@ -476,54 +693,68 @@ async def execute_task(
                             if buffer_name is None:
                                 continue
 
+                            parser: ToolArgsParser = buffer["parser"]
                             parsed_args = buffer.get("args")
-                            if isinstance(parsed_args, str):
-                                if not parsed_args:
+                            if parsed_args is None:
+                                if not buffer["args_parts"]:
                                     continue
-                                try:
-                                    parsed_args = json.loads(parsed_args)
-                                except json.JSONDecodeError:
-                                    # Wait for more chunks to form valid JSON
+                                if parser.complete:
+                                    parsed_args = parser.fields
+                                elif parser.failed:
+                                    # Not a streamed JSON object - parse the whole buffer
+                                    try:
+                                        parsed_args = json.loads("".join(buffer["args_parts"]))
+                                    except json.JSONDecodeError:
+                                        # Wait for more chunks to form valid JSON
+                                        continue
+                                else:
+                                    # Show the tool as soon as its key argument is known,
+                                    # without waiting for the rest of the body
+                                    early_keys = _EARLY_DISPLAY_KEYS.get(buffer_name, ())
+                                    if (
+                                        buffer_id is not None
+                                        and buffer_id not in displayed_tool_ids
+                                        and any(key in parser.fields for key in early_keys)
+                                    ):
+                                        displayed_tool_ids.add(buffer_id)
+                                        early_args = dict(parser.fields)
+                                        file_op_tracker.start_operation(
+                                            buffer_name, early_args, buffer_id
+                                        )
+                                        show_tool_call(buffer_name, early_args, buffer_id)
                                     continue
-                            elif parsed_args is None:
-                                continue
 
                             # Ensure args are in dict form for formatter
                             if not isinstance(parsed_args, dict):
                                 parsed_args = {"value": parsed_args}
 
-                            flush_text_buffer(final=True)
-                            if buffer_id is not None:
-                                if buffer_id not in displayed_tool_ids:
-                                    displayed_tool_ids.add(buffer_id)
-                                    file_op_tracker.start_operation(
-                                        buffer_name, parsed_args, buffer_id
-                                    )
-                                else:
-                                    file_op_tracker.update_args(buffer_id, parsed_args)
                             tool_call_buffers.pop(buffer_key, None)
-                            icon = tool_icons.get(buffer_name, "🔧")
-
-                            if spinner_active:
-                                status.stop()
-
-                            if has_responded:
-                                console.print()
-
-                            display_str = format_tool_display(buffer_name, parsed_args)
-                            console.print(
-                                f"  {icon} {display_str}",
-                                style=f"dim {COLORS['tool']}",
-                                markup=False,
-                            )
-
-                            # Restart spinner with context about which tool is executing
-                            status.update(f"[bold {COLORS['thinking']}]Executing {display_str}...")
-                            status.start()
-                            spinner_active = True
+                            emit("tool_call", id=buffer_id, name=buffer_name, args=parsed_args)
+                            if tracer.enabled and buffer_id is not None:
+                                tool_starts.setdefault(buffer_id, tracer.now())
+                            if buffer_id is not None and buffer_id in displayed_tool_ids:
+                                # Already shown (possibly from partial args) - just refresh
+                                file_op_tracker.update_args(buffer_id, parsed_args)
+                                continue
+                            if buffer_id is not None:
+                                displayed_tool_ids.add(buffer_id)
+                                file_op_tracker.start_operation(buffer_name, parsed_args, buffer_id)
+                            show_tool_call(buffer_name, parsed_args, buffer_id)
 
                     if getattr(message, "chunk_position", None) == "last":
                         flush_text_buffer(final=True)
+                        if message_id in message_starts:
+                            tracer.complete(
+                                "model_message",
+                                "model",
+                                message_starts.pop(message_id),
+                                id=message_id,
+                            )
+
+            # Messages that never signalled their last chunk end with the stream
+            for message_id, message_start in message_starts.items():
+                tracer.complete("model_message", "model", message_start, id=message_id)
+            message_starts.clear()
 
             # After streaming loop - handle interrupt if it occurred
             flush_text_buffer(final=True)
@@ -539,29 +770,35 @@ async def execute_task(
                         decisions = []
                         for action_request in hitl_request["action_requests"]:
                             # Show what's being auto-approved (brief, dim message)
-                            if spinner_active:
-                                status.stop()
-                                spinner_active = False
-
                             description = action_request.get("description", "tool action")
-                            console.print()
-                            console.print(f"  [dim]⚡ {description}[/dim]")
+                            output.call(console.print)
+                            output.call(console.print, f"  [dim]⚡ {description}[/dim]")
 
                             decisions.append({"type": "approve"})
 
                         hitl_response[interrupt_id] = {"decisions": decisions}
 
                         # Restart spinner for continuation
-                        if not spinner_active:
-                            status.start()
-                            spinner_active = True
+                        spinner.show()
+                    elif not interactive:
+                        # Nobody can answer an approval prompt - reject the whole batch
+                        decisions = [
+                            {
+                                "type": "reject",
+                                "message": "Rejected: approval is not available in headless mode",
+                            }
+                            for _action_request in hitl_request["action_requests"]
+                        ]
+                        any_rejected = True
+                        hitl_response[interrupt_id] = {"decisions": decisions}
                     else:
-                        # Normal HITL flow - stop spinner and prompt user
-                        if spinner_active:
-                            status.stop()
-                            spinner_active = False
+                        # Normal HITL flow - stop spinner and prompt user; the prompt
+                        # writes to the terminal directly, so drain queued output first
+                        spinner.hide()
+                        await output.flush()
 
                         # Handle human-in-the-loop approval
+                        hitl_start = tracer.now()
                         decisions = []
                         for action_index, action_request in enumerate(
                             hitl_request["action_requests"]
@@ -602,22 +839,41 @@ async def execute_task(
                                         tool_name, action_request.get("args", {})
                                     )
 
+                        tracer.complete(
+                            "hitl_wait",
+                            "hitl",
+                            hitl_start,
+                            actions=len(hitl_request["action_requests"]),
+                        )
+
                         if any(decision.get("type") == "reject" for decision in decisions):
                             any_rejected = True
 
                         hitl_response[interrupt_id] = {"decisions": decisions}
 
+                    emit(
+                        "interrupt",
+                        id=interrupt_id,
+                        actions=[
+                            {
+                                "name": action_request.get("name"),
+                                "args": action_request.get("args", {}),
+                                "decision": decision.get("type"),
+                            }
+                            for action_request, decision in zip(
+                                hitl_request["action_requests"], decisions, strict=False
+                            )
+                        ],
+                    )
+
                 suppress_resumed_output = any_rejected
 
             if interrupt_occurred and hitl_response:
                 if suppress_resumed_output:
-                    if spinner_active:
-                        status.stop()
-                        spinner_active = False
-
-                    console.print("[yellow]Command rejected.[/yellow]", style="bold")
-                    console.print("Tell the agent what you'd like to do differently.")
-                    console.print()
+                    spinner.close()
+                    output.call(console.print, "[yellow]Command rejected.[/yellow]", style="bold")
+                    output.call(console.print, "Tell the agent what you'd like to do differently.")
+                    output.call(console.print)
                     return
 
                 # Resume the agent with the human decision
@@ -629,8 +885,9 @@ async def execute_task(
 
     except asyncio.CancelledError:
         # Event loop cancelled the task (e.g. Ctrl+C during streaming) - clean up and return
-        if spinner_active:
-            status.stop()
+        flush_text_buffer(final=True)
+        spinner.close()
+        await output.flush()
         console.print("\n[yellow]Interrupted by user[/yellow]")
         console.print("Updating agent state...", style="dim")
 
@@ -651,8 +908,9 @@ async def execute_task(
 
     except KeyboardInterrupt:
         # User pressed Ctrl+C - clean up and exit gracefully
-        if spinner_active:
-            status.stop()
+        flush_text_buffer(final=True)
+        spinner.close()
+        await output.flush()
         console.print("\n[yellow]Interrupted by user[/yellow]")
         console.print("Updating agent state...", style="dim")
 
@@ -672,11 +930,26 @@ async def execute_task(
 
         return
 
-    if spinner_active:
-        status.stop()
+    finally:
+        # Render whatever is still queued, even if the turn failed
+        spinner.close()
+        await output.aclose()
+        tracer.instant(
+            "file_reads",
+            "tools",
+            reads=file_op_tracker.contents.reads,
+            saved=file_op_tracker.contents.reads_saved,
+        )
+        tracer.complete("turn", "turn", turn_start, thread_id=session_state.thread_id)
+        tracer.save()
 
     if has_responded:
         console.print()
         # Track token usage (display only via /tokens command)
         if token_tracker and (captured_input_tokens or captured_output_tokens):
-            token_tracker.add(captured_input_tokens, captured_output_tokens)
+            token_tracker.add(
+                captured_input_tokens,
+                captured_output_tokens,
+                cache_read=sum(read for read, _write in cache_usage.values()),
+                cache_write=sum(write for _read, write in cache_usage.values()),
+            )
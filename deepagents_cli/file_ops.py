@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-import difflib
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
@@ -10,8 +14,16 @@ from typing import TYPE_CHECKING, Any, Literal
 from deepagents.backends.utils import perform_string_replacement
 
 from deepagents_cli.config import settings
+from deepagents_cli.diff_engine import (
+    DEFAULT_ALGORITHM,
+    DiffAlgorithm,
+    DiffResult,
+    compute_diff,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
     from deepagents.backends.protocol import BACKEND_TYPES
 
 FileOpStatus = Literal["pending", "success", "error"]
@@ -23,8 +35,9 @@ class ApprovalPreview:
 
     title: str
     details: list[str]
-    diff: str | None = None
+    diff: DiffResult | None = None
     diff_title: str | None = None
+    diff_max_lines: int | None = None
     error: str | None = None
 
 
@@ -43,45 +56,37 @@ def _count_lines(text: str) -> int:
     return len(text.splitlines())
 
 
-def compute_unified_diff(
+def compute_file_diff(
     before: str,
     after: str,
     display_path: str,
     *,
-    max_lines: int | None = 800,
     context_lines: int = 3,
-) -> str | None:
-    """Compute a unified diff between before and after content.
+    algorithm: DiffAlgorithm = DEFAULT_ALGORITHM,
+) -> DiffResult | None:
+    """Compute a structured diff between before and after content.
+
+    The result keeps exact addition and deletion counts for the whole change;
+    its text is built (and truncated) only when rendered.
 
     Args:
         before: Original content
         after: New content
         display_path: Path for display in diff headers
-        max_lines: Maximum number of diff lines (None for unlimited)
         context_lines: Number of context lines around changes (default 3)
+        algorithm: Diff algorithm (``patience``, ``myers`` or ``difflib``)
 
     Returns:
-        Unified diff string or None if no changes
+        Diff result or None if no changes
     """
-    before_lines = before.splitlines()
-    after_lines = after.splitlines()
-    diff_lines = list(
-        difflib.unified_diff(
-            before_lines,
-            after_lines,
-            fromfile=f"{display_path} (before)",
-            tofile=f"{display_path} (after)",
-            lineterm="",
-            n=context_lines,
-        )
+    return compute_diff(
+        before.splitlines(),
+        after.splitlines(),
+        fromfile=f"{display_path} (before)",
+        tofile=f"{display_path} (after)",
+        context=context_lines,
+        algorithm=algorithm,
     )
-    if not diff_lines:
-        return None
-    if max_lines is not None and len(diff_lines) > max_lines:
-        truncated = diff_lines[: max_lines - 1]
-        truncated.append("...")
-        return "\n".join(truncated)
-    return "\n".join(diff_lines)
 
 
 @dataclass
@@ -109,7 +114,7 @@ class FileOperationRecord:
     status: FileOpStatus = "pending"
     error: str | None = None
     metrics: FileOpMetrics = field(default_factory=FileOpMetrics)
-    diff: str | None = None
+    diff: DiffResult | None = None
     before_content: str | None = None
     after_content: str | None = None
     read_output: str | None = None
@@ -160,14 +165,8 @@ def build_approval_preview(
         content = str(args.get("content", ""))
         before = _safe_read(physical_path) if physical_path and physical_path.exists() else ""
         after = content
-        diff = compute_unified_diff(before or "", after, display_path, max_lines=100)
-        additions = 0
-        if diff:
-            additions = sum(
-                1
-                for line in diff.splitlines()
-                if line.startswith("+") and not line.startswith("+++")
-            )
+        diff = compute_file_diff(before or "", after, display_path)
+        additions = diff.additions if diff else 0
         total_lines = _count_lines(after)
         details = [
             f"File: {path_str}",
@@ -179,6 +178,7 @@ def build_approval_preview(
             details=details,
             diff=diff,
             diff_title=f"Diff {display_path}",
+            diff_max_lines=100,
         )
 
     if tool_name == "edit_file":
@@ -206,20 +206,9 @@ def build_approval_preview(
                 error=replacement,
             )
         after, occurrences = replacement
-        diff = compute_unified_diff(before, after, display_path, max_lines=None)
-        additions = 0
-        deletions = 0
-        if diff:
-            additions = sum(
-                1
-                for line in diff.splitlines()
-                if line.startswith("+") and not line.startswith("+++")
-            )
-            deletions = sum(
-                1
-                for line in diff.splitlines()
-                if line.startswith("-") and not line.startswith("---")
-            )
+        diff = compute_file_diff(before, after, display_path)
+        additions = diff.additions if diff else 0
+        deletions = diff.deletions if diff else 0
         details = [
             f"File: {path_str}",
             f"Action: Replace text ({'all occurrences' if replace_all else 'single occurrence'})",
@@ -236,6 +225,175 @@ def build_approval_preview(
     return None
 
 
+# Tools whose approval previews read the target file and compute a diff
+_PREVIEW_TOOLS = frozenset({"write_file", "edit_file"})
+
+PreviewKey = tuple[str, str, int | None, str]
+
+
+class ApprovalPreviewCache:
+    """Compute HITL approval previews ahead of time and reuse them.
+
+    Previews are built in a thread pool as soon as an interrupt arrives, so
+    every action of a batch is ready by the time the user pages through it.
+    Entries are keyed by tool, target path, the file's mtime and a hash of the
+    tool arguments; a file that changes on disk simply misses the cache.
+    """
+
+    def __init__(self, *, max_entries: int = 64, max_workers: int = 4) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Number of previews kept (least recently used dropped).
+            max_workers: Threads used to build previews concurrently.
+        """
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self._entries: OrderedDict[PreviewKey, Future[ApprovalPreview | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def prefetch(
+        self, action_requests: Iterable[Mapping[str, Any]], assistant_id: str | None
+    ) -> None:
+        """Start building previews for every action of an interrupt."""
+        jobs = []
+        with self._lock:
+            for action_request in action_requests:
+                tool_name = action_request.get("name")
+                if tool_name not in _PREVIEW_TOOLS:
+                    continue
+                args = action_request.get("args") or {}
+                key = self._key(tool_name, args, assistant_id)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    continue
+                future: Future[ApprovalPreview | None] = Future()
+                self._store(key, future)
+                jobs.append((future, tool_name, args))
+            if not jobs:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="approval-preview"
+                )
+            executor = self._executor
+        # One submission from the caller; the pool fans the rest out itself, so
+        # the caller never waits on worker start-up behind a running diff
+        executor.submit(self._build_batch, executor, jobs, assistant_id)
+
+    def get(
+        self, tool_name: str, args: dict[str, Any], assistant_id: str | None
+    ) -> ApprovalPreview | None:
+        """Return the preview for an action, waiting for a prefetch in flight."""
+        if tool_name not in _PREVIEW_TOOLS:
+            return build_approval_preview(tool_name, args, assistant_id)
+        key = self._key(tool_name, args, assistant_id)
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                self._entries.move_to_end(key)
+                missed = False
+            else:
+                future = Future()
+                self._store(key, future)
+                missed = True
+        if missed:
+            self._build(future, tool_name, args, assistant_id)
+        return future.result()
+
+    def _store(self, key: PreviewKey, future: Future[ApprovalPreview | None]) -> None:
+        self._entries[key] = future
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @classmethod
+    def _build_batch(
+        cls,
+        executor: ThreadPoolExecutor,
+        jobs: list[tuple[Future[ApprovalPreview | None], str, dict[str, Any]]],
+        assistant_id: str | None,
+    ) -> None:
+        for future, tool_name, args in jobs[1:]:
+            executor.submit(cls._build, future, tool_name, args, assistant_id)
+        future, tool_name, args = jobs[0]
+        cls._build(future, tool_name, args, assistant_id)
+
+    @staticmethod
+    def _build(
+        future: Future[ApprovalPreview | None],
+        tool_name: str,
+        args: dict[str, Any],
+        assistant_id: str | None,
+    ) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(build_approval_preview(tool_name, args, assistant_id))
+        except Exception as e:
+            future.set_exception(e)
+
+    @staticmethod
+    def _key(tool_name: str, args: dict[str, Any], assistant_id: str | None) -> PreviewKey:
+        path_str = str(args.get("file_path") or args.get("path") or "")
+        physical_path = resolve_physical_path(path_str, assistant_id)
+        mtime: int | None = None
+        if physical_path is not None:
+            try:
+                mtime = physical_path.stat().st_mtime_ns
+            except OSError:
+                mtime = None
+        payload = json.dumps(args, sort_keys=True, default=str).encode("utf-8")
+        args_hash = hashlib.sha1(payload, usedforsecurity=False).hexdigest()
+        return (tool_name, str(physical_path or path_str), mtime, args_hash)
+
+
+# Tools that cannot change file contents; any other completed tool (shell,
+# execute, subagents, ...) may have, so cached contents are dropped
+NON_MUTATING_TOOLS = frozenset(
+    {
+        "read_file",
+        "ls",
+        "glob",
+        "grep",
+        "web_search",
+        "http_request",
+        "fetch_url",
+        "write_todos",
+    }
+)
+
+
+class FileContentCache:
+    """File contents known during a turn, so they need not be read again.
+
+    Attributes:
+        reads: Reads that went to the backend or filesystem.
+        reads_saved: Reads answered from known content instead.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: dict[str, str] = {}
+        self.reads = 0
+        self.reads_saved = 0
+
+    def get(self, path: str) -> str | None:
+        """Return the known content of path, if any."""
+        return self._entries.get(path)
+
+    def put(self, path: str, content: str) -> None:
+        """Remember the content of path."""
+        self._entries[path] = content
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Forget one path, or everything if path is None."""
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(path, None)
+
+
 class FileOpTracker:
     """Collect file operation metrics during a CLI interaction."""
 
@@ -245,6 +403,7 @@ class FileOpTracker:
         self.backend = backend
         self.active: dict[str | None, FileOperationRecord] = {}
         self.completed: list[FileOperationRecord] = []
+        self.contents = FileContentCache()
 
     def start_operation(
         self, tool_name: str, args: dict[str, Any], tool_call_id: str | None
@@ -260,22 +419,8 @@ class FileOpTracker:
             tool_call_id=tool_call_id,
             args=args,
         )
-        if tool_name in {"write_file", "edit_file"}:
-            if self.backend and path_str:
-                try:
-                    responses = self.backend.download_files([path_str])
-                    if (
-                        responses
-                        and responses[0].content is not None
-                        and responses[0].error is None
-                    ):
-                        record.before_content = responses[0].content.decode("utf-8")
-                    else:
-                        record.before_content = ""
-                except Exception:
-                    record.before_content = ""
-            elif record.physical_path:
-                record.before_content = _safe_read(record.physical_path) or ""
+        if tool_name in {"write_file", "edit_file"} and (self.backend or record.physical_path):
+            record.before_content = self._read_before(path_str, record.physical_path)
         self.active[tool_call_id] = record
 
     def update_args(self, tool_call_id: str, args: dict[str, Any]) -> None:
@@ -292,26 +437,15 @@ class FileOpTracker:
             if path_str:
                 record.display_path = format_display_path(path_str)
                 record.physical_path = resolve_physical_path(path_str, self.assistant_id)
-                if self.backend:
-                    try:
-                        responses = self.backend.download_files([path_str])
-                        if (
-                            responses
-                            and responses[0].content is not None
-                            and responses[0].error is None
-                        ):
-                            record.before_content = responses[0].content.decode("utf-8")
-                        else:
-                            record.before_content = ""
-                    except Exception:
-                        record.before_content = ""
-                elif record.physical_path:
-                    record.before_content = _safe_read(record.physical_path) or ""
+                if self.backend or record.physical_path:
+                    record.before_content = self._read_before(path_str, record.physical_path)
 
     def complete_with_message(self, tool_message: Any) -> FileOperationRecord | None:
         tool_call_id = getattr(tool_message, "tool_call_id", None)
         record = self.active.get(tool_call_id)
         if record is None:
+            if getattr(tool_message, "name", None) not in NON_MUTATING_TOOLS:
+                self.contents.invalidate()
             return None
 
         content = tool_message.content
@@ -332,6 +466,8 @@ class FileOpTracker:
         ) != "success" or content_text.lower().startswith("error"):
             record.status = "error"
             record.error = content_text
+            # A failed write or edit may have left the file in any state
+            self.contents.invalidate(self._path_key(record))
             self._finalize(record)
             return record
 
@@ -353,7 +489,8 @@ class FileOpTracker:
             if isinstance(limit, int) and lines > limit:
                 record.metrics.end_line = (record.metrics.start_line or 1) + limit - 1
         else:
-            # For write/edit operations, read back from backend (or local filesystem)
+            # For write/edit operations, determine the after-state (from the
+            # write_file arguments, or read back for edits)
             self._populate_after_content(record)
             if record.after_content is None:
                 record.status = "error"
@@ -362,36 +499,20 @@ class FileOpTracker:
                 return record
             record.metrics.lines_written = _count_lines(record.after_content)
             before_lines = _count_lines(record.before_content or "")
-            diff = compute_unified_diff(
-                record.before_content or "",
-                record.after_content,
-                record.display_path,
-                max_lines=100,
-            )
+            diff = None
+            if (record.before_content or "") != record.after_content:
+                diff = compute_file_diff(
+                    record.before_content or "",
+                    record.after_content,
+                    record.display_path,
+                )
             record.diff = diff
             if diff:
-                additions = sum(
-                    1
-                    for line in diff.splitlines()
-                    if line.startswith("+") and not line.startswith("+++")
-                )
-                deletions = sum(
-                    1
-                    for line in diff.splitlines()
-                    if line.startswith("-") and not line.startswith("---")
-                )
-                record.metrics.lines_added = additions
-                record.metrics.lines_removed = deletions
+                record.metrics.lines_added = diff.additions
+                record.metrics.lines_removed = diff.deletions
             elif record.tool_name == "write_file" and (record.before_content or "") == "":
                 record.metrics.lines_added = record.metrics.lines_written
             record.metrics.bytes_written = len(record.after_content.encode("utf-8"))
-            if record.diff is None and (record.before_content or "") != record.after_content:
-                record.diff = compute_unified_diff(
-                    record.before_content or "",
-                    record.after_content,
-                    record.display_path,
-                    max_lines=100,
-                )
             if record.diff is None and before_lines != record.metrics.lines_written:
                 record.metrics.lines_added = max(record.metrics.lines_written - before_lines, 0)
 
@@ -412,30 +533,50 @@ class FileOpTracker:
                     record.hitl_approved = True
 
     def _populate_after_content(self, record: FileOperationRecord) -> None:
-        # Use backend if available (works for any BackendProtocol implementation)
+        path_key = self._path_key(record)
+        if record.tool_name == "write_file" and "content" in record.args:
+            # write_file succeeded, so the file holds exactly what was sent
+            content = record.args["content"]
+            record.after_content = content if isinstance(content, str) else str(content)
+            self.contents.reads_saved += 1
+        elif self.backend or record.physical_path is not None:
+            file_path = record.args.get("file_path") or record.args.get("path")
+            record.after_content = self._read(file_path, record.physical_path)
+        else:
+            record.after_content = None
+
+        if path_key and record.after_content is not None:
+            self.contents.put(path_key, record.after_content)
+
+    def _read_before(self, path_str: str, physical_path: Path | None) -> str:
+        """Content before a write/edit; a missing or unreadable file counts as empty."""
+        cached = self.contents.get(path_str) if path_str else None
+        if cached is not None:
+            self.contents.reads_saved += 1
+            return cached
+        return self._read(path_str, physical_path) or ""
+
+    def _read(self, path_str: str | None, physical_path: Path | None) -> str | None:
+        """Read a file through the backend (or the local filesystem without one)."""
         if self.backend:
+            if not path_str:
+                return None
+            self.contents.reads += 1
             try:
-                file_path = record.args.get("file_path") or record.args.get("path")
-                if file_path:
-                    responses = self.backend.download_files([file_path])
-                    if (
-                        responses
-                        and responses[0].content is not None
-                        and responses[0].error is None
-                    ):
-                        record.after_content = responses[0].content.decode("utf-8")
-                    else:
-                        record.after_content = None
-                else:
-                    record.after_content = None
+                responses = self.backend.download_files([path_str])
             except Exception:
-                record.after_content = None
-        else:
-            # Fallback: direct filesystem read when no backend provided
-            if record.physical_path is None:
-                record.after_content = None
-                return
-            record.after_content = _safe_read(record.physical_path)
+                return None
+            if responses and responses[0].content is not None and responses[0].error is None:
+                return responses[0].content.decode("utf-8")
+            return None
+        if physical_path is None:
+            return None
+        self.contents.reads += 1
+        return _safe_read(physical_path)
+
+    @staticmethod
+    def _path_key(record: FileOperationRecord) -> str:
+        return str(record.args.get("file_path") or record.args.get("path") or "")
 
     def _finalize(self, record: FileOperationRecord) -> None:
         self.completed.append(record)
@@ -0,0 +1,232 @@
+"""Headless batch execution (`deepagents run`) with NDJSON event output.
+
+Runs one or more prompts through ``execute_task`` without a TTY. Every prompt
+gets its own thread id, prompts run concurrently under a bounded semaphore, and
+each tool call, tool result, text segment, interrupt and token-usage update is
+written to stdout as one JSON object per line.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from deepagents_cli.config import SessionState, console, create_model, settings
+from deepagents_cli.execution import execute_task
+
+if TYPE_CHECKING:
+    import argparse
+
+    from deepagents_cli.execution import EventSink
+
+
+class NdjsonEventWriter:
+    """Write execution events as newline-delimited JSON.
+
+    All prompts run on the same event loop, so writes never interleave; each
+    line is flushed immediately so consumers can follow the stream live.
+    """
+
+    def __init__(self, stream: IO[str] | None = None) -> None:
+        """Initialize the writer.
+
+        Args:
+            stream: Output stream. Defaults to ``sys.stdout``.
+        """
+        self._stream = stream or sys.stdout
+
+    def write(self, event: dict[str, Any]) -> None:
+        """Write a single event line."""
+        self._stream.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+        self._stream.flush()
+
+    def bind(self, **fields: Any) -> EventSink:
+        """Return an event sink that adds ``fields`` to every event."""
+
+        def sink(event: dict[str, Any]) -> None:
+            self.write({"ts": round(time.time(), 3), **fields, **event})
+
+        return sink
+
+
+def read_prompts(prompts: list[str], prompt_file: str | None) -> list[str]:
+    """Collect prompts from arguments, a file, or stdin.
+
+    Files contain one prompt per line; blank lines are ignored. ``-`` reads
+    from stdin. With no prompts or file, stdin is read if it is not a TTY.
+
+    Args:
+        prompts: Prompts passed on the command line.
+        prompt_file: Optional path to a prompt file (or ``-`` for stdin).
+
+    Returns:
+        List of prompts in input order.
+    """
+    collected = [prompt for prompt in prompts if prompt.strip()]
+
+    lines: list[str] = []
+    if prompt_file == "-" or (prompt_file is None and not collected and not sys.stdin.isatty()):
+        lines = sys.stdin.read().splitlines()
+    elif prompt_file:
+        lines = Path(prompt_file).read_text().splitlines()
+
+    collected.extend(line.strip() for line in lines if line.strip())
+    return collected
+
+
+async def run_prompts(
+    prompts: list[str],
+    agent,
+    assistant_id: str,
+    *,
+    auto_approve: bool,
+    concurrency: int,
+    writer: NdjsonEventWriter,
+    backend=None,
+) -> int:
+    """Run prompts concurrently, each on its own thread.
+
+    Args:
+        prompts: Prompts to execute.
+        agent: Compiled agent graph shared by all prompts.
+        assistant_id: Agent identifier for memory paths.
+        auto_approve: Approve tool actions instead of rejecting them.
+        concurrency: Maximum number of prompts running at once.
+        writer: Destination for NDJSON events.
+        backend: Backend used for file operation tracking.
+
+    Returns:
+        Number of prompts that failed with an error.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(index: int, prompt: str) -> bool:
+        async with semaphore:
+            session_state = SessionState(auto_approve=auto_approve)
+            sink = writer.bind(prompt_index=index, thread_id=session_state.thread_id)
+            sink({"type": "start", "prompt": prompt})
+            started = time.perf_counter()
+            try:
+                await execute_task(
+                    prompt,
+                    agent,
+                    assistant_id,
+                    session_state,
+                    backend=backend,
+                    event_sink=sink,
+                    interactive=False,
+                )
+            except Exception as e:
+                sink({"type": "error", "error": f"{type(e).__name__}: {e}"})
+                ok = False
+            else:
+                ok = True
+            sink(
+                {
+                    "type": "end",
+                    "status": "ok" if ok else "error",
+                    "duration_s": round(time.perf_counter() - started, 3),
+                }
+            )
+            return ok
+
+    results = await asyncio.gather(
+        *(run_one(index, prompt) for index, prompt in enumerate(prompts))
+    )
+    return sum(1 for ok in results if not ok)
+
+
+async def run_headless(args: argparse.Namespace) -> int:
+    """Create the agent and run the prompts given to `deepagents run`.
+
+    Args:
+        args: Parsed arguments of the run subcommand.
+
+    Returns:
+        Process exit code.
+    """
+    from deepagents_cli.agent import create_cli_agent
+    from deepagents_cli.tools import fetch_url, http_request, web_search
+
+    prompts = read_prompts(args.prompts, args.file)
+    if not prompts:
+        sys.stderr.write("deepagents run: no prompts given (pass arguments, --file or stdin)\n")
+        return 2
+
+    # stdout is reserved for NDJSON events: model selection messages and
+    # errors go to stderr, and the rich rendering of each turn is silenced
+    console.file = sys.stderr
+    model = create_model()
+    console.quiet = True
+
+    tools = [http_request, fetch_url]
+    if settings.has_tavily:
+        tools.append(web_search)
+
+    agent, backend = create_cli_agent(
+        model=model,
+        assistant_id=args.agent,
+        tools=tools,
+        auto_approve=args.auto_approve,
+        cache_prompt_layout=args.cache_prompt,
+    )
+
+    failures = await run_prompts(
+        prompts,
+        agent,
+        args.agent,
+        auto_approve=args.auto_approve,
+        concurrency=args.concurrency,
+        writer=NdjsonEventWriter(),
+        backend=backend,
+    )
+    return 1 if failures else 0
+
+
+def setup_run_parser(subparsers: Any) -> argparse.ArgumentParser:
+    """Add the `run` subcommand to the CLI parser."""
+    run_parser = subparsers.add_parser(
+        "run", help="Run prompts non-interactively and emit NDJSON events"
+    )
+    run_parser.add_argument("prompts", nargs="*", help="Prompts to run")
+    run_parser.add_argument(
+        "-f",
+        "--file",
+        help="File with one prompt per line ('-' for stdin)",
+    )
+    run_parser.add_argument(
+        "--agent",
+        default="agent",
+        help="Agent identifier for separate memory stores (default: agent).",
+    )
+    run_parser.add_argument(
+        "--auto-approve",
+        action="store_true",
+        help="Approve tool actions (otherwise actions needing approval are rejected)",
+    )
+    run_parser.add_argument(
+        "--cache-prompt",
+        action="store_true",
+        help="Order the system prompt for provider prompt caching (static parts first)",
+    )
+    run_parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of prompts running at once (default: 4)",
+    )
+    return run_parser
+
+
+__all__ = [
+    "NdjsonEventWriter",
+    "read_prompts",
+    "run_headless",
+    "run_prompts",
+    "setup_run_parser",
+]
@@ -0,0 +1,184 @@
+"""Concurrent command execution and file transfer for sandbox backends.
+
+The sandbox SDKs run one command per blocking call, and every call is a
+network round trip. ``BatchSandbox`` adds ``execute_many`` and
+``aexecute_many``, which keep up to ``max_concurrency`` commands in flight over
+the backend's shared client (and its connection pool), each with its own
+timeout. A command that fails is reported in its own ``ExecuteResponse``
+instead of aborting the batch. File transfers go through the concurrent
+engine in ``transfer``.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from deepagents.backends.protocol import (
+    ExecuteResponse,
+    FileDownloadResponse,
+    FileUploadResponse,
+)
+from deepagents.backends.sandbox import BaseSandbox
+
+from deepagents_cli.integrations import transfer
+
+# Commands kept in flight by execute_many / aexecute_many by default
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Exit code reported for a command stopped by its timeout (as coreutils `timeout`)
+TIMEOUT_EXIT_CODE = 124
+
+
+def combine_output(stdout: str | None, stderr: str | None) -> str:
+    """Join stdout and stderr the way the backends report them."""
+    output = stdout or ""
+    if stderr:
+        output += "\n" + stderr if output else stderr
+    return output
+
+
+def timeout_response(timeout: float) -> ExecuteResponse:
+    """Build the response of a command stopped by its timeout."""
+    return ExecuteResponse(
+        output=f"Error: Command timed out after {timeout:g} seconds.",
+        exit_code=TIMEOUT_EXIT_CODE,
+    )
+
+
+def error_response(error: Exception) -> ExecuteResponse:
+    """Build the response of a command whose execution request failed."""
+    return ExecuteResponse(output=f"Error: {type(error).__name__}: {error}", exit_code=None)
+
+
+class BatchSandbox(BaseSandbox, abc.ABC):
+    """Base class for sandbox backends that can run commands concurrently.
+
+    Subclasses implement ``execute`` (and, when the SDK has an async client,
+    ``aexecute``) with a per-call ``timeout``; both accept ``None`` for the
+    backend's default. They must implement ``_read_file`` and ``_write_file``
+    for one file, and may also override ``download_files`` and ``upload_files``
+    when the SDK has a batch API.
+
+    Attributes:
+        max_concurrency: Default number of commands kept in flight by
+            ``execute_many`` and ``aexecute_many``.
+        transfer_workers: Number of files transferred at once.
+        bulk_transfer: Whether file transfers pack small files into tar
+            archives sent through ``execute`` by default.
+    """
+
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    transfer_workers: int = transfer.DEFAULT_TRANSFER_WORKERS
+    bulk_transfer: bool = False
+
+    def execute_many(
+        self,
+        commands: Sequence[str],
+        *,
+        timeout: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[ExecuteResponse]:
+        """Run commands concurrently on worker threads.
+
+        Args:
+            commands: Shell commands to run. They may run in any order and in
+                parallel, so they must not depend on each other.
+            timeout: Timeout of each command in seconds (None for the
+                backend's default).
+            max_concurrency: Commands kept in flight (default
+                ``self.max_concurrency``).
+
+        Returns:
+            One response per command, in the order of ``commands``.
+        """
+        workers = min(max_concurrency or self.max_concurrency, len(commands))
+        if workers <= 1:
+            return [self._execute_or_error(command, timeout) for command in commands]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sandbox-exec") as pool:
+            return list(pool.map(self._execute_or_error, commands, [timeout] * len(commands)))
+
+    async def aexecute_many(
+        self,
+        commands: Sequence[str],
+        *,
+        timeout: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[ExecuteResponse]:
+        """Run commands concurrently with ``aexecute``; see ``execute_many``."""
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def run(command: str) -> ExecuteResponse:
+            async with semaphore:
+                try:
+                    return await self.aexecute(command, timeout=timeout)
+                except Exception as e:
+                    return error_response(e)
+
+        return list(await asyncio.gather(*(run(command) for command in commands)))
+
+    def download_files(
+        self, paths: list[str], *, bulk: bool | None = None
+    ) -> list[FileDownloadResponse]:
+        """Download files concurrently.
+
+        Supports partial success - individual downloads may fail without
+        affecting others.
+
+        Args:
+            paths: List of file paths to download.
+            bulk: Fetch small files in tar archives over ``execute`` (default
+                ``self.bulk_transfer``).
+
+        Returns:
+            List of FileDownloadResponse objects, one per input path.
+            Response order matches input order.
+        """
+        return transfer.download_files(
+            self, paths, bulk=self.bulk_transfer if bulk is None else bulk
+        )
+
+    def upload_files(
+        self, files: list[tuple[str, bytes]], *, bulk: bool | None = None
+    ) -> list[FileUploadResponse]:
+        """Upload files concurrently.
+
+        Supports partial success - individual uploads may fail without
+        affecting others.
+
+        Args:
+            files: List of (path, content) tuples to upload.
+            bulk: Send small files in tar archives over ``execute`` (default
+                ``self.bulk_transfer``).
+
+        Returns:
+            List of FileUploadResponse objects, one per input file.
+            Response order matches input order.
+        """
+        return transfer.upload_files(self, files, bulk=self.bulk_transfer if bulk is None else bulk)
+
+    @abc.abstractmethod
+    def _read_file(self, path: str) -> bytes:
+        """Read one file from the sandbox, raising on failure."""
+
+    @abc.abstractmethod
+    def _write_file(self, path: str, content: bytes) -> None:
+        """Write one file to the sandbox, raising on failure."""
+
+    def _execute_or_error(self, command: str, timeout: int | None) -> ExecuteResponse:
+        try:
+            return self.execute(command, timeout=timeout)
+        except Exception as e:
+            return error_response(e)
+
+
+__all__ = [
+    "DEFAULT_MAX_CONCURRENCY",
+    "TIMEOUT_EXIT_CODE",
+    "BatchSandbox",
+    "combine_output",
+    "error_response",
+    "timeout_response",
+]
@@ -9,17 +9,19 @@ from deepagents.backends.protocol import (
     FileDownloadResponse,
     FileUploadResponse,
 )
-from deepagents.backends.sandbox import BaseSandbox
+
+from deepagents_cli.integrations.batch import BatchSandbox
 
 if TYPE_CHECKING:
     from daytona import Sandbox
 
 
-class DaytonaBackend(BaseSandbox):
+class DaytonaBackend(BatchSandbox):
     """Daytona backend implementation conforming to SandboxBackendProtocol.
 
     This implementation inherits all file operation methods from BaseSandbox
-    and only implements the execute() method using Daytona's API.
+    and only implements the execute() method using Daytona's API. Concurrent
+    calls share the sandbox's HTTP connection pool.
     """
 
     def __init__(self, sandbox: Sandbox) -> None:
@@ -39,16 +41,22 @@ class DaytonaBackend(BaseSandbox):
     def execute(
         self,
         command: str,
+        *,
+        timeout: int | None = None,
     ) -> ExecuteResponse:
         """Execute a command in the sandbox and return ExecuteResponse.
 
         Args:
             command: Full shell command string to execute.
+            timeout: Maximum execution time in seconds (default: 30 minutes,
+                0 for no timeout).
 
         Returns:
             ExecuteResponse with combined output, exit code, optional signal, and truncation flag.
         """
-        result = self._sandbox.process.exec(command, timeout=self._timeout)
+        result = self._sandbox.process.exec(
+            command, timeout=self._timeout if timeout is None else timeout
+        )
 
         return ExecuteResponse(
             output=result.result,  # Daytona combines stdout/stderr
@@ -56,7 +64,9 @@ class DaytonaBackend(BaseSandbox):
             truncated=False,
         )
 
-    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
+    def download_files(
+        self, paths: list[str], *, bulk: bool | None = None
+    ) -> list[FileDownloadResponse]:
         """Download multiple files from the Daytona sandbox.
 
         Leverages Daytona's native batch download API for efficiency.
@@ -65,6 +75,8 @@ class DaytonaBackend(BaseSandbox):
 
         Args:
             paths: List of file paths to download.
+            bulk: Fetch small files in tar archives over ``execute`` instead
+                (default ``self.bulk_transfer``).
 
         Returns:
             List of FileDownloadResponse objects, one per input path.
@@ -73,6 +85,9 @@ class DaytonaBackend(BaseSandbox):
         TODO: Map Daytona API error strings to standardized FileOperationError codes.
         Currently only implements happy path.
         """
+        if self.bulk_transfer if bulk is None else bulk:
+            return super().download_files(paths, bulk=True)
+
         from daytona import FileDownloadRequest
 
         # Create batch download request using Daytona's native batch API
@@ -90,7 +105,9 @@ class DaytonaBackend(BaseSandbox):
             for resp in daytona_responses
         ]
 
-    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
+    def upload_files(
+        self, files: list[tuple[str, bytes]], *, bulk: bool | None = None
+    ) -> list[FileUploadResponse]:
         """Upload multiple files to the Daytona sandbox.
 
         Leverages Daytona's native batch upload API for efficiency.
@@ -99,6 +116,8 @@ class DaytonaBackend(BaseSandbox):
 
         Args:
             files: List of (path, content) tuples to upload.
+            bulk: Send small files in tar archives over ``execute`` instead
+                (default ``self.bulk_transfer``).
 
         Returns:
             List of FileUploadResponse objects, one per input file.
@@ -107,6 +126,9 @@ class DaytonaBackend(BaseSandbox):
         TODO: Map Daytona API error strings to standardized FileOperationError codes.
         Currently only implements happy path.
         """
+        if self.bulk_transfer if bulk is None else bulk:
+            return super().upload_files(files, bulk=True)
+
         from daytona import FileUpload
 
         # Create batch upload request using Daytona's native batch API
@@ -115,3 +137,11 @@ class DaytonaBackend(BaseSandbox):
 
         # TODO: Check if Daytona returns error info and map to FileOperationError codes
         return [FileUploadResponse(path=path, error=None) for path, _ in files]
+
+    def _read_file(self, path: str) -> bytes:
+        """Download one file from the sandbox."""
+        return self._sandbox.fs.download_file(path)
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        """Upload one file to the sandbox."""
+        self._sandbox.fs.upload_file(content, path)
@@ -0,0 +1,122 @@
+"""Local stand-in for a remote sandbox backend.
+
+``LocalSandboxBackend`` runs commands and file transfers on this machine,
+delaying each call by a fixed latency to simulate a provider's network round
+trip. It lets sandbox throughput (batching, concurrency, file transfer) be
+benchmarked and developed offline. It offers no isolation from the host.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import time
+import uuid
+from pathlib import Path
+
+from deepagents.backends.protocol import ExecuteResponse
+
+from deepagents_cli.integrations.batch import BatchSandbox, combine_output, timeout_response
+
+
+class LocalSandboxBackend(BatchSandbox):
+    """Sandbox backend that runs commands with ``bash -c`` in a local directory.
+
+    Every ``execute`` and every file transferred costs one simulated round
+    trip of ``latency`` seconds, like one request to a remote sandbox API.
+    """
+
+    def __init__(self, root_dir: str | Path, *, latency: float = 0.0) -> None:
+        """Initialize the backend.
+
+        Args:
+            root_dir: Working directory of commands (the sandbox "workspace").
+            latency: Seconds added to every call to simulate a round trip.
+        """
+        self._root_dir = Path(root_dir)
+        self._latency = latency
+        self._timeout = 30 * 60
+        self._id = f"local-{uuid.uuid4().hex[:8]}"
+
+    @property
+    def id(self) -> str:
+        """Unique identifier for the sandbox backend."""
+        return self._id
+
+    def execute(
+        self,
+        command: str,
+        *,
+        timeout: int | None = None,
+    ) -> ExecuteResponse:
+        """Execute a command in the root directory.
+
+        Args:
+            command: Full shell command string to execute.
+            timeout: Maximum execution time in seconds (default: 30 minutes,
+                0 for no timeout).
+
+        Returns:
+            ExecuteResponse with combined output and exit code.
+        """
+        timeout = self._timeout if timeout is None else timeout
+        time.sleep(self._latency)
+        try:
+            result = subprocess.run(
+                ["bash", "-c", command],
+                cwd=self._root_dir,
+                capture_output=True,
+                text=True,
+                timeout=timeout or None,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            return timeout_response(timeout)
+        return ExecuteResponse(
+            output=combine_output(result.stdout, result.stderr), exit_code=result.returncode
+        )
+
+    async def aexecute(
+        self,
+        command: str,
+        *,
+        timeout: int | None = None,
+    ) -> ExecuteResponse:
+        """Async version of execute, without a thread per command."""
+        timeout = self._timeout if timeout is None else timeout
+        await asyncio.sleep(self._latency)
+        process = await asyncio.create_subprocess_exec(
+            "bash",
+            "-c",
+            command,
+            cwd=self._root_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout or None)
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+            return timeout_response(timeout)
+        return ExecuteResponse(
+            output=combine_output(
+                stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace")
+            ),
+            exit_code=process.returncode,
+        )
+
+    def _read_file(self, path: str) -> bytes:
+        """Read one file (relative to the root directory or absolute)."""
+        time.sleep(self._latency)
+        return (self._root_dir / path).read_bytes()
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        """Write one file, creating parent directories."""
+        time.sleep(self._latency)
+        target = self._root_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+
+
+__all__ = ["LocalSandboxBackend"]
@@ -4,22 +4,23 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from deepagents.backends.protocol import (
-    ExecuteResponse,
-    FileDownloadResponse,
-    FileUploadResponse,
-)
-from deepagents.backends.sandbox import BaseSandbox
+from deepagents.backends.protocol import ExecuteResponse
+
+from deepagents_cli.integrations.batch import BatchSandbox, combine_output
+from deepagents_cli.integrations.transfer import CHUNK_SIZE
 
 if TYPE_CHECKING:
     import modal
 
 
-class ModalBackend(BaseSandbox):
+class ModalBackend(BatchSandbox):
     """Modal backend implementation conforming to SandboxBackendProtocol.
 
     This implementation inherits all file operation methods from BaseSandbox
-    and only implements the execute() method using Modal's API.
+    and only implements the execute() method using Modal's API. ``aexecute``
+    uses Modal's native async API, so concurrent commands share the client's
+    single connection instead of occupying a thread each. File transfers run
+    concurrently, one sandbox file handle per file.
     """
 
     def __init__(self, sandbox: modal.Sandbox) -> None:
@@ -36,20 +37,30 @@ class ModalBackend(BaseSandbox):
         """Unique identifier for the sandbox backend."""
         return self._sandbox.object_id
 
+    def _exec_timeout(self, timeout: int | None) -> int | None:
+        if timeout is None:
+            return self._timeout
+        # Modal treats a missing timeout as "no timeout"
+        return timeout or None
+
     def execute(
         self,
         command: str,
+        *,
+        timeout: int | None = None,
     ) -> ExecuteResponse:
         """Execute a command in the sandbox and return ExecuteResponse.
 
         Args:
             command: Full shell command string to execute.
+            timeout: Maximum execution time in seconds (default: 30 minutes,
+                0 for no timeout).
 
         Returns:
             ExecuteResponse with combined output, exit code, and truncation flag.
         """
         # Execute command using Modal's exec API
-        process = self._sandbox.exec("bash", "-c", command, timeout=self._timeout)
+        process = self._sandbox.exec("bash", "-c", command, timeout=self._exec_timeout(timeout))
 
         # Wait for process to complete
         process.wait()
@@ -58,69 +69,47 @@ class ModalBackend(BaseSandbox):
         stdout = process.stdout.read()
         stderr = process.stderr.read()
 
-        # Combine stdout and stderr (matching Runloop's approach)
-        output = stdout or ""
-        if stderr:
-            output += "\n" + stderr if output else stderr
-
         return ExecuteResponse(
-            output=output,
+            output=combine_output(stdout, stderr),
             exit_code=process.returncode,
             truncated=False,  # Modal doesn't provide truncation info
         )
 
-    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
-        """Download multiple files from the Modal sandbox.
-
-        Supports partial success - individual downloads may fail without
-        affecting others.
-
-        Args:
-            paths: List of file paths to download.
-
-        Returns:
-            List of FileDownloadResponse objects, one per input path.
-            Response order matches input order.
-
-        TODO: Implement proper error handling with standardized FileOperationError codes.
-        Need to determine what exceptions Modal's sandbox.open() actually raises.
-        Currently only implements happy path.
-        """
-        # This implementation relies on the Modal sandbox file API.
-        # https://modal.com/doc/guide/sandbox-files
-        # The API is currently in alpha and is not recommended for production use.
-        # We're OK using it here as it's targeting the CLI application.
-        responses = []
-        for path in paths:
-            with self._sandbox.open(path, "rb") as f:
-                content = f.read()
-            responses.append(FileDownloadResponse(path=path, content=content, error=None))
-        return responses
-
-    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
-        """Upload multiple files to the Modal sandbox.
-
-        Supports partial success - individual uploads may fail without
-        affecting others.
-
-        Args:
-            files: List of (path, content) tuples to upload.
-
-        Returns:
-            List of FileUploadResponse objects, one per input file.
-            Response order matches input order.
+    async def aexecute(
+        self,
+        command: str,
+        *,
+        timeout: int | None = None,
+    ) -> ExecuteResponse:
+        """Async version of execute, using Modal's ``.aio`` API."""
+        process = await self._sandbox.exec.aio(
+            "bash", "-c", command, timeout=self._exec_timeout(timeout)
+        )
+        await process.wait.aio()
+        stdout = await process.stdout.read.aio()
+        stderr = await process.stderr.read.aio()
+        return ExecuteResponse(
+            output=combine_output(stdout, stderr),
+            exit_code=process.returncode,
+            truncated=False,
+        )
 
-        TODO: Implement proper error handling with standardized FileOperationError codes.
-        Need to determine what exceptions Modal's sandbox.open() actually raises.
-        Currently only implements happy path.
-        """
-        # This implementation relies on the Modal sandbox file API.
-        # https://modal.com/doc/guide/sandbox-files
-        # The API is currently in alpha and is not recommended for production use.
-        # We're OK using it here as it's targeting the CLI application.
-        responses = []
-        for path, content in files:
-            with self._sandbox.open(path, "wb") as f:
-                f.write(content)
-            responses.append(FileUploadResponse(path=path, error=None))
-        return responses
+    # The file methods rely on the Modal sandbox file API.
+    # https://modal.com/doc/guide/sandbox-files
+    # The API is currently in alpha and is not recommended for production use.
+    # We're OK using it here as it's targeting the CLI application.
+    # Files are streamed in chunks so large files do not need one huge request.
+
+    def _read_file(self, path: str) -> bytes:
+        """Read one file from the sandbox in chunks."""
+        content = bytearray()
+        with self._sandbox.open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                content += chunk
+        return bytes(content)
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        """Write one file to the sandbox in chunks."""
+        with self._sandbox.open(path, "wb") as f:
+            for start in range(0, len(content), CHUNK_SIZE):
+                f.write(content[start : start + CHUNK_SIZE])
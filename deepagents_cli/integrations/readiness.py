@@ -0,0 +1,164 @@
+"""Sandbox readiness polling and startup metrics.
+
+``wait_until_ready`` replaces fixed-interval polling of a freshly created
+sandbox: it probes once immediately, then backs off exponentially with jitter,
+so a sandbox that comes up quickly is noticed within a fraction of a second
+while a slow one is not hammered with probes. Provider factories use a
+provider's own wait API first where one exists and probe only to confirm.
+
+``StartupMetrics`` records when each startup phase of a session's sandbox
+finished (``create``, ``first-ready``, ``setup-done``). Every session prints
+the timings, appends them to a JSON-lines log and adds them to the session
+trace when tracing is on.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from deepagents_cli.tracing import SessionTracer
+
+# Seconds a sandbox may take to become ready
+DEFAULT_READY_TIMEOUT = 180.0
+
+# Seconds between the first and second probe
+_INITIAL_INTERVAL = 0.1
+
+# Factor the interval grows by after every failed probe
+_BACKOFF = 1.5
+
+# Upper bound of the interval between probes, and so of how late a sandbox
+# that became ready is noticed
+_MAX_INTERVAL = 2.0
+
+# Fraction by which every interval is randomly stretched or shrunk, so
+# sessions started together do not probe in lockstep
+_JITTER = 0.25
+
+STARTUP_LOG_NAME = "sandbox_startup.jsonl"
+
+# Startup phases in the order they finish
+PHASES = ("create", "first-ready", "setup-done")
+
+
+def wait_until_ready(
+    probe: Callable[[], bool],
+    *,
+    timeout: float = DEFAULT_READY_TIMEOUT,
+    initial_interval: float = _INITIAL_INTERVAL,
+    max_interval: float = _MAX_INTERVAL,
+    jitter: float = _JITTER,
+) -> int:
+    """Call ``probe`` until it returns True, backing off exponentially between calls.
+
+    The first probe runs immediately. Exceptions raised by ``probe`` propagate,
+    so a probe can abort the wait (e.g. when the sandbox terminated).
+
+    Args:
+        probe: Returns whether the sandbox is ready.
+        timeout: Seconds to wait before giving up.
+        initial_interval: Seconds between the first and second probe.
+        max_interval: Upper bound of the interval between probes.
+        jitter: Fraction by which every interval is randomly varied.
+
+    Returns:
+        Number of probes made.
+
+    Raises:
+        TimeoutError: If the sandbox was not ready within ``timeout``.
+    """
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    probes = 0
+    while True:
+        probes += 1
+        if probe():
+            return probes
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            msg = f"Not ready after {timeout:g} seconds ({probes} probes)"
+            raise TimeoutError(msg)
+        delay = interval * random.uniform(1 - jitter, 1 + jitter)
+        time.sleep(min(delay, remaining))
+        interval = min(interval * _BACKOFF, max_interval)
+
+
+@dataclass
+class StartupMetrics:
+    """Timings of the startup phases of one session's sandbox.
+
+    Attributes:
+        provider: Sandbox provider.
+        source: How the sandbox was obtained ("created", "connected", "pool").
+        started: ``time.perf_counter()`` when startup began.
+        marks: ``time.perf_counter()`` when each finished phase ended.
+        probes: Readiness probes made before the sandbox was ready.
+    """
+
+    provider: str
+    source: str = "created"
+    started: float = field(default_factory=time.perf_counter)
+    marks: dict[str, float] = field(default_factory=dict)
+    probes: int = 0
+
+    def mark(self, phase: str) -> None:
+        """Record that ``phase`` finished now."""
+        self.marks[phase] = time.perf_counter()
+
+    def elapsed(self) -> dict[str, float]:
+        """Seconds from the start of startup to the end of every finished phase."""
+        return {
+            phase: round(self.marks[phase] - self.started, 3)
+            for phase in PHASES
+            if phase in self.marks
+        }
+
+    def describe(self) -> str:
+        """One-line summary for the console."""
+        timings = ", ".join(f"{phase} {seconds:.1f}s" for phase, seconds in self.elapsed().items())
+        probes = f", {self.probes} probes" if self.probes else ""
+        return f"{self.provider} sandbox {self.source}: {timings}{probes}"
+
+    def record(self, log_path: Path, tracer: SessionTracer | None = None) -> None:
+        """Append the timings to a JSON-lines log and add them to the session trace.
+
+        Args:
+            log_path: Startup log file.
+            tracer: Session tracer; each phase becomes a span on its
+                ``startup`` track.
+        """
+        entry = {
+            "time": time.time(),
+            "provider": self.provider,
+            "source": self.source,
+            "probes": self.probes,
+            **self.elapsed(),
+        }
+        try:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with log_path.open("a") as log:
+                log.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+        if tracer is not None:
+            start = self.started
+            for phase in PHASES:
+                if phase in self.marks:
+                    tracer.complete(phase, "startup", start, self.marks[phase])
+                    start = self.marks[phase]
+
+
+__all__ = [
+    "DEFAULT_READY_TIMEOUT",
+    "PHASES",
+    "STARTUP_LOG_NAME",
+    "StartupMetrics",
+    "wait_until_ready",
+]
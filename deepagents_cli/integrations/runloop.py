@@ -9,18 +9,25 @@ except ImportError:
     )
     raise ImportError(msg)
 
+import io
 import os
 
-from deepagents.backends.protocol import ExecuteResponse, FileDownloadResponse, FileUploadResponse
-from deepagents.backends.sandbox import BaseSandbox
-from runloop_api_client import Runloop
+from deepagents.backends.protocol import ExecuteResponse
+from runloop_api_client import AsyncRunloop, Runloop
+from runloop_api_client.lib.polling import PollingConfig, PollingTimeout
+from runloop_api_client.types import DevboxAsyncExecutionDetailView
 
+from deepagents_cli.integrations.batch import BatchSandbox, combine_output, timeout_response
+from deepagents_cli.integrations.transfer import CHUNK_SIZE
 
-class RunloopBackend(BaseSandbox):
+
+class RunloopBackend(BatchSandbox):
     """Backend that operates on files in a Runloop devbox.
 
     This implementation uses the Runloop API client to execute commands
-    and manipulate files within a remote devbox environment.
+    and manipulate files within a remote devbox environment. Concurrent calls
+    (including concurrent file transfers) share the client's HTTP connection
+    pool; ``aexecute`` uses an ``AsyncRunloop`` client created on first use.
     """
 
     def __init__(
@@ -28,6 +35,8 @@ class RunloopBackend(BaseSandbox):
         devbox_id: str,
         client: Runloop | None = None,
         api_key: str | None = None,
+        *,
+        async_client: AsyncRunloop | None = None,
     ) -> None:
         """Initialize Runloop protocol.
 
@@ -36,6 +45,8 @@ class RunloopBackend(BaseSandbox):
             client: Optional existing Runloop client instance
             api_key: Optional API key for creating a new client
                          (defaults to RUNLOOP_API_KEY environment variable)
+            async_client: Optional existing AsyncRunloop client for ``aexecute``
+                (defaults to one created with the sync client's credentials)
         """
         if client and api_key:
             msg = "Provide either client or bearer_token, not both."
@@ -49,6 +60,7 @@ class RunloopBackend(BaseSandbox):
             client = Runloop(bearer_token=api_key)
 
         self._client = client
+        self._async_client = async_client
         self._devbox_id = devbox_id
         self._timeout = 30 * 60
 
@@ -57,68 +69,85 @@ class RunloopBackend(BaseSandbox):
         """Unique identifier for the sandbox backend."""
         return self._devbox_id
 
+    def _polling_config(self, timeout: int | None) -> PollingConfig:
+        if timeout is None:
+            timeout = self._timeout
+        # Completion is awaited with long polls, so the attempt cap rarely binds
+        return PollingConfig(max_attempts=10_000, timeout_seconds=timeout or None)
+
+    def _response(self, result: DevboxAsyncExecutionDetailView) -> ExecuteResponse:
+        return ExecuteResponse(
+            output=combine_output(result.stdout, result.stderr),
+            exit_code=result.exit_status,
+            truncated=False,  # Runloop doesn't provide truncation info
+        )
+
     def execute(
         self,
         command: str,
+        *,
+        timeout: int | None = None,
     ) -> ExecuteResponse:
         """Execute a command in the devbox and return ExecuteResponse.
 
         Args:
             command: Full shell command string to execute.
-            timeout: Maximum execution time in seconds (default: 30 minutes).
+            timeout: Maximum execution time in seconds (default: 30 minutes,
+                0 for no timeout). A command still running then is killed.
 
         Returns:
             ExecuteResponse with combined output, exit code, optional signal, and truncation flag.
         """
-        result = self._client.devboxes.execute_and_await_completion(
-            devbox_id=self._devbox_id,
-            command=command,
-            timeout=self._timeout,
-        )
-        # Combine stdout and stderr
-        output = result.stdout or ""
-        if result.stderr:
-            output += "\n" + result.stderr if output else result.stderr
-
-        return ExecuteResponse(
-            output=output,
-            exit_code=result.exit_status,
-            truncated=False,  # Runloop doesn't provide truncation info
-        )
-
-    def download_files(self, paths: list[str]) -> list[FileDownloadResponse]:
-        """Download multiple files from the Runloop devbox.
-
-        Downloads files individually using the Runloop API. Returns a list of
-        FileDownloadResponse objects preserving order and reporting per-file
-        errors rather than raising exceptions.
-
-        TODO: Implement proper error handling with standardized FileOperationError codes.
-        Currently only implements happy path.
-        """
-        responses: list[FileDownloadResponse] = []
-        for path in paths:
-            # devboxes.download_file returns a BinaryAPIResponse which exposes .read()
-            resp = self._client.devboxes.download_file(self._devbox_id, path=path)
-            content = resp.read()
-            responses.append(FileDownloadResponse(path=path, content=content, error=None))
-
-        return responses
-
-    def upload_files(self, files: list[tuple[str, bytes]]) -> list[FileUploadResponse]:
-        """Upload multiple files to the Runloop devbox.
-
-        Uploads files individually using the Runloop API. Returns a list of
-        FileUploadResponse objects preserving order and reporting per-file
-        errors rather than raising exceptions.
-
-        TODO: Implement proper error handling with standardized FileOperationError codes.
-        Currently only implements happy path.
-        """
-        responses: list[FileUploadResponse] = []
-        for path, content in files:
-            # The Runloop client expects 'file' as bytes or a file-like object
-            self._client.devboxes.upload_file(self._devbox_id, path=path, file=content)
-            responses.append(FileUploadResponse(path=path, error=None))
-
-        return responses
+        config = self._polling_config(timeout)
+        try:
+            result = self._client.devboxes.execute_and_await_completion(
+                devbox_id=self._devbox_id,
+                command=command,
+                polling_config=config,
+                timeout=self._timeout,
+            )
+        except PollingTimeout as e:
+            if e.last_value is not None:
+                self._client.devboxes.executions.kill(
+                    e.last_value.execution_id, devbox_id=self._devbox_id, kill_process_group=True
+                )
+            return timeout_response(config.timeout_seconds or 0)
+        return self._response(result)
+
+    async def aexecute(
+        self,
+        command: str,
+        *,
+        timeout: int | None = None,
+    ) -> ExecuteResponse:
+        """Async version of execute, using an ``AsyncRunloop`` client."""
+        if self._async_client is None:
+            self._async_client = AsyncRunloop(
+                bearer_token=self._client.bearer_token, base_url=self._client.base_url
+            )
+        config = self._polling_config(timeout)
+        try:
+            result = await self._async_client.devboxes.execute_and_await_completion(
+                devbox_id=self._devbox_id,
+                command=command,
+                polling_config=config,
+                timeout=self._timeout,
+            )
+        except PollingTimeout as e:
+            if e.last_value is not None:
+                await self._async_client.devboxes.executions.kill(
+                    e.last_value.execution_id, devbox_id=self._devbox_id, kill_process_group=True
+                )
+            return timeout_response(config.timeout_seconds or 0)
+        return self._response(result)
+
+    def _read_file(self, path: str) -> bytes:
+        """Download one file from the devbox, streaming the response in chunks."""
+        with self._client.devboxes.with_streaming_response.download_file(
+            self._devbox_id, path=path
+        ) as response:
+            return b"".join(response.iter_bytes(CHUNK_SIZE))
+
+    def _write_file(self, path: str, content: bytes) -> None:
+        """Upload one file to the devbox as a streamed multipart body."""
+        self._client.devboxes.upload_file(self._devbox_id, path=path, file=io.BytesIO(content))
@@ -1,38 +1,101 @@
 """Sandbox lifecycle management with context managers."""
 
+import contextlib
 import os
 import shlex
 import string
 import time
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from deepagents.backends.protocol import SandboxBackendProtocol
 
 from deepagents_cli.config import console
+from deepagents_cli.integrations.readiness import (
+    DEFAULT_READY_TIMEOUT,
+    StartupMetrics,
+    wait_until_ready,
+)
 
+if TYPE_CHECKING:
+    from deepagents_cli.integrations.sandbox_pool import SandboxPool
 
-def _run_sandbox_setup(backend: SandboxBackendProtocol, setup_script_path: str) -> None:
-    """Run users setup script in sandbox with env var expansion.
+_MODAL_APP_NAME = "deepagents-sandbox"
+
+# Lifetime of Modal sandboxes that outlive the CLI process (warm pool
+# instances); 24 hours is Modal's maximum
+_DETACHED_SANDBOX_TIMEOUT = 24 * 60 * 60
+
+# Devbox statuses from which a devbox never becomes running
+_RUNLOOP_FAILED_STATUSES = frozenset({"failure", "shutdown"})
+
+
+def expand_setup_script(setup_script_path: str) -> str:
+    """Read a setup script and expand ``${VAR}`` references from the local environment.
 
     Args:
-        backend: Sandbox backend instance
         setup_script_path: Path to setup script file
+
+    Returns:
+        The script as it will run in the sandbox.
+
+    Raises:
+        FileNotFoundError: Setup script not found
     """
     script_path = Path(setup_script_path)
     if not script_path.exists():
         msg = f"Setup script not found: {setup_script_path}"
         raise FileNotFoundError(msg)
 
-    console.print(f"[dim]Running setup script: {setup_script_path}...[/dim]")
+    # Expand ${VAR} syntax using local environment
+    template = string.Template(script_path.read_text())
+    return template.safe_substitute(os.environ)
 
-    # Read script content
-    script_content = script_path.read_text()
 
-    # Expand ${VAR} syntax using local environment
-    template = string.Template(script_content)
-    expanded_script = template.safe_substitute(os.environ)
+def _wait_for_sandbox(
+    probe: Callable[[], bool],
+    startup: StartupMetrics,
+    *,
+    provider_wait: Callable[[float], object] | None = None,
+) -> None:
+    """Wait until a new sandbox is ready and record the ``first-ready`` phase.
+
+    Args:
+        probe: Returns whether the sandbox is ready; raises if it failed
+        startup: Startup metrics of the session
+        provider_wait: Provider API that blocks until the sandbox is up, given
+            a timeout. The probes then only confirm it.
+
+    Raises:
+        TimeoutError: Sandbox not ready within ``DEFAULT_READY_TIMEOUT`` seconds
+    """
+    start = time.monotonic()
+    if provider_wait is not None:
+        # Probing below decides whether the sandbox is ready and reports failures
+        with contextlib.suppress(Exception):
+            provider_wait(DEFAULT_READY_TIMEOUT)
+    remaining = max(DEFAULT_READY_TIMEOUT - (time.monotonic() - start), 1.0)
+    startup.probes = wait_until_ready(probe, timeout=remaining)
+    startup.mark("first-ready")
+
+
+def _run_sandbox_setup(
+    backend: SandboxBackendProtocol,
+    setup_script_path: str,
+    startup: StartupMetrics | None = None,
+) -> None:
+    """Run users setup script in sandbox with env var expansion.
+
+    Args:
+        backend: Sandbox backend instance
+        setup_script_path: Path to setup script file
+        startup: Startup metrics to record the ``setup-done`` phase in
+    """
+    expanded_script = expand_setup_script(setup_script_path)
+
+    console.print(f"[dim]Running setup script: {setup_script_path}...[/dim]")
 
     # Execute in sandbox with 5-minute timeout
     result = backend.execute(f"bash -c {shlex.quote(expanded_script)}")
@@ -43,18 +106,28 @@ def _run_sandbox_setup(backend: SandboxBackendProtocol, setup_script_path: str)
         msg = "Setup failed - aborting"
         raise RuntimeError(msg)
 
+    if startup is not None:
+        startup.mark("setup-done")
     console.print("[green]✓ Setup complete[/green]")
 
 
 @contextmanager
 def create_modal_sandbox(
-    *, sandbox_id: str | None = None, setup_script_path: str | None = None
+    *,
+    sandbox_id: str | None = None,
+    setup_script_path: str | None = None,
+    cleanup: bool | None = None,
+    startup: StartupMetrics | None = None,
 ) -> Generator[SandboxBackendProtocol, None, None]:
     """Create or connect to Modal sandbox.
 
     Args:
         sandbox_id: Optional existing sandbox ID to reuse
         setup_script_path: Optional path to setup script to run after sandbox starts
+        cleanup: Terminate the sandbox on exit (default: only if created here).
+            A sandbox created with ``cleanup=False`` belongs to a deployed app
+            and outlives this process.
+        startup: Startup metrics to record the phases in
 
     Yields:
         (ModalBackend, sandbox_id)
@@ -69,66 +142,97 @@ def create_modal_sandbox(
 
     from deepagents_cli.integrations.modal import ModalBackend
 
+    startup = startup or StartupMetrics("modal")
     console.print("[yellow]Starting Modal sandbox...[/yellow]")
 
-    # Create ephemeral app (auto-cleans up on exit)
-    app = modal.App("deepagents-sandbox")
+    # Sandboxes of an ephemeral app are terminated when it stops, so ones that
+    # must outlive this process are created in the deployed app instead
+    detached = cleanup is False and not sandbox_id
+    if detached:
+        app = modal.App.lookup(_MODAL_APP_NAME, create_if_missing=True)
+    else:
+        # Create ephemeral app (auto-cleans up on exit)
+        app = modal.App(_MODAL_APP_NAME)
 
-    with app.run():
+    with contextlib.nullcontext() if detached else app.run():
         if sandbox_id:
-            sandbox = modal.Sandbox.from_id(sandbox_id=sandbox_id, app=app)
-            should_cleanup = False
+            sandbox = modal.Sandbox.from_id(sandbox_id)
+            if sandbox.poll() is not None:
+                msg = f"Modal sandbox {sandbox_id} is no longer running"
+                raise RuntimeError(msg)
+            startup.mark("create")
+            startup.mark("first-ready")
+            should_cleanup = bool(cleanup)
         else:
-            sandbox = modal.Sandbox.create(app=app, workdir="/workspace")
-            should_cleanup = True
-
-            # Poll until running (Modal requires this)
-            for _ in range(90):  # 180s timeout (90 * 2s)
-                if sandbox.poll() is not None:  # Sandbox terminated unexpectedly
+            create_options: dict[str, object] = {}
+            if detached:
+                create_options["timeout"] = _DETACHED_SANDBOX_TIMEOUT
+            # Older SDKs have no readiness probes; the sandbox is then only probed
+            has_probe = hasattr(modal, "Probe") and hasattr(modal.Sandbox, "wait_until_ready")
+            if has_probe:
+                create_options["readiness_probe"] = modal.Probe.with_exec("true")
+            sandbox = modal.Sandbox.create(app=app, workdir="/workspace", **create_options)
+            startup.mark("create")
+            should_cleanup = cleanup is not False
+
+            def provider_wait(timeout: float) -> None:
+                sandbox.wait_until_ready(timeout=int(timeout))
+
+            def ready() -> bool:
+                if sandbox.poll() is not None:
                     msg = "Modal sandbox terminated unexpectedly during startup"
                     raise RuntimeError(msg)
                 # Check if sandbox is ready by attempting a simple command
                 try:
                     process = sandbox.exec("echo", "ready", timeout=5)
                     process.wait()
-                    if process.returncode == 0:
-                        break
                 except Exception:
-                    pass
-                time.sleep(2)
-            else:
+                    return False
+                return process.returncode == 0
+
+            try:
+                _wait_for_sandbox(
+                    ready, startup, provider_wait=provider_wait if has_probe else None
+                )
+            except TimeoutError:
                 # Timeout - cleanup and fail
                 sandbox.terminate()
-                msg = "Modal sandbox failed to start within 180 seconds"
-                raise RuntimeError(msg)
+                msg = f"Modal sandbox failed to start within {DEFAULT_READY_TIMEOUT:.0f} seconds"
+                raise RuntimeError(msg) from None
 
         backend = ModalBackend(sandbox)
         console.print(f"[green]✓ Modal sandbox ready: {backend.id}[/green]")
 
         # Run setup script if provided
         if setup_script_path:
-            _run_sandbox_setup(backend, setup_script_path)
+            _run_sandbox_setup(backend, setup_script_path, startup)
         try:
             yield backend
         finally:
             if should_cleanup:
                 try:
-                    console.print(f"[dim]Terminating Modal sandbox {sandbox_id}...[/dim]")
+                    console.print(f"[dim]Terminating Modal sandbox {backend.id}...[/dim]")
                     sandbox.terminate()
-                    console.print(f"[dim]✓ Modal sandbox {sandbox_id} terminated[/dim]")
+                    console.print(f"[dim]✓ Modal sandbox {backend.id} terminated[/dim]")
                 except Exception as e:
                     console.print(f"[yellow]⚠ Cleanup failed: {e}[/yellow]")
 
 
 @contextmanager
 def create_runloop_sandbox(
-    *, sandbox_id: str | None = None, setup_script_path: str | None = None
+    *,
+    sandbox_id: str | None = None,
+    setup_script_path: str | None = None,
+    cleanup: bool | None = None,
+    startup: StartupMetrics | None = None,
 ) -> Generator[SandboxBackendProtocol, None, None]:
     """Create or connect to Runloop devbox.
 
     Args:
         sandbox_id: Optional existing devbox ID to reuse
         setup_script_path: Optional path to setup script to run after sandbox starts
+        cleanup: Shut the devbox down on exit (default: only if created here)
+        startup: Startup metrics to record the phases in
 
     Yields:
         (RunloopBackend, devbox_id)
@@ -151,27 +255,39 @@ def create_runloop_sandbox(
 
     client = Runloop(bearer_token=bearer_token)
 
+    startup = startup or StartupMetrics("runloop")
     console.print("[yellow]Starting Runloop devbox...[/yellow]")
 
     if sandbox_id:
         devbox = client.devboxes.retrieve(id=sandbox_id)
-        should_cleanup = False
+        if devbox.status != "running":
+            msg = f"Runloop devbox {sandbox_id} is not running (status: {devbox.status})"
+            raise RuntimeError(msg)
+        startup.mark("create")
+        startup.mark("first-ready")
+        should_cleanup = bool(cleanup)
     else:
         devbox = client.devboxes.create()
         sandbox_id = devbox.id
-        should_cleanup = True
-
-        # Poll until running (Runloop requires this)
-        for _ in range(90):  # 180s timeout (90 * 2s)
-            status = client.devboxes.retrieve(id=devbox.id)
-            if status.status == "running":
-                break
-            time.sleep(2)
-        else:
+        startup.mark("create")
+        should_cleanup = cleanup is not False
+
+        # The SDK's await_running polls at a fixed interval; a status check is
+        # cheap, so it is probed with backoff instead
+        def ready() -> bool:
+            status = client.devboxes.retrieve(id=devbox.id).status
+            if status in _RUNLOOP_FAILED_STATUSES:
+                msg = f"Runloop devbox {devbox.id} failed to start (status: {status})"
+                raise RuntimeError(msg)
+            return status == "running"
+
+        try:
+            _wait_for_sandbox(ready, startup)
+        except TimeoutError:
             # Timeout - cleanup and fail
             client.devboxes.shutdown(id=devbox.id)
-            msg = "Devbox failed to start within 180 seconds"
-            raise RuntimeError(msg)
+            msg = f"Devbox failed to start within {DEFAULT_READY_TIMEOUT:.0f} seconds"
+            raise RuntimeError(msg) from None
 
     console.print(f"[green]✓ Runloop devbox ready: {sandbox_id}[/green]")
 
@@ -179,7 +295,7 @@ def create_runloop_sandbox(
 
     # Run setup script if provided
     if setup_script_path:
-        _run_sandbox_setup(backend, setup_script_path)
+        _run_sandbox_setup(backend, setup_script_path, startup)
     try:
         yield backend
     finally:
@@ -194,20 +310,22 @@ def create_runloop_sandbox(
 
 @contextmanager
 def create_daytona_sandbox(
-    *, sandbox_id: str | None = None, setup_script_path: str | None = None
+    *,
+    sandbox_id: str | None = None,
+    setup_script_path: str | None = None,
+    cleanup: bool | None = None,
+    startup: StartupMetrics | None = None,
 ) -> Generator[SandboxBackendProtocol, None, None]:
-    """Create Daytona sandbox.
+    """Create or connect to Daytona sandbox.
 
     Args:
-        sandbox_id: Optional existing sandbox ID to reuse
+        sandbox_id: Optional existing sandbox ID to reuse (started if stopped)
         setup_script_path: Optional path to setup script to run after sandbox starts
+        cleanup: Delete the sandbox on exit (default: only if created here)
+        startup: Startup metrics to record the phases in
 
     Yields:
         (DaytonaBackend, sandbox_id)
-
-    Note:
-        Connecting to existing Daytona sandbox by ID may not be supported yet.
-        If sandbox_id is provided, this will raise NotImplementedError.
     """
     from daytona import Daytona, DaytonaConfig
 
@@ -218,52 +336,61 @@ def create_daytona_sandbox(
         msg = "DAYTONA_API_KEY environment variable not set"
         raise ValueError(msg)
 
-    if sandbox_id:
-        msg = (
-            "Connecting to existing Daytona sandbox by ID not yet supported. "
-            "Create a new sandbox by omitting --sandbox-id."
-        )
-        raise NotImplementedError(msg)
-
+    startup = startup or StartupMetrics("daytona")
     console.print("[yellow]Starting Daytona sandbox...[/yellow]")
 
     daytona = Daytona(DaytonaConfig(api_key=api_key))
-    sandbox = daytona.create()
-    sandbox_id = sandbox.id
-
-    # Poll until running (Daytona requires this)
-    for _ in range(90):  # 180s timeout (90 * 2s)
-        # Check if sandbox is ready by attempting a simple command
-        try:
-            result = sandbox.process.exec("echo ready", timeout=5)
-            if result.exit_code == 0:
-                break
-        except Exception:
-            pass
-        time.sleep(2)
+    if sandbox_id:
+        sandbox = daytona.get(sandbox_id)
+        if sandbox.state != "started":
+            sandbox.start()
+        startup.mark("create")
+        startup.mark("first-ready")
+        should_cleanup = bool(cleanup)
     else:
+        sandbox = daytona.create()
+        sandbox_id = sandbox.id
+        startup.mark("create")
+        should_cleanup = cleanup is not False
+
+        def ready() -> bool:
+            # Check if sandbox is ready by attempting a simple command
+            try:
+                result = sandbox.process.exec("echo ready", timeout=5)
+            except Exception:
+                return False
+            return result.exit_code == 0
+
         try:
-            # Clean up if possible
-            sandbox.delete()
-        finally:
-            msg = "Daytona sandbox failed to start within 180 seconds"
-            raise RuntimeError(msg)
+            _wait_for_sandbox(
+                ready,
+                startup,
+                provider_wait=getattr(sandbox, "wait_for_sandbox_start", None),
+            )
+        except TimeoutError:
+            try:
+                # Clean up if possible
+                sandbox.delete()
+            finally:
+                msg = f"Daytona sandbox failed to start within {DEFAULT_READY_TIMEOUT:.0f} seconds"
+                raise RuntimeError(msg) from None
 
     backend = DaytonaBackend(sandbox)
     console.print(f"[green]✓ Daytona sandbox ready: {backend.id}[/green]")
 
     # Run setup script if provided
     if setup_script_path:
-        _run_sandbox_setup(backend, setup_script_path)
+        _run_sandbox_setup(backend, setup_script_path, startup)
     try:
         yield backend
     finally:
-        console.print(f"[dim]Deleting Daytona sandbox {sandbox_id}...[/dim]")
-        try:
-            sandbox.delete()
-            console.print(f"[dim]✓ Daytona sandbox {sandbox_id} terminated[/dim]")
-        except Exception as e:
-            console.print(f"[yellow]⚠ Cleanup failed: {e}[/yellow]")
+        if should_cleanup:
+            console.print(f"[dim]Deleting Daytona sandbox {sandbox_id}...[/dim]")
+            try:
+                sandbox.delete()
+                console.print(f"[dim]✓ Daytona sandbox {sandbox_id} terminated[/dim]")
+            except Exception as e:
+                console.print(f"[yellow]⚠ Cleanup failed: {e}[/yellow]")
 
 
 _PROVIDER_TO_WORKING_DIR = {
@@ -287,6 +414,9 @@ def create_sandbox(
     *,
     sandbox_id: str | None = None,
     setup_script_path: str | None = None,
+    cleanup: bool | None = None,
+    pool: "SandboxPool | None" = None,
+    startup: StartupMetrics | None = None,
 ) -> Generator[SandboxBackendProtocol, None, None]:
     """Create or connect to a sandbox of the specified provider.
 
@@ -297,6 +427,11 @@ def create_sandbox(
         provider: Sandbox provider ("modal", "runloop", "daytona")
         sandbox_id: Optional existing sandbox ID to reuse
         setup_script_path: Optional path to setup script to run after sandbox starts
+        cleanup: Terminate the sandbox on exit (default: only if created here)
+        pool: Optional warm pool. Without ``sandbox_id``, a warm sandbox whose
+            setup matches ``setup_script_path`` is used when one is available,
+            and the pool is replenished in the background.
+        startup: Startup metrics to record the phases in
 
     Yields:
         (SandboxBackend, sandbox_id)
@@ -309,11 +444,66 @@ def create_sandbox(
         raise ValueError(msg)
 
     sandbox_provider = _SANDBOX_PROVIDERS[provider]
-
-    with sandbox_provider(sandbox_id=sandbox_id, setup_script_path=setup_script_path) as backend:
+    startup = startup or StartupMetrics(provider)
+    startup.source = "connected" if sandbox_id else "created"
+
+    with contextlib.ExitStack() as stack:
+        backend = None
+        if pool is not None and not sandbox_id:
+            warm_id = pool.acquire(provider, setup_script_path)
+            pool.replenish(provider, setup_script_path)
+            if warm_id is not None:
+                console.print(f"[dim]Using warm sandbox {warm_id} from the pool[/dim]")
+                try:
+                    # The setup script already ran; the sandbox is ours to clean up
+                    backend = stack.enter_context(
+                        sandbox_provider(sandbox_id=warm_id, cleanup=True, startup=startup)
+                    )
+                    startup.source = "pool"
+                except Exception as e:
+                    console.print(
+                        f"[yellow]⚠ Warm sandbox unavailable ({e}), creating a new one[/yellow]"
+                    )
+                    # It is no longer in the pool, so nothing else would stop it
+                    with contextlib.suppress(Exception):
+                        terminate_sandbox(provider, warm_id)
+        if backend is None:
+            backend = stack.enter_context(
+                sandbox_provider(
+                    sandbox_id=sandbox_id,
+                    setup_script_path=setup_script_path,
+                    cleanup=cleanup,
+                    startup=startup,
+                )
+            )
         yield backend
 
 
+def terminate_sandbox(provider: str, sandbox_id: str) -> None:
+    """Terminate a sandbox by ID, without connecting a backend to it.
+
+    Args:
+        provider: Sandbox provider ("modal", "runloop", "daytona")
+        sandbox_id: ID of the sandbox to terminate
+    """
+    if provider == "modal":
+        import modal
+
+        modal.Sandbox.from_id(sandbox_id).terminate()
+    elif provider == "runloop":
+        from runloop_api_client import Runloop
+
+        Runloop(bearer_token=os.environ.get("RUNLOOP_API_KEY")).devboxes.shutdown(id=sandbox_id)
+    elif provider == "daytona":
+        from daytona import Daytona, DaytonaConfig
+
+        daytona = Daytona(DaytonaConfig(api_key=os.environ.get("DAYTONA_API_KEY")))
+        daytona.get(sandbox_id).delete()
+    else:
+        msg = f"Unknown sandbox provider: {provider}"
+        raise ValueError(msg)
+
+
 def get_available_sandbox_types() -> list[str]:
     """Get list of available sandbox provider types.
 
@@ -343,6 +533,8 @@ def get_default_working_dir(provider: str) -> str:
 
 __all__ = [
     "create_sandbox",
+    "expand_setup_script",
     "get_available_sandbox_types",
     "get_default_working_dir",
+    "terminate_sandbox",
 ]
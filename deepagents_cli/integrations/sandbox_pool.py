@@ -0,0 +1,281 @@
+"""Warm pool of pre-provisioned sandboxes.
+
+Creating a sandbox and running its setup script can take minutes. A
+``SandboxPool`` keeps sandboxes that are already running, with the setup script
+applied, in a JSON file under ``~/.deepagents`` shared by every CLI session.
+``create_sandbox`` takes one from the pool instead of provisioning, and then
+starts a detached warmer process (this module's ``main``) that provisions
+sandboxes until the pool is full again, so the next session finds one ready.
+
+Every entry records a hash of the setup script as it runs in the sandbox
+(after ``${VAR}`` expansion), and only entries with the current script's hash
+are handed out, so projects with different setup scripts share the pool file
+without taking (or recycling) each other's sandboxes. An entry older than
+``max_age`` is stale whatever its hash: it is never handed out and the next
+warmer for its provider terminates it.
+
+Warm sandboxes keep running after the last session that used the pool; empty
+the pool with ``deepagents --drain-sandbox-pool``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from deepagents_cli.config import console, settings
+from deepagents_cli.integrations.sandbox_factory import (
+    create_sandbox,
+    expand_setup_script,
+    terminate_sandbox,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: sessions are not serialized
+    fcntl = None
+
+POOL_FILE_NAME = "sandbox_pool.json"
+
+# Seconds a warm sandbox may wait before it is recycled
+DEFAULT_MAX_AGE = 2 * 60 * 60
+
+
+@dataclass
+class WarmSandbox:
+    """A provisioned sandbox waiting in the pool.
+
+    Attributes:
+        provider: Sandbox provider ("modal", "runloop", "daytona").
+        sandbox_id: ID to connect to the sandbox with.
+        setup_hash: ``setup_hash`` of the setup script applied to it.
+        created_at: Time (epoch seconds) it became ready.
+    """
+
+    provider: str
+    sandbox_id: str
+    setup_hash: str
+    created_at: float
+
+
+def setup_hash(setup_script_path: str | None) -> str:
+    """Hash the setup script as it would run in a sandbox (empty if none)."""
+    script = expand_setup_script(setup_script_path) if setup_script_path else ""
+    return hashlib.sha256(script.encode("utf-8")).hexdigest()
+
+
+class SandboxPool:
+    """Pool of warm sandboxes persisted in a JSON file.
+
+    Attributes:
+        size: Number of warm sandboxes kept per provider and setup script.
+        path: Pool file.
+        max_age: Seconds a warm sandbox may wait before it is recycled.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        path: Path | None = None,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            size: Number of warm sandboxes kept per provider and setup script.
+            path: Pool file (default ``~/.deepagents/sandbox_pool.json``).
+            max_age: Seconds a warm sandbox may wait before it is recycled.
+        """
+        self.size = size
+        self.path = path or settings.user_deepagents_dir / POOL_FILE_NAME
+        self.max_age = max_age
+
+    def acquire(self, provider: str, setup_script_path: str | None) -> str | None:
+        """Take a fresh warm sandbox out of the pool.
+
+        Args:
+            provider: Sandbox provider.
+            setup_script_path: Setup script the sandbox must have applied.
+
+        Returns:
+            The sandbox ID, or None if no matching sandbox is waiting.
+        """
+        digest = setup_hash(setup_script_path)
+        with self._locked() as entries:
+            fresh = [entry for entry in entries if self._is_fresh(entry, provider, digest)]
+            if not fresh:
+                return None
+            # The newest one has the most lifetime left
+            entry = max(fresh, key=lambda entry: entry.created_at)
+            entries.remove(entry)
+            return entry.sandbox_id
+
+    def replenish(self, provider: str, setup_script_path: str | None) -> None:
+        """Start a detached warmer process that refills the pool.
+
+        The warmer outlives this process; its output goes to the pool's log
+        file next to the pool file.
+        """
+        # Not `-m`: the package imports this module before running it
+        command = [
+            sys.executable,
+            "-c",
+            "from deepagents_cli.integrations.sandbox_pool import main; main()",
+            provider,
+            f"--size={self.size}",
+            f"--max-age={self.max_age}",
+            f"--pool-file={self.path}",
+        ]
+        if setup_script_path:
+            command.append(f"--setup={Path(setup_script_path).resolve()}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.with_suffix(".log").open("ab") as log:
+            subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+
+    def warm(self, provider: str, setup_script_path: str | None) -> None:
+        """Terminate stale sandboxes and provision new ones until the pool is full.
+
+        Runs in the warmer process. Only sandboxes older than ``max_age`` are
+        stale; those with another setup script belong to another project's
+        pool. Returns immediately if another warmer is already filling the
+        pool for ``provider`` and this setup script.
+        """
+        digest = setup_hash(setup_script_path)
+        with self._warmer_lock(provider, digest) as acquired:
+            if not acquired:
+                return
+            with self._locked() as entries:
+                stale = [
+                    entry
+                    for entry in entries
+                    if entry.provider == provider and self._is_expired(entry)
+                ]
+                for entry in stale:
+                    entries.remove(entry)
+            self._terminate(stale, reason="stale")
+
+            while True:
+                with self._locked() as entries:
+                    warm = sum(self._is_fresh(entry, provider, digest) for entry in entries)
+                if warm >= self.size:
+                    return
+                with create_sandbox(
+                    provider, setup_script_path=setup_script_path, cleanup=False
+                ) as backend:
+                    sandbox_id = backend.id
+                with self._locked() as entries:
+                    entries.append(WarmSandbox(provider, sandbox_id, digest, time.time()))
+
+    def drain(self, provider: str | None = None) -> int:
+        """Terminate the waiting sandboxes and empty the pool.
+
+        Args:
+            provider: Only drain sandboxes of this provider (default: all).
+
+        Returns:
+            The number of sandboxes removed from the pool.
+        """
+        with self._locked() as entries:
+            drained = [entry for entry in entries if provider in (None, entry.provider)]
+            for entry in drained:
+                entries.remove(entry)
+        self._terminate(drained, reason="warm")
+        return len(drained)
+
+    def _terminate(self, entries: list[WarmSandbox], *, reason: str) -> None:
+        for entry in entries:
+            console.print(f"Terminating {reason} {entry.provider} sandbox {entry.sandbox_id}")
+            try:
+                terminate_sandbox(entry.provider, entry.sandbox_id)
+            except Exception as e:
+                console.print(f"⚠ Terminating {entry.sandbox_id} failed: {e}")
+
+    def _is_expired(self, entry: WarmSandbox) -> bool:
+        return time.time() - entry.created_at >= self.max_age
+
+    def _is_fresh(self, entry: WarmSandbox, provider: str, digest: str) -> bool:
+        return (
+            entry.provider == provider
+            and entry.setup_hash == digest
+            and not self._is_expired(entry)
+        )
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[list[WarmSandbox]]:
+        """Load the entries under an exclusive lock and save them on exit."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.with_suffix(".lock").open("a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                data = json.loads(self.path.read_text())
+                entries = [WarmSandbox(**entry) for entry in data["sandboxes"]]
+            except (OSError, ValueError, KeyError, TypeError):
+                entries = []
+            yield entries
+            temp = self.path.with_suffix(".tmp")
+            temp.write_text(json.dumps({"sandboxes": [asdict(entry) for entry in entries]}))
+            temp.replace(self.path)
+
+    @contextlib.contextmanager
+    def _warmer_lock(self, provider: str, digest: str) -> Iterator[bool]:
+        """Hold the lock of the warmer for ``provider`` and a setup hash.
+
+        Yields whether it was free.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        suffix = f".{provider}.{digest[:16]}.warmer.lock"
+        with self.path.with_suffix(suffix).open("a") as lock:
+            if fcntl is None:
+                yield True
+                return
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            yield True
+
+
+def main() -> None:
+    """Entry point of the warmer process."""
+    parser = argparse.ArgumentParser(description="Fill the warm sandbox pool.")
+    parser.add_argument("provider", help="Sandbox provider")
+    parser.add_argument("--size", type=int, required=True, help="Warm sandboxes to keep")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE, help="Seconds")
+    parser.add_argument("--pool-file", type=Path, default=None, help="Pool file")
+    parser.add_argument("--setup", default=None, help="Setup script path")
+    args = parser.parse_args()
+
+    pool = SandboxPool(args.size, path=args.pool_file, max_age=args.max_age)
+    started = time.strftime("%Y-%m-%d %H:%M:%S")
+    console.print(f"{started} warming the {args.provider} pool (pid {os.getpid()})")
+    try:
+        pool.warm(args.provider, args.setup)
+    except Exception as e:
+        console.print(f"⚠ Warming the {args.provider} pool failed: {e}")
+        sys.exit(1)
+
+
+__all__ = [
+    "DEFAULT_MAX_AGE",
+    "SandboxPool",
+    "WarmSandbox",
+    "setup_hash",
+]
@@ -0,0 +1,251 @@
+"""Concurrent, chunked and bulk file transfer for sandbox backends.
+
+Sandbox file APIs move one file per request, so syncing a workspace file by
+file pays one round trip per file. ``download_files`` and ``upload_files``
+run the per-file transfers of a backend on a bounded thread pool and report
+failures per file instead of aborting the batch.
+
+In bulk mode, small files are instead packed into tar archives that travel
+through ``execute`` (base64 encoded), so hundreds of files cost a handful of
+commands. Files that do not fit (large, relative or unusual paths) and
+archives that fail fall back to per-file transfers.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import io
+import posixpath
+import shlex
+import tarfile
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, TypeVar
+
+from deepagents.backends.protocol import (
+    FileDownloadResponse,
+    FileOperationError,
+    FileUploadResponse,
+)
+
+if TYPE_CHECKING:
+    from deepagents_cli.integrations.batch import BatchSandbox
+
+# Transfers kept in flight by default
+DEFAULT_TRANSFER_WORKERS = 8
+
+# Bytes per read or write call when streaming a file
+CHUNK_SIZE = 1024 * 1024
+
+# Largest file sent inside a tar archive in bulk mode
+BULK_MAX_FILE_SIZE = 64 * 1024
+
+# Size of one bulk upload command; a single argument to `bash -c` may not
+# exceed 128 KiB on Linux
+_BULK_UPLOAD_BYTES = 96 * 1024
+
+# Paths listed in one bulk download command
+_BULK_DOWNLOAD_PATHS = 200
+
+# Size of a tar header block and of the end-of-archive marker
+_TAR_BLOCK = 512
+_TAR_END = 2 * _TAR_BLOCK
+
+# Longest member name that fits in a tar header
+_TAR_NAME_SIZE = 100
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def file_error(error: Exception) -> FileOperationError | str:
+    """Map an exception raised by a file transfer to a per-file error."""
+    if isinstance(error, FileNotFoundError):
+        return "file_not_found"
+    if isinstance(error, IsADirectoryError):
+        return "is_directory"
+    if isinstance(error, PermissionError):
+        return "permission_denied"
+    if isinstance(error, NotADirectoryError):
+        return "invalid_path"
+    # HTTP-based SDKs raise API errors carrying the response status
+    status = getattr(error, "status_code", None)
+    if status == 404:
+        return "file_not_found"
+    if status == 403:
+        return "permission_denied"
+    return f"{type(error).__name__}: {error}"
+
+
+def run_concurrently(transfer: Callable[[T], R], items: Sequence[T], max_workers: int) -> list[R]:
+    """Apply ``transfer`` to every item on a bounded thread pool, keeping order."""
+    workers = min(max_workers, len(items))
+    if workers <= 1:
+        return [transfer(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sandbox-transfer") as pool:
+        return list(pool.map(transfer, items))
+
+
+def download_files(
+    backend: BatchSandbox, paths: Sequence[str], *, bulk: bool = False
+) -> list[FileDownloadResponse]:
+    """Download files with the backend's ``_read_file``, concurrently.
+
+    Args:
+        backend: Backend to download from.
+        paths: Paths of the files in the sandbox.
+        bulk: Fetch small files in tar archives first.
+
+    Returns:
+        One response per path, in order, with a per-file error on failure.
+    """
+    contents = _bulk_download(backend, paths) if bulk else {}
+
+    def download(path: str) -> FileDownloadResponse:
+        if path in contents:
+            return FileDownloadResponse(path=path, content=contents[path])
+        try:
+            content = backend._read_file(path)
+        except Exception as e:
+            return FileDownloadResponse(path=path, error=file_error(e))
+        return FileDownloadResponse(path=path, content=content)
+
+    return run_concurrently(download, paths, backend.transfer_workers)
+
+
+def upload_files(
+    backend: BatchSandbox, files: Sequence[tuple[str, bytes]], *, bulk: bool = False
+) -> list[FileUploadResponse]:
+    """Upload files with the backend's ``_write_file``, concurrently.
+
+    Args:
+        backend: Backend to upload to.
+        files: ``(path, content)`` pairs.
+        bulk: Send small files in tar archives first.
+
+    Returns:
+        One response per file, in order, with a per-file error on failure.
+    """
+    uploaded = _bulk_upload(backend, files) if bulk else set()
+
+    def upload(index: int) -> FileUploadResponse:
+        path, content = files[index]
+        if index in uploaded:
+            return FileUploadResponse(path=path)
+        try:
+            backend._write_file(path, content)
+        except Exception as e:
+            return FileUploadResponse(path=path, error=file_error(e))
+        return FileUploadResponse(path=path)
+
+    return run_concurrently(upload, range(len(files)), backend.transfer_workers)
+
+
+def _padded(size: int) -> int:
+    return -(-size // _TAR_BLOCK) * _TAR_BLOCK
+
+
+def _bulk_eligible(path: str) -> bool:
+    # Archive members are named by the path without its leading slash
+    return path.startswith("/") and posixpath.normpath(path) == path and path != "/"
+
+
+def _bulk_download(backend: BatchSandbox, paths: Sequence[str]) -> dict[str, bytes]:
+    """Fetch small regular files in tar archives; returns the contents by path."""
+    eligible = list(dict.fromkeys(path for path in paths if _bulk_eligible(path)))
+    batches = [
+        eligible[start : start + _BULK_DOWNLOAD_PATHS]
+        for start in range(0, len(eligible), _BULK_DOWNLOAD_PATHS)
+    ]
+    # Missing, non-regular and large files are left out of the archive
+    commands = [
+        f"find {' '.join(shlex.quote(path) for path in batch)} -maxdepth 0 -type f "
+        f"-size -{BULK_MAX_FILE_SIZE + 1}c -print0 2>/dev/null "
+        "| tar --null --no-recursion -T - -cf - 2>/dev/null | base64 -w0"
+        for batch in batches
+    ]
+    contents: dict[str, bytes] = {}
+    for response in backend.execute_many(commands, max_concurrency=backend.transfer_workers):
+        if response.exit_code != 0 or not response.output.strip():
+            continue
+        try:
+            archive = base64.b64decode(response.output)
+            with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+                for member in tar:
+                    data = tar.extractfile(member) if member.isfile() else None
+                    if data is not None:
+                        contents["/" + member.name] = data.read()
+        except (binascii.Error, ValueError, tarfile.TarError):
+            continue
+    return contents
+
+
+def _bulk_upload(backend: BatchSandbox, files: Sequence[tuple[str, bytes]]) -> set[int]:
+    """Send small files in tar archives; returns the indices of the files sent."""
+    # A path listed twice must be written in order, which per-file uploads do
+    counts = Counter(path for path, _content in files)
+    batches: list[list[int]] = []
+    batch_size = 0
+    for index, (path, content) in enumerate(files):
+        if counts[path] > 1 or len(content) > BULK_MAX_FILE_SIZE or not _bulk_eligible(path):
+            continue
+        # Header block plus content padded to whole blocks, and a second
+        # header with the name padded to blocks when the name is long
+        size = _TAR_BLOCK + _padded(len(content))
+        if len(path) > _TAR_NAME_SIZE:
+            size += _TAR_BLOCK + _padded(len(path))
+        # Base64 grows the archive by a third; the path is also listed once
+        size = size * 4 // 3 + len(shlex.quote(path)) + 1
+        if not batches or batch_size + size + _TAR_END * 4 // 3 > _BULK_UPLOAD_BYTES:
+            batches.append([])
+            batch_size = 0
+        batches[-1].append(index)
+        batch_size += size
+
+    commands = [_tar_upload_command([files[index] for index in batch]) for batch in batches]
+    uploaded: set[int] = set()
+    for batch, response in zip(
+        batches,
+        backend.execute_many(commands, max_concurrency=backend.transfer_workers),
+        strict=True,
+    ):
+        if response.exit_code == 0:
+            uploaded.update(batch)
+    return uploaded
+
+
+def _tar_upload_command(files: Sequence[tuple[str, bytes]]) -> str:
+    buffer = io.BytesIO()
+    now = int(time.time())
+    with tarfile.open(fileobj=buffer, mode="w", format=tarfile.GNU_FORMAT) as tar:
+        for path, content in files:
+            info = tarfile.TarInfo(path.lstrip("/"))
+            info.size = len(content)
+            info.mode = 0o644
+            info.mtime = now
+            tar.addfile(info, io.BytesIO(content))
+    payload = base64.encodebytes(buffer.getvalue()).decode("ascii")
+    delimiter = f"DEEPAGENTS_TAR_{uuid.uuid4().hex}"
+    targets = " ".join(shlex.quote(path) for path, _content in files)
+    # tar would replace an empty directory with the file; fail the batch
+    # instead so per-file uploads report the error
+    return (
+        f'for target in {targets}; do [ -d "$target" ] && exit 1; done\n'
+        f"base64 -d <<'{delimiter}' | tar -xf - -C / --no-same-owner\n"
+        f"{payload}{delimiter}\n"
+    )
+
+
+__all__ = [
+    "BULK_MAX_FILE_SIZE",
+    "CHUNK_SIZE",
+    "DEFAULT_TRANSFER_WORKERS",
+    "download_files",
+    "file_error",
+    "run_concurrently",
+    "upload_files",
+]
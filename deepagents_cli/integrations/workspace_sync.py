@@ -0,0 +1,389 @@
+"""Sync the local project into a remote sandbox.
+
+``WorkspaceSync`` mirrors a local directory into a directory of a sandbox
+backend. It keeps a manifest of the content hashes last synced and, on every
+``push``, sends only the files whose hash changed and removes the files that
+were deleted locally:
+
+- Files come from ``git ls-files`` (tracked plus untracked, not ignored) in a
+  git work tree, so ``.gitignore`` is respected exactly; elsewhere the tree is
+  walked with a simplified ``.gitignore`` matcher.
+- Files are re-hashed only when their size or mtime changed, so a re-sync
+  between turns costs a ``stat`` per file when nothing changed.
+- Changed files travel in gzip-compressed tar archives, built, uploaded with
+  ``upload_files`` and unpacked with ``execute`` one at a time so only one
+  archive is held in memory.
+- The first push hashes the files already in the sandbox (symlinks by their
+  target, as locally), so reconnecting to a sandbox (``--sandbox-id``) only
+  sends what differs.
+
+Syncing is one way: changes made inside the sandbox are not copied back.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import io
+import os
+import shlex
+import subprocess
+import tarfile
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from deepagents.backends.protocol import SandboxBackendProtocol
+
+# Raw bytes of files packed into one archive
+_ARCHIVE_BYTES = 8 * 1024 * 1024
+
+# Length of one `rm` command listing deleted files
+_DELETE_COMMAND_BYTES = 64 * 1024
+
+# Hex digits of a SHA-256 digest
+_DIGEST_LENGTH = 64
+
+# Directories never synced when walking without git
+_ALWAYS_IGNORED = frozenset({".git"})
+
+# Size and mtime of a file when its hash was computed
+_StatKey = tuple[int, int]
+
+
+@dataclass
+class SyncResult:
+    """Summary of one push.
+
+    Attributes:
+        uploaded: Number of files sent.
+        deleted: Number of files removed from the sandbox.
+        bytes_sent: Compressed bytes uploaded.
+        seconds: Wall time of the push.
+    """
+
+    uploaded: int = 0
+    deleted: int = 0
+    bytes_sent: int = 0
+    seconds: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        """Whether the push changed anything in the sandbox."""
+        return bool(self.uploaded or self.deleted)
+
+    def describe(self) -> str:
+        """One-line summary for the console."""
+        return (
+            f"{self.uploaded:,} files sent ({self.bytes_sent / 1024:,.0f} KiB), "
+            f"{self.deleted:,} removed in {self.seconds:.1f}s"
+        )
+
+
+class GitignoreMatcher:
+    """Simplified ``.gitignore`` matching for trees that are not git work trees.
+
+    Supports comments, ``!`` negation, a trailing ``/`` for directories, a
+    leading or inner ``/`` to anchor a pattern to its ``.gitignore``'s
+    directory, and glob wildcards (``*`` may also match ``/``).
+    """
+
+    def __init__(self) -> None:
+        """Initialize a matcher without patterns."""
+        self._rules: list[tuple[str, str, bool, bool, bool]] = []
+
+    def add_file(self, gitignore: Path, base: str) -> None:
+        """Load the patterns of a ``.gitignore`` found in directory ``base``."""
+        try:
+            lines = gitignore.read_text(errors="replace").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            pattern = line.rstrip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            negated = pattern.startswith("!")
+            pattern = pattern.removeprefix("!")
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            anchored = "/" in pattern
+            pattern = pattern.lstrip("/")
+            if pattern:
+                self._rules.append((base, pattern, negated, dir_only, anchored))
+
+    def ignored(self, path: str, *, is_dir: bool) -> bool:
+        """Whether a path (relative to the root, ``/``-separated) is ignored."""
+        ignored = False
+        for base, pattern, negated, dir_only, anchored in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not path.startswith(base + "/"):
+                    continue
+                relative = path[len(base) + 1 :]
+            else:
+                relative = path
+            target = relative if anchored else relative.rsplit("/", 1)[-1]
+            if fnmatch.fnmatchcase(target, pattern):
+                ignored = not negated
+        return ignored
+
+
+def _remote_temp_path(suffix: str) -> str:
+    """Unique path for a temporary file in the sandbox."""
+    # The path is in the sandbox, not on this machine, and has a random name
+    return f"/tmp/deepagents-sync-{uuid.uuid4().hex}{suffix}"  # noqa: S108
+
+
+def list_workspace_files(root: Path) -> list[str]:
+    """List the files to sync under ``root`` as ``/``-separated relative paths.
+
+    Uses git when ``root`` is inside a work tree, so ``.gitignore``, global
+    excludes and ``.git/info/exclude`` apply exactly.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "--cached", "--others", "--exclude-standard", "-z"],
+            cwd=root,
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return _walk_workspace(root)
+    paths = os.fsdecode(result.stdout).split("\0")
+    # Deleted but still tracked files are listed too
+    return sorted({path for path in paths if path and os.path.lexists(root / path)})
+
+
+def _walk_workspace(root: Path) -> list[str]:
+    matcher = GitignoreMatcher()
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        base = Path(directory).relative_to(root).as_posix()
+        base = "" if base == "." else base
+        if ".gitignore" in filenames:
+            matcher.add_file(Path(directory) / ".gitignore", base)
+        prefix = f"{base}/" if base else ""
+        dirnames[:] = sorted(
+            name
+            for name in dirnames
+            if name not in _ALWAYS_IGNORED and not matcher.ignored(prefix + name, is_dir=True)
+        )
+        files.extend(
+            prefix + name
+            for name in sorted(filenames)
+            if not matcher.ignored(prefix + name, is_dir=False)
+        )
+    return files
+
+
+class WorkspaceSync:
+    """One-way, incremental mirror of a local directory into a sandbox.
+
+    Attributes:
+        local_root: Directory mirrored.
+        remote_root: Directory in the sandbox it is mirrored to.
+    """
+
+    def __init__(
+        self,
+        backend: SandboxBackendProtocol,
+        local_root: str | Path,
+        remote_root: str,
+    ) -> None:
+        """Initialize the sync; nothing is sent before ``push``.
+
+        Args:
+            backend: Sandbox backend to sync into.
+            local_root: Local directory to mirror.
+            remote_root: Absolute directory in the sandbox.
+        """
+        self.local_root = Path(local_root).resolve()
+        self.remote_root = remote_root.rstrip("/") or "/"
+        self._backend = backend
+        # Content hash of every file as last synced, by relative path
+        self._synced: dict[str, str] | None = None
+        # Hash of every local file with the stat it was computed for
+        self._hashes: dict[str, tuple[_StatKey, str]] = {}
+
+    def push(self) -> SyncResult:
+        """Send local changes since the last push to the sandbox.
+
+        Returns:
+            What was sent and removed.
+
+        Raises:
+            RuntimeError: If unpacking or deleting files in the sandbox failed.
+        """
+        start = time.perf_counter()
+        local = self._scan()
+        if self._synced is None:
+            self._synced = self._remote_hashes(local)
+
+        changed = sorted(path for path, digest in local.items() if self._synced.get(path) != digest)
+        deleted = sorted(set(self._synced) - set(local))
+        result = SyncResult()
+        if changed:
+            result.bytes_sent = self._upload(changed)
+            result.uploaded = len(changed)
+        if deleted:
+            self._delete(deleted)
+            result.deleted = len(deleted)
+        self._synced = local
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _scan(self) -> dict[str, str]:
+        """Hash the local files, reusing hashes of files whose stat is unchanged."""
+        hashes: dict[str, tuple[_StatKey, str]] = {}
+        for path in list_workspace_files(self.local_root):
+            try:
+                stat = (self.local_root / path).lstat()
+            except OSError:
+                continue
+            key = (stat.st_size, stat.st_mtime_ns)
+            cached = self._hashes.get(path)
+            if cached is not None and cached[0] == key:
+                hashes[path] = cached
+                continue
+            digest = self._hash(path)
+            if digest is not None:
+                hashes[path] = (key, digest)
+        self._hashes = hashes
+        return {path: digest for path, (_key, digest) in hashes.items()}
+
+    def _hash(self, path: str) -> str | None:
+        file = self.local_root / path
+        if file.is_symlink():
+            return hashlib.sha256(os.fsencode(file.readlink())).hexdigest()
+        if not file.is_file():
+            return None
+        digest = hashlib.sha256()
+        try:
+            with file.open("rb") as f:
+                while chunk := f.read(1024 * 1024):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _remote_hashes(self, local: dict[str, str]) -> dict[str, str]:
+        """Hash the sandbox's copies of the local files (missing ones are left out).
+
+        Regular files are hashed by content and symlinks by their target, the
+        way ``_hash`` does locally.
+        """
+        if not local:
+            return {}
+        links = {path for path in local if (self.local_root / path).is_symlink()}
+        files = [path for path in local if path not in links]
+        file_list, link_list = _remote_temp_path(".list"), _remote_temp_path(".links")
+        responses = self._backend.upload_files(
+            [
+                (file_list, "\0".join(files).encode("utf-8", errors="surrogateescape")),
+                (link_list, "\0".join(links).encode("utf-8", errors="surrogateescape")),
+            ]
+        )
+        if any(response.error is not None for response in responses):
+            return {}
+        # `sha256sum` follows links, so a link's target path is hashed instead
+        hash_links = (
+            'for f; do [ -L "$f" ] || continue; '
+            'd=$(printf %s "$(readlink -- "$f")" | sha256sum); '
+            'printf "%s  %s\\n" "${d%% *}" "$f"; done'
+        )
+        result = self._backend.execute(
+            f"cd {shlex.quote(self.remote_root)} 2>/dev/null "
+            f"&& {{ xargs -0 -r sha256sum -- < {file_list}; "
+            f"xargs -0 -r sh -c {shlex.quote(hash_links)} sh < {link_list}; }} 2>/dev/null; "
+            f"rm -f {file_list} {link_list}"
+        )
+        hashes = {}
+        for line in result.output.splitlines():
+            digest, separator, path = line.partition("  ")
+            # Escaped names (backslashes, newlines) are simply sent again
+            if separator and len(digest) == _DIGEST_LENGTH and path in local:
+                hashes[path] = digest
+        return hashes
+
+    def _upload(self, paths: list[str]) -> int:
+        """Send files in compressed archives; returns the bytes uploaded.
+
+        Each archive is built, uploaded and unpacked before the next one is
+        built, so at most one is held in memory.
+        """
+        batches: list[list[str]] = [[]]
+        batch_size = 0
+        for path in paths:
+            (size, _mtime), _digest = self._hashes[path]
+            if batches[-1] and batch_size + size > _ARCHIVE_BYTES:
+                batches.append([])
+                batch_size = 0
+            batches[-1].append(path)
+            batch_size += size
+
+        root = shlex.quote(self.remote_root)
+        bytes_sent = 0
+        for batch in batches:
+            archive = _remote_temp_path(".tar.gz")
+            content = self._archive(batch)
+            (response,) = self._backend.upload_files([(archive, content)])
+            if response.error is not None:
+                msg = f"Uploading {response.path} to the sandbox failed: {response.error}"
+                raise RuntimeError(msg)
+            bytes_sent += len(content)
+            del content
+            response = self._backend.execute(
+                f"mkdir -p {root} && tar -xzf {archive} -C {root} --no-same-owner; "
+                f"status=$?; rm -f {archive}; exit $status"
+            )
+            if response.exit_code != 0:
+                msg = f"Unpacking files in the sandbox failed: {response.output.strip()}"
+                raise RuntimeError(msg)
+        return bytes_sent
+
+    def _archive(self, paths: list[str]) -> bytes:
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz", compresslevel=6) as tar:
+            for path in paths:
+                try:
+                    info = tar.gettarinfo(self.local_root / path, arcname=path)
+                    info.uid = info.gid = 0
+                    info.uname = info.gname = ""
+                    if info.isreg():
+                        with (self.local_root / path).open("rb") as f:
+                            tar.addfile(info, f)
+                    else:
+                        tar.addfile(info)
+                except OSError:
+                    # Removed since the scan; the next push deletes it remotely
+                    continue
+        return buffer.getvalue()
+
+    def _delete(self, paths: list[str]) -> None:
+        commands = []
+        command = ""
+        for path in paths:
+            argument = " " + shlex.quote(path)
+            if command and len(command) + len(argument) > _DELETE_COMMAND_BYTES:
+                commands.append(command)
+                command = ""
+            command = command or f"cd {shlex.quote(self.remote_root)} && rm -f --"
+            command += argument
+        commands.append(command)
+        for command in commands:
+            response = self._backend.execute(command)
+            if response.exit_code != 0:
+                msg = f"Removing deleted files in the sandbox failed: {response.output.strip()}"
+                raise RuntimeError(msg)
+
+
+__all__ = [
+    "GitignoreMatcher",
+    "SyncResult",
+    "WorkspaceSync",
+    "list_workspace_files",
+]
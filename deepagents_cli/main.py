@@ -19,13 +19,18 @@ from deepagents_cli.config import (
     settings,
 )
 from deepagents_cli.execution import execute_task
+from deepagents_cli.headless import run_headless, setup_run_parser
 from deepagents_cli.input import create_prompt_session
+from deepagents_cli.integrations.readiness import STARTUP_LOG_NAME, StartupMetrics
 from deepagents_cli.integrations.sandbox_factory import (
     create_sandbox,
     get_default_working_dir,
 )
+from deepagents_cli.integrations.sandbox_pool import SandboxPool
+from deepagents_cli.integrations.workspace_sync import WorkspaceSync
 from deepagents_cli.skills import execute_skills_command, setup_skills_parser
 from deepagents_cli.tools import fetch_url, http_request, web_search
+from deepagents_cli.tracing import SessionTracer, resolve_trace_path
 from deepagents_cli.ui import TokenTracker, show_help
 
 
@@ -70,6 +75,15 @@ def check_cli_dependencies() -> None:
         sys.exit(1)
 
 
+def _positive_int(value: str) -> int:
+    """Parse a command line integer that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        msg = f"must be at least 1, got {number}"
+        raise argparse.ArgumentTypeError(msg)
+    return number
+
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -96,6 +110,9 @@ def parse_args():
     # Skills command - setup delegated to skills module
     setup_skills_parser(subparsers)
 
+    # Headless run command - setup delegated to headless module
+    setup_run_parser(subparsers)
+
     # Default interactive mode
     parser.add_argument(
         "--agent",
@@ -121,11 +138,76 @@ def parse_args():
         "--sandbox-setup",
         help="Path to setup script to run in sandbox after creation",
     )
+    parser.add_argument(
+        "--sandbox-pool",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "Keep N sandboxes provisioned (setup script applied) in the background and "
+            "start sessions from one of them; they keep running until used, recycled "
+            "or drained with --drain-sandbox-pool"
+        ),
+    )
+    parser.add_argument(
+        "--drain-sandbox-pool",
+        action="store_true",
+        help="Terminate the warm sandboxes of the pool (only --sandbox's, if given) and exit",
+    )
+    parser.add_argument(
+        "--sandbox-sync",
+        action="store_true",
+        help=(
+            "Copy the current directory (respecting .gitignore) into the sandbox at "
+            "startup and send local changes before every turn"
+        ),
+    )
     parser.add_argument(
         "--no-splash",
         action="store_true",
         help="Disable the startup splash screen",
     )
+    parser.add_argument(
+        "--persistent-shell",
+        action="store_true",
+        help=(
+            "Run local shell commands in long-lived bash sessions (keeps cd and "
+            "exported variables between commands)"
+        ),
+    )
+    parser.add_argument(
+        "--shell-cache",
+        action="store_true",
+        help="Reuse recent results of read-only shell commands (git status, ls, cat, ...)",
+    )
+    parser.add_argument(
+        "--shell-concurrency",
+        type=_positive_int,
+        default=4,
+        metavar="N",
+        help="Run at most N shell commands at once when the agent issues several (default: 4)",
+    )
+    parser.add_argument(
+        "--cache-prompt",
+        action="store_true",
+        help=(
+            "Order the system prompt for provider prompt caching (static parts first, "
+            "memory last) and report cache reads and writes"
+        ),
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help=(
+            "Write a Chrome trace of per-turn latency to ~/.deepagents/traces/ "
+            "(also enabled by DEEPAGENTS_TRACE)"
+        ),
+    )
+    parser.add_argument(
+        "--trace-file",
+        metavar="PATH",
+        help="Write the latency trace to PATH (implies --trace)",
+    )
 
     return parser.parse_args()
 
@@ -263,11 +345,25 @@ async def simple_cli(
             console.print("\nGoodbye!", style=COLORS["primary"])
             break
 
+        if session_state.workspace_sync is not None:
+            await _push_workspace(session_state.workspace_sync)
+
         await execute_task(
             user_input, agent, assistant_id, session_state, token_tracker, backend=backend
         )
 
 
+async def _push_workspace(workspace_sync: WorkspaceSync) -> None:
+    """Send local project changes to the sandbox, reporting but not raising failures."""
+    try:
+        result = await asyncio.to_thread(workspace_sync.push)
+    except Exception as e:
+        console.print(f"[yellow]⚠ Workspace sync failed: {e}[/yellow]")
+        return
+    if result.changed:
+        console.print(f"[dim]Synced workspace: {result.describe()}[/dim]")
+
+
 async def _run_agent_session(
     model,
     assistant_id: str,
@@ -300,6 +396,10 @@ async def _run_agent_session(
         sandbox=sandbox_backend,
         sandbox_type=sandbox_type,
         auto_approve=session_state.auto_approve,
+        persistent_shell=session_state.persistent_shell,
+        cache_shell_results=session_state.shell_cache,
+        cache_prompt_layout=session_state.cache_prompt,
+        max_concurrent_shell_commands=session_state.shell_concurrency,
     )
 
     # Calculate baseline token count for accurate token tracking
@@ -328,6 +428,8 @@ async def main(
     sandbox_type: str = "none",
     sandbox_id: str | None = None,
     setup_script_path: str | None = None,
+    sandbox_sync: bool = False,
+    sandbox_pool: int = 0,
 ) -> None:
     """Main entry point with conditional sandbox support.
 
@@ -337,6 +439,9 @@ async def main(
         sandbox_type: Type of sandbox ("none", "modal", "runloop", "daytona")
         sandbox_id: Optional existing sandbox ID to reuse
         setup_script_path: Optional path to setup script to run in sandbox
+        sandbox_sync: Mirror the current directory into the sandbox's working
+            directory at startup and before every turn
+        sandbox_pool: Number of warm sandboxes to keep (0 disables the pool)
     """
     model = create_model()
 
@@ -345,10 +450,25 @@ async def main(
         # Try to create sandbox
         try:
             console.print()
+            startup = StartupMetrics(sandbox_type)
             with create_sandbox(
-                sandbox_type, sandbox_id=sandbox_id, setup_script_path=setup_script_path
+                sandbox_type,
+                sandbox_id=sandbox_id,
+                setup_script_path=setup_script_path,
+                pool=SandboxPool(sandbox_pool) if sandbox_pool > 0 else None,
+                startup=startup,
             ) as sandbox_backend:
+                console.print(f"[dim]Startup: {startup.describe()}[/dim]")
+                startup.record(
+                    settings.user_deepagents_dir / STARTUP_LOG_NAME, session_state.tracer
+                )
                 console.print(f"[yellow]⚡ Remote execution enabled ({sandbox_type})[/yellow]")
+                if sandbox_sync:
+                    session_state.workspace_sync = WorkspaceSync(
+                        sandbox_backend, Path.cwd(), get_default_working_dir(sandbox_type)
+                    )
+                    console.print("[dim]Syncing workspace into the sandbox...[/dim]")
+                    await _push_workspace(session_state.workspace_sync)
                 console.print()
 
                 await _run_agent_session(
@@ -407,9 +527,27 @@ def cli_main() -> None:
             reset_agent(args.agent, args.source_agent)
         elif args.command == "skills":
             execute_skills_command(args)
+        elif args.command == "run":
+            sys.exit(asyncio.run(run_headless(args)))
+        elif args.drain_sandbox_pool:
+            provider = None if args.sandbox == "none" else args.sandbox
+            drained = SandboxPool(0).drain(provider)
+            console.print(f"Drained {drained} warm sandbox(es) from the pool")
         else:
             # Create session state from args
-            session_state = SessionState(auto_approve=args.auto_approve, no_splash=args.no_splash)
+            session_state = SessionState(
+                auto_approve=args.auto_approve,
+                no_splash=args.no_splash,
+                persistent_shell=args.persistent_shell,
+                shell_cache=args.shell_cache,
+                cache_prompt=args.cache_prompt,
+                shell_concurrency=args.shell_concurrency,
+            )
+            trace_flag = args.trace_file or ("" if args.trace else None)
+            trace_path = resolve_trace_path(trace_flag, settings.user_deepagents_dir / "traces")
+            if trace_path is not None:
+                session_state.tracer = SessionTracer(trace_path)
+                console.print(f"[dim]Tracing turn latency to {trace_path}[/dim]")
 
             # API key validation happens in create_model()
             asyncio.run(
@@ -419,6 +557,8 @@ def cli_main() -> None:
                     args.sandbox,
                     args.sandbox_id,
                     args.sandbox_setup,
+                    sandbox_sync=args.sandbox_sync,
+                    sandbox_pool=args.sandbox_pool,
                 )
             )
     except KeyboardInterrupt:
@@ -0,0 +1,240 @@
+"""Incremental markdown rendering for streamed assistant text.
+
+Rendering a whole answer with ``rich.markdown.Markdown`` only once it is
+complete means long answers appear as one block at the end. ``MarkdownStream``
+instead commits each finished block (paragraph, closed code fence, heading,
+list item) to the terminal as soon as it is complete. Only the open tail block
+is kept in memory, and it is shown in a ``rich.live`` region until it closes.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.segment import Segment
+from rich.table import Table
+
+if TYPE_CHECKING:
+    from rich.console import Console, ConsoleOptions, RenderableType, RenderResult
+    from rich.text import Text
+
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_HEADING_RE = re.compile(r"^ {0,3}#{1,6}(\s|$)")
+_LIST_ITEM_RE = re.compile(r"^([*+-]|\d{1,9}[.)])(\s|$)")
+
+
+class _TrimmedMarkdown:
+    """Markdown block rendered without the blank lines rich puts around it."""
+
+    def __init__(self, markup: str, style: str) -> None:
+        self.markdown = Markdown(markup, style=style)
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        lines = console.render_lines(self.markdown, options, pad=False)
+
+        def is_blank(line: list[Segment]) -> bool:
+            return not "".join(segment.text for segment in line).strip()
+
+        start = 0
+        end = len(lines)
+        while start < end and is_blank(lines[start]):
+            start += 1
+        while end > start and is_blank(lines[end - 1]):
+            end -= 1
+        new_line = Segment.line()
+        for line in lines[start:end]:
+            yield from line
+            yield new_line
+
+
+class _TailView:
+    """Live renderable that formats the open tail block only when refreshed."""
+
+    def __init__(self, stream: MarkdownStream) -> None:
+        self.stream = stream
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        yield self.stream._decorate(_TrimmedMarkdown(self.stream.tail_text(), self.stream.style))
+
+
+class MarkdownStream:
+    """Render streamed markdown block by block.
+
+    Text is fed in arbitrary fragments. Complete lines are classified into
+    blocks; a block is printed once a later line proves it finished (a blank
+    line, a closing fence, a new list item or heading). The unfinished tail is
+    displayed in a transient live region on terminals.
+
+    Attributes:
+        prefix: Optional marker shown to the left of the next committed block,
+            e.g. the agent bullet at the start of a response.
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        *,
+        style: str = "",
+        refresh_per_second: float = 8,
+        use_live: bool | None = None,
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+            console: Console to render to.
+            style: Base style for rendered markdown.
+            refresh_per_second: Refresh rate of the live tail region.
+            use_live: Show the open tail block in a live region. Defaults to
+                whether the console is attached to a terminal.
+        """
+        self.console = console
+        self.style = style
+        self.prefix: Text | str | None = None
+        self._refresh_per_second = refresh_per_second
+        self._use_live = console.is_terminal if use_live is None else use_live
+        self._lines: list[str] = []
+        self._partial: list[str] = []
+        self._fence: str | None = None
+        self._block_kind = "paragraph"
+        self._last_kind: str | None = None
+        self._saw_blank = False
+        self._live: Live | None = None
+
+    @property
+    def has_pending(self) -> bool:
+        """Whether there is uncommitted text in the tail block."""
+        return bool(self._lines) or any(part.strip() for part in self._partial)
+
+    def tail_text(self) -> str:
+        """Return the markdown source of the open tail block."""
+        return "\n".join([*self._lines, "".join(self._partial)]).rstrip()
+
+    def feed(self, text: str) -> None:
+        """Consume the next fragment of assistant text.
+
+        Args:
+            text: Newly streamed text.
+        """
+        if not text:
+            return
+        start = 0
+        newline = text.find("\n")
+        while newline != -1:
+            self._partial.append(text[start:newline])
+            line = "".join(self._partial)
+            self._partial = []
+            self._process_line(line)
+            start = newline + 1
+            newline = text.find("\n", start)
+        if start < len(text):
+            self._partial.append(text[start:])
+        self._refresh_tail()
+
+    def finish(self) -> None:
+        """Commit the open tail block and close the live region."""
+        if self._partial:
+            self._lines.append("".join(self._partial))
+            self._partial = []
+        self._commit()
+        self._fence = None
+        self._stop_live()
+        self._last_kind = None
+        self._saw_blank = False
+
+    def _process_line(self, line: str) -> None:
+        stripped = line.strip()
+
+        if self._fence is not None:
+            self._lines.append(line)
+            if stripped.startswith(self._fence) and not stripped.strip(self._fence[0]):
+                self._fence = None
+                self._commit(kind="code")
+            return
+
+        fence = _FENCE_RE.match(line)
+        if fence:
+            self._commit()
+            self._lines.append(line)
+            self._fence = fence.group(1)
+            return
+
+        if not stripped:
+            self._commit()
+            self._saw_blank = True
+            return
+
+        if _HEADING_RE.match(line):
+            self._commit()
+            self._lines.append(line)
+            self._commit(kind="heading")
+            return
+
+        if _LIST_ITEM_RE.match(line):
+            # A new top-level item closes whatever block was open before it;
+            # indented lines (nested items, continuations) stay in the open item
+            self._commit()
+            self._lines.append(line)
+            self._block_kind = "list"
+            return
+
+        if not self._lines:
+            self._block_kind = "paragraph"
+        self._lines.append(line)
+
+    def _commit(self, kind: str | None = None) -> None:
+        if not self._lines:
+            return
+        block = "\n".join(self._lines).rstrip()
+        kind = kind or self._block_kind
+        self._lines = []
+        self._block_kind = "paragraph"
+        if not block.strip():
+            return
+
+        if self._live is not None and self.prefix is not None:
+            # The prefix must be printed outside the live region
+            self._stop_live()
+
+        separate = self._last_kind is not None and not (
+            self._last_kind == "list" and kind == "list" and not self._saw_blank
+        )
+        if separate:
+            self.console.print()
+        self.console.print(self._decorate(_TrimmedMarkdown(block, self.style)))
+        self.prefix = None
+        self._last_kind = kind
+        self._saw_blank = False
+
+    def _decorate(self, renderable: RenderableType) -> RenderableType:
+        if self.prefix is None:
+            return renderable
+        grid = Table.grid(padding=(0, 1))
+        grid.add_column(no_wrap=True)
+        grid.add_column(ratio=1)
+        grid.add_row(self.prefix, renderable)
+        return grid
+
+    def _refresh_tail(self) -> None:
+        if not self._use_live:
+            return
+        if not self.has_pending:
+            return
+        if self._live is None:
+            self._live = Live(
+                _TailView(self),
+                console=self.console,
+                refresh_per_second=self._refresh_per_second,
+                transient=True,
+            )
+            self._live.start()
+
+    def _stop_live(self) -> None:
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
+
+__all__ = ["MarkdownStream"]
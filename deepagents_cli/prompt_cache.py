@@ -0,0 +1,96 @@
+"""Memoization of system prompt fragments.
+
+Middleware that extends the system prompt runs on every model call, but its
+inputs (memory files, skills metadata, the base prompt) rarely change within a
+thread. ``PromptFragmentCache`` builds each fragment once per distinct input
+and then returns the very same string object. Besides skipping the repeated
+formatting, an unchanged prompt stays byte-identical from call to call, which
+keeps provider-side prefix caching effective.
+
+With the cache-aware prompt layout (``--cache-prompt``), the middleware also
+places the static parts of the system prompt ahead of the user-editable ones
+and, for Anthropic models, ends the static part with an explicit cache
+breakpoint (``CACHE_BREAKPOINT``), so editing memory does not invalidate the
+cached prefix.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+# Distinct inputs remembered per cache; older ones are rebuilt on demand
+DEFAULT_MAX_ENTRIES = 16
+
+# ``cache_control`` of a content block ending a cached prompt prefix
+CACHE_BREAKPOINT = {"type": "ephemeral"}
+
+
+def supports_cache_breakpoints(model: Any) -> bool:
+    """Whether ``model`` accepts explicit ``cache_control`` breakpoints (Anthropic)."""
+    try:
+        from langchain_anthropic import ChatAnthropic
+    except ImportError:
+        return False
+    return isinstance(model, ChatAnthropic)
+
+
+class PromptFragmentCache:
+    """Bounded least-recently-used cache of prompt fragments.
+
+    Keys are tuples of everything a fragment is built from. Strings hash
+    once per object, so keying on full memory or prompt text is cheap.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Fragments kept before the least recently used is dropped.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], str]) -> str:
+        """Return the fragment for ``key``, building it with ``build`` on a miss.
+
+        Args:
+            key: Everything the fragment depends on.
+            build: Builds the fragment.
+
+        Returns:
+            The fragment; the same object for as long as ``key`` stays cached.
+        """
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+                return fragment
+        fragment = build()
+        with self._lock:
+            # Another thread may have built it meanwhile; keep the first copy
+            fragment = self._entries.setdefault(key, fragment)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragment
+
+    def clear(self) -> None:
+        """Drop every cached fragment."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Number of cached fragments."""
+        return len(self._entries)
+
+
+__all__ = [
+    "CACHE_BREAKPOINT",
+    "DEFAULT_MAX_ENTRIES",
+    "PromptFragmentCache",
+    "supports_cache_breakpoints",
+]
@@ -0,0 +1,193 @@
+"""Terminal output offloading for streamed agent turns.
+
+Rich rendering is synchronous: printing a long markdown block or a large diff
+blocks whatever called it. When that caller is the ``agent.astream`` loop, the
+model stream is not read while the terminal is being written. ``RenderQueue``
+moves rendering onto a dedicated output task. The streaming loop only enqueues
+render operations; the output task drains them in batches and runs each batch
+in a worker thread, so the event loop keeps reading chunks in the meantime.
+
+Adjacent operations that supersede each other are coalesced while they wait:
+consecutive text fragments are joined into one feed and consecutive spinner
+updates collapse to the latest one. The backlog is bounded; producers call
+``throttle`` to wait for the output task when it falls too far behind.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+# Default number of pending operations before producers are throttled
+DEFAULT_MAX_BACKLOG = 256
+
+
+@dataclass
+class _RenderOp:
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    key: str | None = None
+    append: bool = False
+
+
+@dataclass
+class RenderStats:
+    """Counters describing how a render queue was used.
+
+    Attributes:
+        submitted: Operations handed to the queue.
+        coalesced: Operations merged into an already pending one.
+        batches: Batches drained by the output task.
+        max_backlog: Largest number of operations pending at once.
+        throttled: Times a producer had to wait for the output task.
+    """
+
+    submitted: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    max_backlog: int = 0
+    throttled: int = 0
+
+
+class RenderQueue:
+    """Bounded, coalescing queue of render operations with its own output task.
+
+    Operations run in submission order. Call ``flush`` before anything that
+    must not interleave with pending output (reading from the terminal, for
+    example), and ``aclose`` once the producer is done.
+    """
+
+    def __init__(self, *, max_backlog: int = DEFAULT_MAX_BACKLOG, offload: bool = True) -> None:
+        """Initialize the queue.
+
+        Args:
+            max_backlog: Pending operations at which ``throttle`` starts waiting.
+            offload: Run batches in a worker thread. If False, batches run on
+                the event loop (still decoupled from the producer, but cheaper
+                when rendering is trivial, e.g. with a quiet console).
+        """
+        self.max_backlog = max(1, max_backlog)
+        self.stats = RenderStats()
+        self._offload = offload
+        self._ops: deque[_RenderOp] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._room = asyncio.Event()
+        self._room.set()
+        self._task: asyncio.Task | None = None
+        self._error: BaseException | None = None
+
+    @property
+    def backlog(self) -> int:
+        """Number of operations waiting to be rendered."""
+        return len(self._ops)
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Queue ``fn(*args, **kwargs)``. Plain calls are never coalesced."""
+        self._push(_RenderOp(fn, args, kwargs))
+
+    def append(self, key: str, fn: Callable[[str], Any], text: str) -> None:
+        """Queue ``fn(text)``, joining text onto a directly preceding op with ``key``."""
+        last = self._ops[-1] if self._ops else None
+        if last is not None and last.key == key and last.append:
+            last.args = (last.args[0] + text,)
+            self._count_coalesced()
+            return
+        self._push(_RenderOp(fn, (text,), key=key, append=True))
+
+    def replace(self, key: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Queue ``fn(*args, **kwargs)``, superseding a directly preceding op with ``key``."""
+        last = self._ops[-1] if self._ops else None
+        if last is not None and last.key == key and not last.append:
+            last.fn, last.args, last.kwargs = fn, args, kwargs
+            self._count_coalesced()
+            return
+        self._push(_RenderOp(fn, args, kwargs, key=key))
+
+    async def throttle(self) -> None:
+        """Wait while the backlog is at its bound."""
+        if len(self._ops) < self.max_backlog:
+            return
+        self.stats.throttled += 1
+        self._room.clear()
+        await self._room.wait()
+
+    async def flush(self) -> None:
+        """Wait until every queued operation has been rendered.
+
+        Raises:
+            Exception: The first error raised by a render operation, if any.
+        """
+        if self._ops or not self._idle.is_set():
+            self._ensure_task()
+            await self._idle.wait()
+        self._raise_pending_error()
+
+    async def aclose(self) -> None:
+        """Render everything still queued and stop the output task."""
+        try:
+            await self.flush()
+        finally:
+            if self._task is not None:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+                self._task = None
+
+    def _push(self, op: _RenderOp) -> None:
+        self._ops.append(op)
+        self.stats.submitted += 1
+        self.stats.max_backlog = max(self.stats.max_backlog, len(self._ops))
+        self._idle.clear()
+        self._wakeup.set()
+        self._ensure_task()
+
+    def _count_coalesced(self) -> None:
+        self.stats.submitted += 1
+        self.stats.coalesced += 1
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._ops:
+                batch = list(self._ops)
+                self._ops.clear()
+                self._room.set()
+                self.stats.batches += 1
+                if self._offload:
+                    await asyncio.to_thread(self._render_batch, batch)
+                else:
+                    self._render_batch(batch)
+            self._idle.set()
+
+    def _render_batch(self, batch: list[_RenderOp]) -> None:
+        for op in batch:
+            try:
+                op.fn(*op.args, **op.kwargs)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+
+
+__all__ = [
+    "DEFAULT_MAX_BACKLOG",
+    "RenderQueue",
+    "RenderStats",
+]
@@ -2,14 +2,121 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import codecs
+import contextlib
 import os
 import subprocess
+import threading
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-from langchain.agents.middleware.types import AgentMiddleware, AgentState
-from langchain.tools import ToolRuntime, tool
+from langchain.agents.middleware.types import AgentMiddleware, AgentState, ToolCallRequest
+from langchain.tools import ToolRuntime
 from langchain_core.messages import ToolMessage
+from langchain_core.tools import StructuredTool
 from langchain_core.tools.base import ToolException
+from langgraph.runtime import Runtime
+from langgraph.types import Command
+
+from deepagents_cli.file_ops import NON_MUTATING_TOOLS
+from deepagents_cli.shell_cache import ShellResultCache
+from deepagents_cli.shell_output import OutputCapture
+from deepagents_cli.shell_session import ShellSessionPool, kill_process_group
+
+# Seconds to wait for a killed command's pipes to close
+_REAP_TIMEOUT = 5.0
+
+# Custom stream event carrying live output of a running command
+SHELL_OUTPUT_EVENT = "shell_output"
+
+# Live output is sent at most this often, and only its last characters
+_LIVE_OUTPUT_INTERVAL = 0.1
+_LIVE_OUTPUT_TAIL_CHARS = 4096
+
+
+class _LiveOutput:
+    """Forwards a command's output to the graph's custom stream as it runs.
+
+    Output is decoded incrementally and sent as ``SHELL_OUTPUT_EVENT`` events at
+    most every ``_LIVE_OUTPUT_INTERVAL`` seconds. Output held back by that limit
+    is sent by a timer once the interval has passed, so the last lines show up
+    even when the command then goes quiet. Only the tail of what accumulated in
+    between is kept, since the terminal shows just the last lines; the tool
+    result is unaffected.
+    """
+
+    def __init__(self, writer: Callable[[Any], None], tool_call_id: str | None) -> None:
+        self._writer = writer
+        self._tool_call_id = tool_call_id
+        self._decoders = {
+            name: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for name in ("stdout", "stderr")
+        }
+        self._pending = ""
+        self._last_sent = float("-inf")
+        self._timer: threading.Timer | None = None
+        # Output arrives on the reader thread (or event loop), the timer fires on its own
+        self._lock = threading.Lock()
+
+    def __call__(self, stream: str, data: bytes) -> None:
+        with self._lock:
+            self._pending = (self._pending + self._decoders[stream].decode(data))[
+                -_LIVE_OUTPUT_TAIL_CHARS:
+            ]
+            wait = self._last_sent + _LIVE_OUTPUT_INTERVAL - time.monotonic()
+            if wait <= 0:
+                self._send()
+            elif self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Send any output not sent yet."""
+        with self._lock:
+            self._send()
+
+    def close(self) -> None:
+        """Send the remaining output and stop the timer (the command finished)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._send()
+
+    def _send(self) -> None:
+        self._timer = None
+        if not self._pending:
+            return
+        self._writer(
+            {
+                "type": SHELL_OUTPUT_EVENT,
+                "tool_call_id": self._tool_call_id,
+                "text": self._pending,
+            }
+        )
+        self._pending = ""
+        self._last_sent = time.monotonic()
+
+
+async def _reap(process: asyncio.subprocess.Process) -> None:
+    """Wait for a killed process, discarding its remaining output.
+
+    ``Process.wait`` only returns once the pipes are closed, and a full pipe
+    buffer pauses reading, so the leftover output has to be drained.
+    """
+
+    async def drain(stream: asyncio.StreamReader | None) -> None:
+        while stream is not None and await stream.read(65536):
+            pass
+
+    with contextlib.suppress(TimeoutError):
+        await asyncio.wait_for(
+            asyncio.gather(drain(process.stdout), drain(process.stderr), process.wait()),
+            _REAP_TIMEOUT,
+        )
 
 
 class ShellMiddleware(AgentMiddleware[AgentState, Any]):
@@ -25,7 +132,11 @@ class ShellMiddleware(AgentMiddleware[AgentState, Any]):
         workspace_root: str,
         timeout: float = 120.0,
         max_output_bytes: int = 100_000,
+        hard_output_limit: int | None = None,
         env: dict[str, str] | None = None,
+        persistent_sessions: bool = False,
+        max_concurrent_commands: int = 4,
+        result_cache: ShellResultCache | None = None,
     ) -> None:
         """Initialize an instance of `ShellMiddleware`.
 
@@ -34,26 +145,59 @@ class ShellMiddleware(AgentMiddleware[AgentState, Any]):
             timeout: Maximum time in seconds to wait for command completion.
                 Defaults to 120 seconds.
             max_output_bytes: Maximum number of bytes to capture from command output.
+                Longer output keeps its beginning and end with the middle omitted.
                 Defaults to 100,000 bytes.
+            hard_output_limit: Kill the command once it has printed more than this many
+                bytes. Defaults to 100 times `max_output_bytes`.
             env: Environment variables to pass to the subprocess. If None,
                 uses the current process's environment. Defaults to None.
+            persistent_sessions: Run commands in long-lived bash sessions instead of
+                a fresh shell per command. Saves the shell start-up on every call and
+                keeps the working directory and exported variables between commands.
+                Defaults to False.
+            max_concurrent_commands: Maximum number of commands running at once when
+                the agent issues several shell calls in one turn; applies to sync and
+                async calls alike. Defaults to 4.
+            result_cache: Cache answering repeated read-only commands (see
+                `ShellResultCache`). Ignored with persistent sessions, whose working
+                directory is not known. Defaults to None (no caching).
         """
         super().__init__()
         self._timeout = timeout
         self._max_output_bytes = max_output_bytes
+        self._hard_output_limit = (
+            hard_output_limit if hard_output_limit is not None else max_output_bytes * 100
+        )
         self._tool_name = "shell"
         self._env = env if env is not None else os.environ.copy()
         self._workspace_root = workspace_root
+        # Sync calls run on worker threads, async calls on the event loop; a
+        # waiter must never hold an executor thread the running commands need
+        self._concurrency = threading.BoundedSemaphore(max_concurrent_commands)
+        self._async_concurrency = asyncio.Semaphore(max_concurrent_commands)
+        self._sessions: ShellSessionPool | None = None
+        if persistent_sessions:
+            self._sessions = ShellSessionPool(workspace_root, self._env)
+            atexit.register(self._sessions.close)
+        self._result_cache = None if persistent_sessions else result_cache
 
         # Build description with working directory information
+        if persistent_sessions:
+            environment = (
+                "Commands run in a persistent shell session, so directory changes and "
+                "exported variables carry over to later commands."
+            )
+        else:
+            environment = (
+                "Each command runs in a fresh shell environment with the current "
+                "process's environment variables."
+            )
         description = (
             f"Execute a shell command directly on the host. Commands will run in "
-            f"the working directory: {workspace_root}. Each command runs in a fresh shell "
-            f"environment with the current process's environment variables. Commands may "
+            f"the working directory: {workspace_root}. {environment} Commands may "
             f"be truncated if they exceed the configured timeout or output limits."
         )
 
-        @tool(self._tool_name, description=description)
         def shell_tool(
             command: str,
             runtime: ToolRuntime[None, AgentState],
@@ -64,9 +208,30 @@ class ShellMiddleware(AgentMiddleware[AgentState, Any]):
                 command: The shell command to execute.
                 runtime: The tool runtime context.
             """
-            return self._run_shell_command(command, tool_call_id=runtime.tool_call_id)
+            return self._run_shell_command(
+                command, tool_call_id=runtime.tool_call_id, stream_writer=runtime.stream_writer
+            )
+
+        async def ashell_tool(
+            command: str,
+            runtime: ToolRuntime[None, AgentState],
+        ) -> ToolMessage | str:
+            """Execute a shell command.
+
+            Args:
+                command: The shell command to execute.
+                runtime: The tool runtime context.
+            """
+            return await self._arun_shell_command(
+                command, tool_call_id=runtime.tool_call_id, stream_writer=runtime.stream_writer
+            )
 
-        self._shell_tool = shell_tool
+        self._shell_tool = StructuredTool.from_function(
+            func=shell_tool,
+            coroutine=ashell_tool,
+            name=self._tool_name,
+            description=description,
+        )
         self.tools = [self._shell_tool]
 
     def _run_shell_command(
@@ -74,12 +239,15 @@ class ShellMiddleware(AgentMiddleware[AgentState, Any]):
         command: str,
         *,
         tool_call_id: str | None,
+        stream_writer: Callable[[Any], None] | None = None,
     ) -> ToolMessage | str:
         """Execute a shell command and return the result.
 
         Args:
             command: The shell command to execute.
             tool_call_id: The tool call ID for creating a ToolMessage.
+            stream_writer: Graph stream writer that receives the command's
+                output live as ``SHELL_OUTPUT_EVENT`` events.
 
         Returns:
             A ToolMessage with the command output or an error message.
@@ -88,51 +256,365 @@ class ShellMiddleware(AgentMiddleware[AgentState, Any]):
             msg = "Shell tool expects a non-empty command string."
             raise ToolException(msg)
 
+        cached = self._cached_result(command, tool_call_id)
+        if cached is not None:
+            return cached
+        message = self._execute(command, tool_call_id, stream_writer)
+        self._cache_result(command, message)
+        return message
+
+    def _execute(
+        self,
+        command: str,
+        tool_call_id: str | None,
+        stream_writer: Callable[[Any], None] | None,
+    ) -> ToolMessage:
+        with self._concurrency:
+            return self._execute_slot(command, tool_call_id, stream_writer)
+
+    def _execute_slot(
+        self,
+        command: str,
+        tool_call_id: str | None,
+        stream_writer: Callable[[Any], None] | None,
+    ) -> ToolMessage:
+        output, live = self._new_capture(tool_call_id, stream_writer)
         try:
-            result = subprocess.run(
-                command,
-                check=False,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=self._timeout,
-                env=self._env,
-                cwd=self._workspace_root,
+            if self._sessions is not None:
+                result = self._sessions.run(command, self._timeout, output)
+                return self._build_message(
+                    output,
+                    result.returncode,
+                    tool_call_id=tool_call_id,
+                    timed_out=result.timed_out,
+                    limit_exceeded=result.limit_exceeded,
+                    session_lost=result.session_lost,
+                )
+            returncode, timed_out, limit_exceeded = self._run_subprocess(command, output)
+            return self._build_message(
+                output,
+                returncode,
+                tool_call_id=tool_call_id,
+                timed_out=timed_out,
+                limit_exceeded=limit_exceeded,
             )
+        finally:
+            if live is not None:
+                live.close()
 
-            # Combine stdout and stderr
-            output_parts = []
-            if result.stdout:
-                output_parts.append(result.stdout)
-            if result.stderr:
-                stderr_lines = result.stderr.strip().split("\n")
-                for line in stderr_lines:
-                    output_parts.append(f"[stderr] {line}")
-
-            output = "\n".join(output_parts) if output_parts else "<no output>"
-
-            # Truncate output if needed
-            if len(output) > self._max_output_bytes:
-                output = output[: self._max_output_bytes]
-                output += f"\n\n... Output truncated at {self._max_output_bytes} bytes."
-
-            # Add exit code info if non-zero
-            if result.returncode != 0:
-                output = f"{output.rstrip()}\n\nExit code: {result.returncode}"
-                status = "error"
-            else:
-                status = "success"
+    async def _arun_shell_command(
+        self,
+        command: str,
+        *,
+        tool_call_id: str | None,
+        stream_writer: Callable[[Any], None] | None = None,
+    ) -> ToolMessage | str:
+        """Execute a shell command without blocking the event loop.
+
+        At most ``max_concurrent_commands`` commands run at once. Cancelling the
+        call (Ctrl+C during the turn) kills the command.
 
-        except subprocess.TimeoutExpired:
-            output = f"Error: Command timed out after {self._timeout:.1f} seconds."
+        Args:
+            command: The shell command to execute.
+            tool_call_id: The tool call ID for creating a ToolMessage.
+            stream_writer: Graph stream writer that receives the command's
+                output live as ``SHELL_OUTPUT_EVENT`` events.
+
+        Returns:
+            A ToolMessage with the command output or an error message.
+        """
+        if not command or not isinstance(command, str):
+            msg = "Shell tool expects a non-empty command string."
+            raise ToolException(msg)
+
+        cached = self._cached_result(command, tool_call_id)
+        if cached is not None:
+            return cached
+        message = await self._aexecute(command, tool_call_id, stream_writer)
+        self._cache_result(command, message)
+        return message
+
+    async def _aexecute(
+        self,
+        command: str,
+        tool_call_id: str | None,
+        stream_writer: Callable[[Any], None] | None,
+    ) -> ToolMessage:
+        async with self._async_concurrency:
+            output, live = self._new_capture(tool_call_id, stream_writer)
+            try:
+                if self._sessions is not None:
+                    # Sessions are driven by blocking reads; run them on a thread and
+                    # kill the session if the call is cancelled
+                    run = asyncio.ensure_future(
+                        asyncio.to_thread(self._sessions.run, command, self._timeout, output)
+                    )
+                    try:
+                        result = await asyncio.shield(run)
+                    except asyncio.CancelledError:
+                        self._sessions.interrupt(output)
+                        raise
+                    return self._build_message(
+                        output,
+                        result.returncode,
+                        tool_call_id=tool_call_id,
+                        timed_out=result.timed_out,
+                        limit_exceeded=result.limit_exceeded,
+                        session_lost=result.session_lost,
+                    )
+                returncode, timed_out, limit_exceeded = await self._arun_subprocess(command, output)
+                return self._build_message(
+                    output,
+                    returncode,
+                    tool_call_id=tool_call_id,
+                    timed_out=timed_out,
+                    limit_exceeded=limit_exceeded,
+                )
+            finally:
+                if live is not None:
+                    live.close()
+
+    def _cached_result(self, command: str, tool_call_id: str | None) -> ToolMessage | None:
+        """Look a command up in the result cache.
+
+        Returns:
+            The cached tool message, if there is a fresh one. Running a command
+            that is not cacheable may change the workspace, so the cache is
+            cleared.
+        """
+        if self._result_cache is None:
+            return None
+        key = self._result_cache.key(command, self._workspace_root)
+        if key is None:
+            self._result_cache.clear()
+            return None
+        cached = self._result_cache.get(key)
+        if cached is None:
+            return None
+        return ToolMessage(
+            content=f"(cached, {cached.age:.0f}s old)\n{cached.content}",
+            tool_call_id=tool_call_id,
+            name=self._tool_name,
+            status=cached.status,
+        )
+
+    def _cache_result(self, command: str, message: ToolMessage) -> None:
+        """Remember a successful result of a cacheable command.
+
+        The key is taken after the run: read-only commands may still touch the
+        fingerprinted files (``git status`` refreshes the index).
+        """
+        if self._result_cache is None or message.status != "success":
+            return
+        key = self._result_cache.key(command, self._workspace_root)
+        if key is not None:
+            self._result_cache.put(key, message.content, message.status)
+
+    def before_agent(self, state: AgentState, runtime: Runtime) -> None:  # noqa: ARG002
+        """Clear the result cache at the start of each turn.
+
+        The user may have edited files between turns in ways the cache
+        fingerprint does not see (e.g. an in-place edit of a tracked file).
+
+        Args:
+            state: Current agent state.
+            runtime: Runtime context.
+        """
+        if self._result_cache is not None:
+            self._result_cache.clear()
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        """Clear the result cache after tools that may change the workspace.
+
+        Args:
+            request: The tool call being executed.
+            handler: The handler executing the tool call.
+
+        Returns:
+            The tool result from the handler.
+        """
+        try:
+            return handler(request)
+        finally:
+            self._invalidate_after(request)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        """(async) Clear the result cache after tools that may change the workspace.
+
+        Args:
+            request: The tool call being executed.
+            handler: The handler executing the tool call.
+
+        Returns:
+            The tool result from the handler.
+        """
+        try:
+            return await handler(request)
+        finally:
+            self._invalidate_after(request)
+
+    def _invalidate_after(self, request: ToolCallRequest) -> None:
+        name = request.tool_call.get("name")
+        # Shell commands manage the cache themselves
+        if (
+            self._result_cache is not None
+            and name != self._tool_name
+            and name not in NON_MUTATING_TOOLS
+        ):
+            self._result_cache.clear()
+
+    def _new_capture(
+        self, tool_call_id: str | None, stream_writer: Callable[[Any], None] | None
+    ) -> tuple[OutputCapture, _LiveOutput | None]:
+        """Create the output capture of one command, streaming live if possible."""
+        live = _LiveOutput(stream_writer, tool_call_id) if stream_writer is not None else None
+        output = OutputCapture(self._max_output_bytes, self._hard_output_limit, on_output=live)
+        return output, live
+
+    def _build_message(
+        self,
+        output: OutputCapture,
+        returncode: int | None,
+        *,
+        tool_call_id: str | None,
+        timed_out: bool = False,
+        limit_exceeded: bool = False,
+        session_lost: bool = False,
+    ) -> ToolMessage:
+        """Turn a finished (or stopped) command into the tool result.
+
+        Args:
+            output: Captured output of the command.
+            returncode: Exit code, or None if the command was stopped.
+            tool_call_id: The tool call ID for creating a ToolMessage.
+            timed_out: Whether the command hit the timeout.
+            limit_exceeded: Whether the command hit the hard output limit.
+            session_lost: Whether a persistent session ended during the command.
+
+        Returns:
+            A ToolMessage with the command output or an error message.
+        """
+        if timed_out:
+            content = f"Error: Command timed out after {self._timeout:.1f} seconds."
             status = "error"
+        else:
+            content, status = self._format_output(output, returncode)
+            if limit_exceeded:
+                content = (
+                    f"{content.rstrip()}\n\nError: Command stopped after printing more than "
+                    f"{self._hard_output_limit:,} bytes of output."
+                )
+                status = "error"
+        if session_lost:
+            content += "\n\nThe shell session ended and was reset."
 
         return ToolMessage(
-            content=output,
+            content=content,
             tool_call_id=tool_call_id,
             name=self._tool_name,
             status=status,
         )
 
+    def _run_subprocess(self, command: str, output: OutputCapture) -> tuple[int | None, bool, bool]:
+        """Run a command in a fresh shell, reading its output incrementally.
+
+        Args:
+            command: The shell command to execute.
+            output: Capture the output is read into.
+
+        Returns:
+            The exit code (None if the command was stopped), whether it timed
+            out, and whether it exceeded the hard output limit.
+        """
+        deadline = time.monotonic() + self._timeout
+        with subprocess.Popen(
+            command,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=self._env,
+            cwd=self._workspace_root,
+            start_new_session=True,
+        ) as process:
+            outcome = output.read(
+                {"stdout": process.stdout, "stderr": process.stderr}, self._timeout
+            )
+            if outcome == "done":
+                try:
+                    return process.wait(max(0.0, deadline - time.monotonic())), False, False
+                except subprocess.TimeoutExpired:
+                    outcome = "timeout"
+            kill_process_group(process.pid)
+            process.wait()
+        return None, outcome == "timeout", outcome == "limit"
+
+    async def _arun_subprocess(
+        self, command: str, output: OutputCapture
+    ) -> tuple[int | None, bool, bool]:
+        """Async counterpart of ``_run_subprocess``; cancellation kills the command."""
+        deadline = time.monotonic() + self._timeout
+        process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._env,
+            cwd=self._workspace_root,
+            start_new_session=True,
+        )
+        try:
+            outcome = await output.aread(
+                {"stdout": process.stdout, "stderr": process.stderr}, self._timeout
+            )
+            if outcome == "done":
+                try:
+                    returncode = await asyncio.wait_for(
+                        process.wait(), max(0.0, deadline - time.monotonic())
+                    )
+                except TimeoutError:
+                    outcome = "timeout"
+                else:
+                    return returncode, False, False
+        finally:
+            if process.returncode is None:
+                kill_process_group(process.pid)
+                await asyncio.shield(_reap(process))
+        return None, outcome == "timeout", outcome == "limit"
+
+    def _format_output(self, output: OutputCapture, returncode: int | None) -> tuple[str, str]:
+        """Combine command output into the tool result text and status.
+
+        Args:
+            output: Captured output of the command.
+            returncode: Exit code of the command, or None if it was stopped.
+
+        Returns:
+            The output text and the ToolMessage status.
+        """
+        stdout, stderr = output.texts()
+
+        # Combine stdout and stderr
+        output_parts = []
+        if stdout:
+            output_parts.append(stdout)
+        if stderr:
+            stderr_lines = stderr.strip().split("\n")
+            for line in stderr_lines:
+                output_parts.append(f"[stderr] {line}")
+
+        content = "\n".join(output_parts) if output_parts else "<no output>"
+
+        # Add exit code info if non-zero
+        if returncode is not None and returncode != 0:
+            return f"{content.rstrip()}\n\nExit code: {returncode}", "error"
+        return content, "success"
+
 
-__all__ = ["ShellMiddleware"]
+__all__ = ["SHELL_OUTPUT_EVENT", "ShellMiddleware"]
@@ -0,0 +1,187 @@
+"""Cache of shell results for read-only commands.
+
+Agents re-run the same inspection commands many times in a session
+(``git status``, ``ls -R``, ``cat pyproject.toml``). ``ShellResultCache``
+remembers the results of commands matching an allowlist of read-only patterns.
+Entries are keyed by the command, its working directory and a cheap workspace
+fingerprint: the stat of the working directory, of the paths named in the
+command and of the git index, HEAD and branch refs. They expire after a TTL and the least
+recently used entries are evicted.
+
+The fingerprint cannot see every change (e.g. an edit deep below a listed
+directory, or an in-place edit of a tracked file), so the shell middleware
+also clears the cache at the start of every turn and whenever a command or
+tool that may write to the workspace runs.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shlex
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+# Commands (full match) whose results may be cached by default
+DEFAULT_READ_ONLY_PATTERNS: tuple[str, ...] = (
+    r"git (status|diff|log|show|describe|rev-parse|ls-files)( .*)?",
+    # Only listing forms: any other argument creates, deletes or renames a branch
+    r"git branch( (-a|-r|-v|-vv|--all|--remotes|--verbose|--list|--show-current))*",
+    r"git remote( -v)?",
+    r"(ls|cat|head|wc|stat|file|tree|du|pwd)( .*)?",
+    r"(grep|rg)( .*)?",
+    r"kubectl (get|describe)( .*)?",
+)
+
+# Redirection, chaining, substitution and expansion make a command's effect
+# or result depend on more than its text and the fingerprinted paths
+_UNSAFE_CHARACTERS = re.compile(r"[;&|<>`$\n]")
+
+# Options that make an otherwise read-only command write a file or run another
+# program (``git diff --output=FILE``, ``git diff --ext-diff``, ``tree -o FILE``,
+# ``rg --pre CMD``)
+_WRITING_OPTIONS = re.compile(r"(^|\s)(--output|--ext-diff|--pre)(=|\s|$)|^tree\s(.*\s)?-o(\s|$)")
+
+Fingerprint = tuple[tuple[str, int, int, int] | None, ...]
+CacheKey = tuple[str, str, Fingerprint]
+
+
+@dataclass
+class CachedResult:
+    """A cached shell result.
+
+    Attributes:
+        content: Tool message content of the original run.
+        status: Tool message status of the original run.
+        age: Seconds since the original run.
+    """
+
+    content: str
+    status: str
+    age: float
+
+
+def _stat(path: Path) -> tuple[str, int, int, int] | None:
+    try:
+        stat = path.stat()
+    except (OSError, ValueError):
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _find_git_dir(cwd: Path) -> Path | None:
+    for directory in (cwd, *cwd.parents):
+        candidate = directory / ".git"
+        if candidate.is_dir():
+            return candidate
+    return None
+
+
+class ShellResultCache:
+    """TTL + LRU cache of read-only shell command results.
+
+    Attributes:
+        ttl: Seconds an entry stays valid.
+        max_entries: Maximum number of entries kept.
+        hits: Number of lookups answered from the cache.
+        misses: Number of cacheable lookups that were not.
+    """
+
+    def __init__(
+        self,
+        patterns: Sequence[str] = DEFAULT_READ_ONLY_PATTERNS,
+        *,
+        ttl: float = 30.0,
+        max_entries: int = 128,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            patterns: Regular expressions; a command is cacheable if one of them
+                matches it entirely (after trimming whitespace).
+            ttl: Seconds an entry stays valid.
+            max_entries: Maximum number of entries kept.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._patterns = [re.compile(pattern) for pattern in patterns]
+        self._entries: OrderedDict[CacheKey, tuple[str, str, float]] = OrderedDict()
+        self._git_dirs: dict[Path, Path | None] = {}
+        # Sync tool calls run on worker threads
+        self._lock = threading.Lock()
+
+    def key(self, command: str, cwd: str) -> CacheKey | None:
+        """Build the cache key of a command, or None if it is not cacheable.
+
+        The key includes the current workspace fingerprint.
+        """
+        command = command.strip()
+        if _UNSAFE_CHARACTERS.search(command) or _WRITING_OPTIONS.search(command):
+            return None
+        if not any(pattern.fullmatch(command) for pattern in self._patterns):
+            return None
+        try:
+            arguments = shlex.split(command)[1:]
+        except ValueError:
+            return None
+        return (command, cwd, self._fingerprint(Path(cwd), arguments))
+
+    def get(self, key: CacheKey) -> CachedResult | None:
+        """Return the unexpired result stored under ``key``, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                content, status, created = entry
+                age = time.monotonic() - created
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return CachedResult(content, status, age)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: CacheKey, content: str, status: str) -> None:
+        """Store a result, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (content, status, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry (the workspace may have changed)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _fingerprint(self, cwd: Path, arguments: list[str]) -> Fingerprint:
+        if cwd not in self._git_dirs:
+            self._git_dirs[cwd] = _find_git_dir(cwd)
+        git_dir = self._git_dirs[cwd]
+        paths = [cwd]
+        if git_dir is not None:
+            paths += [
+                git_dir / "index",
+                git_dir / "HEAD",
+                git_dir / "packed-refs",
+                git_dir / "refs" / "heads",
+            ]
+        paths += [
+            cwd / os.path.expanduser(argument)
+            for argument in arguments
+            if argument and not argument.startswith("-")
+        ]
+        return tuple(_stat(path) for path in paths)
+
+
+__all__ = [
+    "DEFAULT_READ_ONLY_PATTERNS",
+    "CachedResult",
+    "ShellResultCache",
+]
@@ -0,0 +1,285 @@
+"""Bounded capture of shell command output.
+
+Commands can print far more than the model should see (a ``cat`` of a large
+log, a verbose build). Instead of buffering everything and truncating at the
+end, ``OutputCapture`` reads the child's pipes incrementally into
+``HeadTailBuffer`` objects that keep only the first and last bytes of each
+stream, so memory stays bounded by the output limit whatever the command
+prints. Past a hard byte cap the read stops so the caller can kill the child.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import re
+import selectors
+import time
+from collections.abc import Callable, Mapping
+from typing import IO, Literal
+
+_READ_SIZE = 65536
+
+# Bytes held back while scanning for an end marker that may span two reads
+_MARKER_WINDOW = 256
+
+ReadOutcome = Literal["done", "timeout", "limit"]
+
+
+class HeadTailBuffer:
+    """Byte buffer that keeps the head and tail of a stream.
+
+    The first half of ``limit`` bytes is kept as the head; after that only the
+    most recent bytes are kept, and the number of lines that fell out in
+    between is counted.
+
+    Attributes:
+        limit: Maximum number of bytes retained.
+        total: Number of bytes fed so far.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Initialize an empty buffer.
+
+        Args:
+            limit: Maximum number of bytes retained.
+        """
+        self.limit = limit
+        self.total = 0
+        self._head_limit = limit // 2
+        self._tail_limit = limit - self._head_limit
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._dropped_lines = 0
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any bytes were dropped."""
+        return self.total > self.limit
+
+    @property
+    def retained(self) -> int:
+        """Number of bytes currently held."""
+        return len(self._head) + len(self._tail)
+
+    def feed(self, data: bytes) -> None:
+        """Append bytes to the stream."""
+        self.total += len(data)
+        room = self._head_limit - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self._tail += data
+        excess = len(self._tail) - self._tail_limit
+        if excess > 0:
+            self._dropped_lines += self._tail.count(b"\n", 0, excess)
+            del self._tail[:excess]
+
+    def text(self, limit: int | None = None) -> str:
+        """Decode the retained output, marking the omitted middle.
+
+        Args:
+            limit: Render within fewer bytes than the buffer retains.
+
+        Returns:
+            The output, with a ``... N lines (M bytes) omitted ...`` line in
+            place of the dropped middle. The cut is moved to line boundaries.
+        """
+        limit = self.limit if limit is None else min(limit, self.limit)
+        if self.total <= limit:
+            return (self._head + self._tail).decode("utf-8", errors="replace")
+
+        head_size = limit // 2
+        tail_size = limit - head_size
+        head = self._head[:head_size]
+        tail = self._tail
+        gap_lines = self._dropped_lines + self._head.count(b"\n", head_size)
+        if len(tail) > tail_size:
+            gap_lines += tail.count(b"\n", 0, len(tail) - tail_size)
+            tail = tail[-tail_size:]
+
+        cut = head.rfind(b"\n")
+        if cut != -1:
+            head = head[: cut + 1]
+        start = tail.find(b"\n")
+        if start != -1 and start < len(tail) - 1:
+            gap_lines += 1
+            tail = tail[start + 1 :]
+
+        omitted = f"{self.total - len(head) - len(tail):,} bytes"
+        if gap_lines:
+            omitted = f"{gap_lines:,} lines ({omitted})"
+        separator = "" if not head or head.endswith(b"\n") else "\n"
+        return (
+            f"{head.decode('utf-8', errors='replace')}{separator}"
+            f"... {omitted} omitted ...\n"
+            f"{tail.decode('utf-8', errors='replace')}"
+        )
+
+
+class OutputCapture:
+    """Reads a child's stdout and stderr into bounded buffers.
+
+    Attributes:
+        stdout: Buffer for standard output.
+        stderr: Buffer for standard error.
+        limit: Output limit shared by both streams when rendered.
+        hard_limit: Total bytes after which reading stops with ``"limit"``.
+        end_matches: Matches of the end markers passed to ``read``, by stream.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        hard_limit: int | None = None,
+        *,
+        on_output: Callable[[str, bytes], None] | None = None,
+    ) -> None:
+        """Initialize empty buffers.
+
+        Args:
+            limit: Maximum number of output bytes kept (and rendered).
+            hard_limit: Stop reading once the streams together produced more
+                than this many bytes. None disables the cap.
+            on_output: Called with the stream name and every chunk of output as
+                it is read, before truncation (e.g. to show it live).
+        """
+        self.limit = limit
+        self.hard_limit = hard_limit
+        self.stdout = HeadTailBuffer(limit)
+        self.stderr = HeadTailBuffer(limit)
+        self.end_matches: dict[str, re.Match[bytes]] = {}
+        self._on_output = on_output
+
+    @property
+    def total(self) -> int:
+        """Number of bytes read from both streams."""
+        return self.stdout.total + self.stderr.total
+
+    def _feed(self, name: str, data: bytes) -> None:
+        if not data:
+            return
+        (self.stdout if name == "stdout" else self.stderr).feed(data)
+        if self._on_output is not None:
+            self._on_output(name, bytes(data))
+
+    def read(
+        self,
+        pipes: Mapping[str, IO[bytes]],
+        timeout: float,
+        end_markers: Mapping[str, re.Pattern[bytes]] | None = None,
+    ) -> ReadOutcome:
+        """Read the pipes until each hits EOF or its end marker.
+
+        Args:
+            pipes: Pipes to read, keyed ``"stdout"`` or ``"stderr"``.
+            timeout: Seconds to read before giving up.
+            end_markers: Optional pattern per stream. Reading that stream stops
+                at the first match; the match is stored in ``end_matches`` and
+                is not part of the captured output.
+
+        Returns:
+            ``"done"`` when every pipe finished, ``"timeout"`` or ``"limit"``
+            when reading stopped early. The caller owns killing the child.
+        """
+        end_markers = end_markers or {}
+        pending = {name: bytearray() for name in end_markers}
+        deadline = time.monotonic() + timeout
+
+        with selectors.DefaultSelector() as selector:
+            for name, pipe in pipes.items():
+                selector.register(pipe, selectors.EVENT_READ, name)
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return "timeout"
+                for key, _events in selector.select(remaining):
+                    name = key.data
+                    data = os.read(key.fileobj.fileno(), _READ_SIZE)
+                    marker = end_markers.get(name)
+                    if not data:
+                        if marker is not None:
+                            self._feed(name, pending[name])
+                        selector.unregister(key.fileobj)
+                        continue
+                    if marker is None:
+                        self._feed(name, data)
+                    else:
+                        held = pending[name]
+                        held += data
+                        match = marker.search(held)
+                        if match:
+                            self._feed(name, held[: match.start()])
+                            self.end_matches[name] = match
+                            selector.unregister(key.fileobj)
+                        elif len(held) > _MARKER_WINDOW:
+                            self._feed(name, held[:-_MARKER_WINDOW])
+                            del held[:-_MARKER_WINDOW]
+                    if self.hard_limit is not None and self.total > self.hard_limit:
+                        return "limit"
+        return "done"
+
+    async def aread(
+        self, streams: Mapping[str, asyncio.StreamReader], timeout: float
+    ) -> ReadOutcome:
+        """Read asyncio streams until EOF; the async counterpart of ``read``.
+
+        Args:
+            streams: Streams to read, keyed ``"stdout"`` or ``"stderr"``.
+            timeout: Seconds to read before giving up.
+
+        Returns:
+            ``"done"``, ``"timeout"`` or ``"limit"``, as for ``read``.
+        """
+        limit_reached = asyncio.Event()
+
+        async def pump(name: str, stream: asyncio.StreamReader) -> None:
+            while chunk := await stream.read(_READ_SIZE):
+                self._feed(name, chunk)
+                if self.hard_limit is not None and self.total > self.hard_limit:
+                    limit_reached.set()
+                    return
+
+        pumps = asyncio.gather(*(pump(name, stream) for name, stream in streams.items()))
+        limit_wait = asyncio.ensure_future(limit_reached.wait())
+        try:
+            done, _pending = await asyncio.wait(
+                {pumps, limit_wait}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            pumps.cancel()
+            limit_wait.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await pumps
+        if limit_reached.is_set():
+            return "limit"
+        if pumps in done:
+            pumps.result()
+            return "done"
+        return "timeout"
+
+    def texts(self) -> tuple[str, str]:
+        """Render stdout and stderr within ``limit`` bytes together.
+
+        When both streams are large, stderr gets at least a quarter of the
+        budget and stdout the rest.
+
+        Returns:
+            The rendered stdout and stderr.
+        """
+        stdout_size = self.stdout.retained
+        stderr_size = self.stderr.retained
+        if stdout_size + stderr_size <= self.limit:
+            return self.stdout.text(), self.stderr.text()
+        stderr_budget = min(stderr_size, max(self.limit // 4, self.limit - stdout_size))
+        return self.stdout.text(self.limit - stderr_budget), self.stderr.text(stderr_budget)
+
+
+__all__ = [
+    "HeadTailBuffer",
+    "OutputCapture",
+    "ReadOutcome",
+]
@@ -0,0 +1,237 @@
+"""Persistent bash sessions for the shell tool.
+
+Running every command with ``subprocess.run(..., shell=True)`` pays for a
+fork/exec and a shell start-up each time, and loses ``cd``, activated virtual
+environments and exported variables between commands. A ``ShellSession`` keeps
+one bash process alive and runs commands in it, framing each command with a
+unique sentinel that carries its exit code. ``ShellSessionPool`` hands out
+sessions for one workspace and replaces any session that timed out or died.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import shlex
+import signal
+import subprocess
+import threading
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from deepagents_cli.shell_output import OutputCapture
+
+_SENTINEL_PREFIX = "__DEEPAGENTS_CMD_DONE_"
+
+
+def kill_process_group(pid: int) -> None:
+    """SIGKILL a process started with ``start_new_session=True`` and its children."""
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(pid, signal.SIGKILL)
+
+
+@dataclass
+class ShellResult:
+    """Outcome of one command run in a shell session.
+
+    Attributes:
+        output: Captured stdout and stderr.
+        returncode: Exit code, or None if the command was stopped.
+        timed_out: Whether the command was stopped by the timeout.
+        limit_exceeded: Whether the command was stopped for printing more than
+            the capture's hard limit.
+        session_lost: Whether the session ended (timeout, output cap,
+            ``exit``, crash) and its state (working directory, variables) was
+            discarded.
+    """
+
+    output: OutputCapture
+    returncode: int | None
+    timed_out: bool = False
+    limit_exceeded: bool = False
+    session_lost: bool = False
+
+
+class ShellSession:
+    """One long-lived bash process that runs commands sequentially."""
+
+    def __init__(self, cwd: str, env: Mapping[str, str], *, shell: str = "/bin/bash") -> None:
+        """Start the shell process.
+
+        Args:
+            cwd: Initial working directory.
+            env: Environment of the shell.
+            shell: Path of the bash executable.
+        """
+        # Own process group, so a timeout can kill the command's children too
+        self._process = subprocess.Popen(
+            [shell, "--noprofile", "--norc"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=dict(env),
+            start_new_session=True,
+        )
+
+    @property
+    def alive(self) -> bool:
+        """Whether the shell process is still running."""
+        return self._process.poll() is None
+
+    def run(self, command: str, timeout: float, output: OutputCapture) -> ShellResult:
+        """Run a command and wait for its sentinel.
+
+        Args:
+            command: Shell command. It runs in the session's shell, so ``cd``
+                and ``export`` persist; its stdin is ``/dev/null``.
+            timeout: Seconds to wait before the session is killed.
+            output: Capture the command's output is read into.
+
+        Returns:
+            The command's output and exit code.
+        """
+        marker = f"{_SENTINEL_PREFIX}{uuid.uuid4().hex}"
+        script = (
+            f"eval {shlex.quote(command)} </dev/null\n"
+            f"printf '\\n{marker} %d\\n' $?\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        try:
+            self._process.stdin.write(script.encode("utf-8"))
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self.close()
+            return ShellResult(output, self._process.returncode, session_lost=True)
+
+        outcome = output.read(
+            {"stdout": self._process.stdout, "stderr": self._process.stderr},
+            timeout,
+            end_markers={
+                "stdout": re.compile(rb"\n" + marker.encode() + rb" (\d+)\n"),
+                "stderr": re.compile(rb"\n" + marker.encode() + rb"\n"),
+            },
+        )
+        if outcome != "done":
+            self.close()
+            return ShellResult(
+                output,
+                None,
+                timed_out=outcome == "timeout",
+                limit_exceeded=outcome == "limit",
+                session_lost=True,
+            )
+
+        end = output.end_matches.get("stdout")
+        if end is None or "stderr" not in output.end_matches:
+            # The shell exited (e.g. the command ran `exit`)
+            self.close()
+            return ShellResult(output, self._process.returncode, session_lost=True)
+        return ShellResult(output, int(end.group(1)))
+
+    def kill(self) -> None:
+        """Kill the shell and everything it started, without waiting.
+
+        Safe to call from another thread while ``run`` is reading: the read
+        sees end of file and ``run`` reports the session as lost.
+        """
+        if self._process.poll() is None:
+            kill_process_group(self._process.pid)
+
+    def close(self) -> None:
+        """Kill the shell and release its pipes."""
+        self.kill()
+        self._process.wait()
+        for stream in (self._process.stdin, self._process.stdout, self._process.stderr):
+            if stream is not None:
+                stream.close()
+
+
+class ShellSessionPool:
+    """Pool of persistent shell sessions for one workspace.
+
+    Sessions are reused most-recently-released first, so commands that run
+    one after another land in the same shell and see each other's ``cd`` and
+    ``export``. Concurrent commands get separate sessions (up to
+    ``max_sessions`` kept idle). A session that timed out or exited is
+    discarded and a fresh one is started on demand.
+    """
+
+    def __init__(
+        self,
+        workspace_root: str,
+        env: Mapping[str, str],
+        *,
+        max_sessions: int = 4,
+    ) -> None:
+        """Initialize the pool; sessions are started lazily.
+
+        Args:
+            workspace_root: Working directory of new sessions.
+            env: Environment of new sessions.
+            max_sessions: Maximum number of idle sessions kept alive.
+        """
+        self.workspace_root = workspace_root
+        self.max_sessions = max_sessions
+        self._env = dict(env)
+        self._idle: list[ShellSession] = []
+        self._running: dict[int, ShellSession] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def run(self, command: str, timeout: float, output: OutputCapture) -> ShellResult:
+        """Run a command in an idle (or new) session."""
+        session = self._acquire()
+        with self._lock:
+            self._running[id(output)] = session
+        try:
+            return session.run(command, timeout, output)
+        finally:
+            with self._lock:
+                del self._running[id(output)]
+            self._release(session)
+
+    def interrupt(self, output: OutputCapture) -> None:
+        """Kill the session running the command that reads into ``output``.
+
+        Used to cancel a command whose ``run`` is blocked in another thread;
+        that ``run`` returns with ``session_lost`` set.
+        """
+        with self._lock:
+            session = self._running.get(id(output))
+        if session is not None:
+            session.kill()
+
+    def close(self) -> None:
+        """Stop every idle session."""
+        with self._lock:
+            self._closed = True
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            session.close()
+
+    def _acquire(self) -> ShellSession:
+        with self._lock:
+            while self._idle:
+                session = self._idle.pop()
+                if session.alive:
+                    return session
+                session.close()
+        return ShellSession(self.workspace_root, self._env)
+
+    def _release(self, session: ShellSession) -> None:
+        with self._lock:
+            if session.alive and not self._closed and len(self._idle) < self.max_sessions:
+                self._idle.append(session)
+                return
+        session.close()
+
+
+__all__ = [
+    "ShellResult",
+    "ShellSession",
+    "ShellSessionPool",
+    "kill_process_group",
+]
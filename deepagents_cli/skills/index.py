@@ -0,0 +1,118 @@
+"""Persistent index of parsed skill metadata.
+
+Listing skills on every interaction would otherwise re-read and re-parse every
+SKILL.md. ``SkillsIndex`` remembers the name and description parsed from each
+SKILL.md together with the file's mtime and size, in a JSON file under
+``~/.deepagents/{agent}/``. A file is parsed again only when its mtime or size
+changed, so with an unchanged skills library a listing costs one ``stat`` per
+skill.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SKILLS_INDEX_FILE_NAME = "skills_index.json"
+
+# Bumped whenever parsing changes, so stale entries are parsed again
+_INDEX_VERSION = 2
+
+# mtime (ns) and size of a SKILL.md when it was parsed
+StatKey = tuple[int, int]
+
+
+class SkillsIndex:
+    """Name and description of each SKILL.md, keyed by path, mtime and size.
+
+    Entries of files that failed to parse are kept too (with no name), so
+    invalid skills are not re-read on every listing either.
+
+    Attributes:
+        path: Index file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the index; the file is loaded on first use.
+
+        Args:
+            path: Index file (e.g. ``~/.deepagents/{agent}/skills_index.json``).
+        """
+        self.path = path
+        # SKILL.md path -> [mtime_ns, size, name, description]
+        self._entries: dict[str, list] | None = None
+        self._dirty = False
+
+    def _load(self) -> dict[str, list]:
+        if self._entries is None:
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("version") != _INDEX_VERSION:
+                    msg = "index version changed"
+                    raise ValueError(msg)
+                self._entries = dict(data["skills"])
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, skill_md_path: str, key: StatKey) -> tuple[str | None, str | None] | None:
+        """Look up a SKILL.md parsed with the given mtime and size.
+
+        Args:
+            skill_md_path: Path of the SKILL.md.
+            key: Its current mtime (ns) and size.
+
+        Returns:
+            (name, description), (None, None) if the file did not parse, or
+            None if the file is not indexed or changed since.
+        """
+        entry = self._load().get(skill_md_path)
+        if entry is None or (entry[0], entry[1]) != key:
+            return None
+        return entry[2], entry[3]
+
+    def put(
+        self,
+        skill_md_path: str,
+        key: StatKey,
+        name: str | None,
+        description: str | None,
+    ) -> None:
+        """Record the result of parsing a SKILL.md (None for a file that did not parse)."""
+        self._load()[skill_md_path] = [key[0], key[1], name, description]
+        self._dirty = True
+
+    def retain(self, seen: set[str], roots: list[Path]) -> None:
+        """Drop the entries under ``roots`` whose SKILL.md was not seen in a listing."""
+        # With the separator, so /skills does not also match /skills-old
+        prefixes = tuple(str(root).rstrip(os.sep) + os.sep for root in roots)
+        entries = self._load()
+        removed = [path for path in entries if path.startswith(prefixes) and path not in seen]
+        for path in removed:
+            del entries[path]
+        self._dirty = self._dirty or bool(removed)
+
+    def save(self) -> None:
+        """Write the index if it changed since it was loaded or saved."""
+        if not self._dirty or self._entries is None:
+            return
+        payload = {"version": _INDEX_VERSION, "skills": self._entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temp.write_text(json.dumps(payload))
+            temp.replace(self.path)
+        except OSError:
+            # The index is only a cache; the next listing parses again
+            return
+        self._dirty = False
+
+
+__all__ = [
+    "SKILLS_INDEX_FILE_NAME",
+    "SkillsIndex",
+]
@@ -23,15 +23,51 @@ description: Structured approach to conducting thorough web research
 
 from __future__ import annotations
 
+import os
 import re
+import stat
+from pathlib import Path
 from typing import TYPE_CHECKING, TypedDict
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from deepagents_cli.skills.index import SkillsIndex
 
 # Maximum size for SKILL.md files (10MB)
 MAX_SKILL_FILE_SIZE = 10 * 1024 * 1024
 
+# Maximum bytes read looking for the end of the YAML frontmatter (64KB)
+MAX_FRONTMATTER_SIZE = 64 * 1024
+
+# Top-level "key: value" line of the frontmatter
+_KEY_PATTERN = re.compile(r"([A-Za-z_][\w-]*)[ \t]*:[ \t]*(.*)")
+
+# Block scalar header: "|" or ">", optional chomping and indentation indicators
+_BLOCK_HEADER_PATTERN = re.compile(r"[|>][+-]?[1-9]?[+-]?(?:[ \t]+#.*)?")
+
+# Start of a comment in a plain scalar
+_COMMENT_PATTERN = re.compile(r"(?:^|[ \t])#")
+
+# Escape sequences of double-quoted YAML scalars
+_DOUBLE_QUOTE_ESCAPES = {
+    "0": "\0",
+    "a": "\a",
+    "b": "\b",
+    "t": "\t",
+    "\t": "\t",
+    "n": "\n",
+    "v": "\v",
+    "f": "\f",
+    "r": "\r",
+    "e": "\x1b",
+    " ": " ",
+    '"': '"',
+    "/": "/",
+    "\\": "\\",
+    "N": "\x85",
+    "_": "\xa0",
+}
+_ESCAPE_PATTERN = re.compile(r"\\(x[0-9A-Fa-f]{2}|u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)")
+
 
 class SkillMetadata(TypedDict):
     """Metadata for a skill."""
@@ -89,6 +125,170 @@ def _is_safe_path(path: Path, base_dir: Path) -> bool:
         return False
 
 
+def _read_frontmatter(
+    skill_md_path: Path, max_bytes: int = MAX_FRONTMATTER_SIZE
+) -> list[str] | None:
+    """Read the YAML frontmatter of a SKILL.md line by line.
+
+    Reading stops at the closing ``---``, so the instructions after the
+    frontmatter are never read or decoded.
+
+    Args:
+        skill_md_path: Path to the SKILL.md file.
+        max_bytes: Most bytes read before giving up on finding the closing
+            ``---``.
+
+    Returns:
+        The frontmatter lines between the ``---`` delimiters, without line
+        endings, or None if the file does not start with frontmatter or it is
+        not closed within ``max_bytes``.
+
+    Raises:
+        OSError: The file could not be read.
+        UnicodeDecodeError: The frontmatter is not valid UTF-8.
+    """
+    with skill_md_path.open("rb") as f:
+        # Readline limits keep one huge line from being read whole
+        line = f.readline(max_bytes)
+        budget = max_bytes - len(line)
+        if line.removeprefix(b"\xef\xbb\xbf").rstrip() != b"---":
+            return None
+        lines: list[bytes] = []
+        while budget > 0:
+            line = f.readline(budget)
+            if not line:
+                return None
+            budget -= len(line)
+            line = line.rstrip(b"\r\n")
+            if line.rstrip() == b"---":
+                return [raw.decode("utf-8") for raw in lines]
+            lines.append(line)
+    return None
+
+
+def _parse_frontmatter(lines: list[str]) -> dict[str, str]:
+    """Parse the top-level scalar values of YAML frontmatter.
+
+    Supports plain values, single- and double-quoted values and literal
+    (``|``) and folded (``>``) block scalars, each of which may continue on
+    indented lines. Nested mappings and sequences are kept as raw text.
+
+    Args:
+        lines: Frontmatter lines without line endings.
+
+    Returns:
+        Mapping of keys to their (stripped) string values.
+    """
+    metadata: dict[str, str] = {}
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        # Keys start in the first column; anything else here is a comment,
+        # a blank line or content this parser does not understand
+        match = _KEY_PATTERN.fullmatch(line.rstrip())
+        if match is None or line.startswith("#"):
+            continue
+        key, value = match.group(1), (match.group(2) or "").strip()
+
+        # A value continues on the following indented (or blank) lines
+        continuation = []
+        while i < len(lines) and (not lines[i].strip() or lines[i][0] in " \t"):
+            continuation.append(lines[i])
+            i += 1
+
+        if _BLOCK_HEADER_PATTERN.fullmatch(value):
+            metadata[key] = _block_scalar(value, continuation)
+        elif value[:1] in {'"', "'"}:
+            metadata[key] = _quoted_scalar(value, continuation)
+        else:
+            metadata[key] = _plain_scalar(value, continuation)
+    return metadata
+
+
+def _fold(lines: list[str]) -> str:
+    """Join lines with spaces; each blank line becomes a newline instead."""
+    folded = ""
+    pending_newlines = 0
+    for line in lines:
+        if not line:
+            pending_newlines += 1
+            continue
+        if folded:
+            folded += "\n" * pending_newlines if pending_newlines else " "
+        folded += line
+        pending_newlines = 0
+    return folded
+
+
+def _block_scalar(header: str, lines: list[str]) -> str:
+    """Value of a literal (``|``) or folded (``>``) block scalar."""
+    indicator = next((char for char in header if char.isdigit()), None)
+    if indicator is not None:
+        indent = int(indicator)
+    else:
+        content = [line for line in lines if line.strip()]
+        indent = min((len(line) - len(line.lstrip()) for line in content), default=0)
+    body = [line[indent:] if line.strip() else "" for line in lines]
+    if header.startswith("|"):
+        return "\n".join(body).strip()
+
+    # Folded: lines join with spaces and each blank line becomes a newline,
+    # except around more-indented lines, which keep every line break
+    folded = ""
+    blank = 0
+    previous_indented = False
+    for line in body:
+        if not line:
+            blank += 1
+            continue
+        indented = line[:1] in {" ", "\t"}
+        if folded:
+            if indented or previous_indented:
+                folded += "\n" * (blank + 1)
+            else:
+                folded += "\n" * blank if blank else " "
+        folded += line
+        blank = 0
+        previous_indented = indented
+    return folded.strip()
+
+
+def _quoted_scalar(value: str, lines: list[str]) -> str:
+    """Value of a single- or double-quoted scalar, possibly spanning lines."""
+    quote = value[0]
+    text = _fold([value[1:].strip(), *(line.strip() for line in lines)])
+    if quote == "'":
+        # '' is an escaped quote; the first lone quote closes the scalar
+        end = text.replace("''", "\0\0").find("'")
+        text = text[:end] if end >= 0 else text
+        return text.replace("''", "'").strip()
+
+    closing = re.search(r'(?<!\\)(?:\\\\)*"', text)
+    text = text[: closing.end() - 1] if closing else text
+    return _ESCAPE_PATTERN.sub(_unescape, text).strip()
+
+
+def _unescape(match: re.Match[str]) -> str:
+    """Character of one double-quoted escape sequence (unknown ones stay as written)."""
+    escape = match.group(1)
+    if escape[0] in "xuU" and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    return _DOUBLE_QUOTE_ESCAPES.get(escape, match.group(0))
+
+
+def _plain_scalar(value: str, lines: list[str]) -> str:
+    """Value of an unquoted scalar; continuation lines fold into it."""
+    parts = [value]
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            continue
+        parts.append(stripped)
+    # "#" after whitespace starts a comment in plain scalars
+    return _fold([_COMMENT_PATTERN.split(part, maxsplit=1)[0].rstrip() for part in parts]).strip()
+
+
 def _parse_skill_metadata(skill_md_path: Path, source: str) -> SkillMetadata | None:
     """Parse YAML frontmatter from a SKILL.md file.
 
@@ -106,28 +306,16 @@ def _parse_skill_metadata(skill_md_path: Path, source: str) -> SkillMetadata | N
             # Silently skip files that are too large
             return None
 
-        content = skill_md_path.read_text(encoding="utf-8")
-
-        # Match YAML frontmatter between --- delimiters
-        frontmatter_pattern = r"^---\s*\n(.*?)\n---\s*\n"
-        match = re.match(frontmatter_pattern, content, re.DOTALL)
-
-        if not match:
+        # Only the frontmatter is read, not the instructions that follow it
+        frontmatter = _read_frontmatter(skill_md_path)
+        if frontmatter is None:
             return None
 
-        frontmatter = match.group(1)
-
-        # Parse key-value pairs from YAML (simple parsing, no nested structures)
-        metadata: dict[str, str] = {}
-        for line in frontmatter.split("\n"):
-            # Match "key: value" pattern
-            kv_match = re.match(r"^(\w+):\s*(.+)$", line.strip())
-            if kv_match:
-                key, value = kv_match.groups()
-                metadata[key] = value.strip()
+        # Parse top-level values from YAML (scalars, including multi-line ones)
+        metadata = _parse_frontmatter(frontmatter)
 
         # Validate required fields
-        if "name" not in metadata or "description" not in metadata:
+        if not metadata.get("name") or not metadata.get("description"):
             return None
 
         return SkillMetadata(
@@ -142,7 +330,12 @@ def _parse_skill_metadata(skill_md_path: Path, source: str) -> SkillMetadata | N
         return None
 
 
-def _list_skills(skills_dir: Path, source: str) -> list[SkillMetadata]:
+def _list_skills(
+    skills_dir: Path,
+    source: str,
+    index: SkillsIndex | None = None,
+    seen: set[str] | None = None,
+) -> list[SkillMetadata]:
     """List all skills from a single skills directory (internal helper).
 
     Scans the skills directory for subdirectories containing SKILL.md files,
@@ -158,6 +351,9 @@ def _list_skills(skills_dir: Path, source: str) -> list[SkillMetadata]:
     Args:
         skills_dir: Path to the skills directory.
         source: Source of the skills ('user' or 'project').
+        index: Optional index of parsed metadata; only SKILL.md files whose
+            mtime or size changed are parsed again.
+        seen: Optional set the paths of all SKILL.md files found are added to.
 
     Returns:
         List of skill metadata dictionaries with name, description, path, and source.
@@ -177,26 +373,55 @@ def _list_skills(skills_dir: Path, source: str) -> list[SkillMetadata]:
     skills: list[SkillMetadata] = []
 
     # Iterate through subdirectories
-    for skill_dir in skills_dir.iterdir():
-        # Security: Catch symlinks pointing outside the skills directory
-        if not _is_safe_path(skill_dir, resolved_base):
-            continue
-
-        if not skill_dir.is_dir():
+    try:
+        entries = list(os.scandir(skills_dir))
+    except OSError:
+        return []
+    for entry in entries:
+        skill_dir = Path(entry.path)
+        try:
+            # Security: Catch symlinks pointing outside the skills directory.
+            # Anything else listed here is inside it already.
+            if entry.is_symlink() and not _is_safe_path(skill_dir, resolved_base):
+                continue
+
+            if not entry.is_dir():
+                continue
+
+            # Look for SKILL.md file
+            skill_md_path = skill_dir / "SKILL.md"
+            skill_md_stat = skill_md_path.lstat()
+            if stat.S_ISLNK(skill_md_stat.st_mode):
+                # Security: Validate SKILL.md path is safe before reading
+                # This catches SKILL.md files that are symlinks pointing outside
+                if not _is_safe_path(skill_md_path, resolved_base):
+                    continue
+                skill_md_stat = skill_md_path.stat()
+        except OSError:
             continue
-
-        # Look for SKILL.md file
-        skill_md_path = skill_dir / "SKILL.md"
-        if not skill_md_path.exists():
+        if not stat.S_ISREG(skill_md_stat.st_mode):
             continue
 
-        # Security: Validate SKILL.md path is safe before reading
-        # This catches SKILL.md files that are symlinks pointing outside
-        if not _is_safe_path(skill_md_path, resolved_base):
+        path = str(skill_md_path)
+        if seen is not None:
+            seen.add(path)
+        key = (skill_md_stat.st_mtime_ns, skill_md_stat.st_size)
+        cached = index.get(path, key) if index is not None else None
+        if cached is not None:
+            name, description = cached
+            if name is not None and description is not None:
+                skills.append(
+                    SkillMetadata(name=name, description=description, path=path, source=source)
+                )
             continue
 
         # Parse metadata
         metadata = _parse_skill_metadata(skill_md_path, source=source)
+        if index is not None:
+            if metadata:
+                index.put(path, key, metadata["name"], metadata["description"])
+            else:
+                index.put(path, key, None, None)
         if metadata:
             skills.append(metadata)
 
@@ -204,7 +429,10 @@ def _list_skills(skills_dir: Path, source: str) -> list[SkillMetadata]:
 
 
 def list_skills(
-    *, user_skills_dir: Path | None = None, project_skills_dir: Path | None = None
+    *,
+    user_skills_dir: Path | None = None,
+    project_skills_dir: Path | None = None,
+    index: SkillsIndex | None = None,
 ) -> list[SkillMetadata]:
     """List skills from user and/or project directories.
 
@@ -214,24 +442,32 @@ def list_skills(
     Args:
         user_skills_dir: Path to the user-level skills directory.
         project_skills_dir: Path to the project-level skills directory.
+        index: Optional persistent index of parsed metadata. Only new or
+            changed SKILL.md files are parsed; the index is saved afterwards.
 
     Returns:
         Merged list of skill metadata from both sources, with project skills
         taking precedence over user skills when names conflict.
     """
     all_skills: dict[str, SkillMetadata] = {}
+    seen: set[str] = set()
 
     # Load user skills first (foundation)
     if user_skills_dir:
-        user_skills = _list_skills(user_skills_dir, source="user")
+        user_skills = _list_skills(user_skills_dir, source="user", index=index, seen=seen)
         for skill in user_skills:
             all_skills[skill["name"]] = skill
 
     # Load project skills second (override/augment)
     if project_skills_dir:
-        project_skills = _list_skills(project_skills_dir, source="project")
+        project_skills = _list_skills(project_skills_dir, source="project", index=index, seen=seen)
         for skill in project_skills:
             # Project skills override user skills with the same name
             all_skills[skill["name"]] = skill
 
+    if index is not None:
+        roots = [Path(d).expanduser() for d in (user_skills_dir, project_skills_dir) if d]
+        index.retain(seen, roots)
+        index.save()
+
     return list(all_skills.values())
@@ -35,6 +35,8 @@ from langchain.agents.middleware.types import (
 )
 from langgraph.runtime import Runtime
 
+from deepagents_cli.prompt_cache import PromptFragmentCache
+from deepagents_cli.skills.index import SkillsIndex
 from deepagents_cli.skills.load import SkillMetadata, list_skills
 
 
@@ -116,6 +118,7 @@ class SkillsMiddleware(AgentMiddleware):
         skills_dir: Path to the user-level skills directory (per-agent).
         assistant_id: The agent identifier for path references in prompts.
         project_skills_dir: Optional path to project-level skills directory.
+        index_path: Optional file for the persistent skills index.
     """
 
     state_schema = SkillsState
@@ -126,6 +129,7 @@ class SkillsMiddleware(AgentMiddleware):
         skills_dir: str | Path,
         assistant_id: str,
         project_skills_dir: str | Path | None = None,
+        index_path: str | Path | None = None,
     ) -> None:
         """Initialize the skills middleware.
 
@@ -133,15 +137,25 @@ class SkillsMiddleware(AgentMiddleware):
             skills_dir: Path to the user-level skills directory.
             assistant_id: The agent identifier.
             project_skills_dir: Optional path to the project-level skills directory.
+            index_path: Optional file for the persistent skills index
+                (e.g. ``~/.deepagents/{agent}/skills_index.json``). With an
+                index, only new or changed SKILL.md files are parsed.
         """
         self.skills_dir = Path(skills_dir).expanduser()
         self.assistant_id = assistant_id
         self.project_skills_dir = (
             Path(project_skills_dir).expanduser() if project_skills_dir else None
         )
+        self.index = SkillsIndex(Path(index_path).expanduser()) if index_path else None
         # Store display paths for prompts
         self.user_skills_display = f"~/.deepagents/{assistant_id}/skills"
         self.system_prompt_template = SKILLS_SYSTEM_PROMPT
+        # Skills sections by skills metadata, and full prompts by base prompt
+        # and skills metadata
+        self._section_cache = PromptFragmentCache()
+        self._prompt_cache = PromptFragmentCache()
+        self._last_skills: list[SkillMetadata] | None = None
+        self._last_skills_key: tuple[tuple[str, ...], ...] = ()
 
     def _format_skills_locations(self) -> str:
         """Format skills locations for display in system prompt."""
@@ -183,6 +197,57 @@ class SkillsMiddleware(AgentMiddleware):
 
         return "\n".join(lines)
 
+    def _format_skills_section(self, skills: list[SkillMetadata]) -> str:
+        """Format the skills documentation for the system prompt."""
+        return self.system_prompt_template.format(
+            skills_locations=self._format_skills_locations(),
+            skills_list=self._format_skills_list(skills),
+        )
+
+    def _skills_key(self, skills: list[SkillMetadata]) -> tuple[tuple[str, ...], ...]:
+        """Cache key of the skills metadata.
+
+        ``before_agent`` stores one list per invocation, so the key of the
+        list seen last is reused while the state holds the same list.
+        """
+        if skills is self._last_skills:
+            return self._last_skills_key
+        key = tuple(
+            (skill["name"], skill["description"], skill["path"], skill["source"])
+            for skill in skills
+        )
+        self._last_skills, self._last_skills_key = skills, key
+        return key
+
+    def _build_system_prompt(self, request: ModelRequest) -> str:
+        """Append the skills documentation to the request's system prompt.
+
+        Both the skills section and the combined prompt are memoized, so while
+        the skills and the base prompt are unchanged every call gets the same
+        string object.
+
+        Args:
+            request: The model request containing state and base system prompt.
+
+        Returns:
+            System prompt with the skills documentation appended.
+        """
+        # The state is guaranteed to be SkillsState due to state_schema
+        state = cast("SkillsState", request.state)
+        skills = state.get("skills_metadata", [])
+        skills_key = self._skills_key(skills)
+        skills_section = self._section_cache.get(
+            skills_key, lambda: self._format_skills_section(skills)
+        )
+
+        base_system_prompt = request.system_prompt
+        if not base_system_prompt:
+            return skills_section
+        return self._prompt_cache.get(
+            (base_system_prompt, skills_key),
+            lambda: base_system_prompt + "\n\n" + skills_section,
+        )
+
     def before_agent(self, state: SkillsState, runtime: Runtime) -> SkillsStateUpdate | None:
         """Load skills metadata before agent execution.
 
@@ -197,10 +262,12 @@ class SkillsMiddleware(AgentMiddleware):
             Updated state with skills_metadata populated.
         """
         # We re-load skills on every new interaction with the agent to capture
-        # any changes in the skills directories.
+        # any changes in the skills directories. With an index, unchanged
+        # SKILL.md files cost a stat instead of a read and parse.
         skills = list_skills(
             user_skills_dir=self.skills_dir,
             project_skills_dir=self.project_skills_dir,
+            index=self.index,
         )
         return SkillsStateUpdate(skills_metadata=skills)
 
@@ -220,24 +287,7 @@ class SkillsMiddleware(AgentMiddleware):
         Returns:
             The model response from the handler.
         """
-        # Get skills metadata from state
-        skills_metadata = request.state.get("skills_metadata", [])
-
-        # Format skills locations and list
-        skills_locations = self._format_skills_locations()
-        skills_list = self._format_skills_list(skills_metadata)
-
-        # Format the skills documentation
-        skills_section = self.system_prompt_template.format(
-            skills_locations=skills_locations,
-            skills_list=skills_list,
-        )
-
-        if request.system_prompt:
-            system_prompt = request.system_prompt + "\n\n" + skills_section
-        else:
-            system_prompt = skills_section
-
+        system_prompt = self._build_system_prompt(request)
         return handler(request.override(system_prompt=system_prompt))
 
     async def awrap_model_call(
@@ -254,24 +304,5 @@ class SkillsMiddleware(AgentMiddleware):
         Returns:
             The model response from the handler.
         """
-        # The state is guaranteed to be SkillsState due to state_schema
-        state = cast("SkillsState", request.state)
-        skills_metadata = state.get("skills_metadata", [])
-
-        # Format skills locations and list
-        skills_locations = self._format_skills_locations()
-        skills_list = self._format_skills_list(skills_metadata)
-
-        # Format the skills documentation
-        skills_section = self.system_prompt_template.format(
-            skills_locations=skills_locations,
-            skills_list=skills_list,
-        )
-
-        # Inject into system prompt
-        if request.system_prompt:
-            system_prompt = request.system_prompt + "\n\n" + skills_section
-        else:
-            system_prompt = skills_section
-
+        system_prompt = self._build_system_prompt(request)
         return await handler(request.override(system_prompt=system_prompt))
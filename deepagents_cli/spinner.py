@@ -0,0 +1,128 @@
+"""Rate-limited spinner state for streamed agent turns.
+
+During a turn the spinner is hidden and shown again around every text block
+and tool call, and its message changes with each tool. Applying each change
+immediately repaints the terminal every time, which is expensive over slow
+links such as SSH. ``CoalescedSpinner`` keeps the wanted state (visible or
+not, and the message) separately from what was last drawn, and reconciles the
+two at most ``max_repaints_per_second`` times per second. A hide followed by a
+show inside the same window costs nothing, and only the latest message of a
+burst is drawn.
+
+Hiding is never deferred: it must take effect before anything that cannot
+share the terminal with the spinner, such as the live markdown region or an
+approval prompt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.status import Status
+
+    from deepagents_cli.render_queue import RenderQueue
+
+# Upper bound on spinner repaints (state changes and animation frames)
+DEFAULT_MAX_REPAINTS_PER_SECOND = 8
+
+
+class CoalescedSpinner:
+    """Spinner state machine that batches changes into bounded repaints.
+
+    State changes are requested from the event loop; the resulting
+    ``start``/``stop``/``update`` calls on the underlying status are queued on
+    the turn's ``RenderQueue`` so they stay ordered with the rest of the output.
+
+    Attributes:
+        visible: Whether the spinner is wanted on screen.
+        repaints: Number of start/update repaints queued so far.
+    """
+
+    def __init__(
+        self,
+        status: Status,
+        output: RenderQueue,
+        *,
+        message: str | None = None,
+        max_repaints_per_second: float = DEFAULT_MAX_REPAINTS_PER_SECOND,
+    ) -> None:
+        """Initialize the spinner in the hidden state.
+
+        Args:
+            status: Status display to drive.
+            output: Queue the status calls are submitted to.
+            message: Message the status was created with.
+            max_repaints_per_second: Maximum rate of queued repaints.
+        """
+        self.visible = False
+        self.repaints = 0
+        self._status = status
+        self._output = output
+        self._min_interval = 1 / max_repaints_per_second if max_repaints_per_second > 0 else 0
+        self._message = message
+        self._drawn_visible = False
+        self._drawn_message = message
+        self._last_repaint = float("-inf")
+        self._timer: asyncio.TimerHandle | None = None
+
+    def show(self, message: str | None = None) -> None:
+        """Request the spinner on screen, optionally with a new message."""
+        self.visible = True
+        if message is not None:
+            self._message = message
+        self._schedule()
+
+    def update(self, message: str) -> None:
+        """Request a new message without changing visibility."""
+        self._message = message
+        if self.visible:
+            self._schedule()
+
+    def hide(self) -> None:
+        """Take the spinner off screen before the next queued output."""
+        self.visible = False
+        if self._drawn_visible:
+            self._output.call(self._status.stop)
+            self._drawn_visible = False
+
+    def close(self) -> None:
+        """Hide the spinner and drop any deferred repaint."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.hide()
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            return
+        delay = self._last_repaint + self._min_interval - time.monotonic()
+        if delay <= 0:
+            self._apply()
+        else:
+            self._timer = asyncio.get_running_loop().call_later(delay, self._apply)
+
+    def _apply(self) -> None:
+        self._timer = None
+        if not self.visible:
+            return
+        changed = False
+        if self._message != self._drawn_message:
+            self._output.replace("spinner-message", self._status.update, self._message)
+            self._drawn_message = self._message
+            changed = True
+        if not self._drawn_visible:
+            self._output.call(self._status.start)
+            self._drawn_visible = True
+            changed = True
+        if changed:
+            self.repaints += 1
+            self._last_repaint = time.monotonic()
+
+
+__all__ = [
+    "DEFAULT_MAX_REPAINTS_PER_SECOND",
+    "CoalescedSpinner",
+]
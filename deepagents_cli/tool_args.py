@@ -0,0 +1,196 @@
+"""Incremental parsing of streamed tool-call arguments.
+
+Models stream tool-call arguments as JSON fragments. Re-joining every fragment
+and running ``json.loads`` on the whole buffer after each chunk is quadratic in
+the argument size, which hurts for large ``write_file`` payloads. The parser in
+this module is resumable: each call to ``feed`` only scans the new text, and
+top-level fields become available as soon as their value is complete.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+# Characters that end a fast scan inside a JSON string
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+
+# Parser states while positioned at the top level of the object
+_START = "start"
+_KEY = "key"
+_COLON = "colon"
+_VALUE = "value"
+_SCALAR = "scalar"
+_COMMA = "comma"
+_DONE = "done"
+
+
+class ToolArgsParser:
+    """Resumable parser for a JSON object streamed in arbitrary fragments.
+
+    Only the top level of the object is tracked structurally. Each top-level
+    value is captured as raw text while it streams in and decoded once, when
+    it closes, so the total work is linear in the size of the arguments.
+
+    Attributes:
+        fields: Top-level key/value pairs decoded so far.
+        complete: True once the closing brace of the object was seen.
+        failed: True if the stream is not a well-formed JSON object. Callers
+            should fall back to parsing the full buffer in that case.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty parser."""
+        self.fields: dict[str, Any] = {}
+        self.complete = False
+        self.failed = False
+        self._state = _START
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._capturing = False
+        self._token_parts: list[str] = []
+        self._token_start: int | None = None
+        self._pending_key: str | None = None
+
+    def feed(self, text: str) -> None:
+        """Consume the next fragment of the argument stream.
+
+        Args:
+            text: New text appended to the stream since the previous call.
+        """
+        if self.complete or self.failed or not text:
+            return
+
+        self._token_start = 0 if self._capturing else None
+        i = 0
+        n = len(text)
+        while i < n and not self.failed:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_SPECIAL_RE.search(text, i)
+                if match is None:
+                    break
+                i = match.start()
+                if text[i] == "\\":
+                    self._escape = True
+                    i += 1
+                    continue
+                self._in_string = False
+                i += 1
+                if self._depth == 1:
+                    self._finish_token(text, i)
+                continue
+
+            char = text[i]
+
+            if self._depth > 1:
+                # Inside a nested object/array value - only track its extent
+                if char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    self._depth -= 1
+                    if self._depth == 1:
+                        self._finish_token(text, i + 1)
+                i += 1
+                continue
+
+            if self._state == _SCALAR:
+                if char in ",}" or char.isspace():
+                    # Re-process the terminator in the comma state
+                    self._finish_token(text, i)
+                    continue
+                i += 1
+                continue
+
+            if char.isspace():
+                i += 1
+                continue
+
+            if self._state == _START:
+                if char != "{":
+                    self.failed = True
+                    return
+                self._depth = 1
+                self._state = _KEY
+            elif self._state == _KEY:
+                if char == '"':
+                    self._start_token(i)
+                    self._in_string = True
+                elif char == "}" and not self.fields and self._pending_key is None:
+                    self._mark_complete()
+                    return
+                else:
+                    self.failed = True
+                    return
+            elif self._state == _COLON:
+                if char != ":":
+                    self.failed = True
+                    return
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                self._start_token(i)
+                if char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                else:
+                    self._state = _SCALAR
+            elif self._state == _COMMA:
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._mark_complete()
+                    return
+                else:
+                    self.failed = True
+                    return
+            i += 1
+
+        if self._capturing and not self.failed and self._token_start is not None:
+            self._token_parts.append(text[self._token_start :])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a decoded top-level field, or default if not available yet."""
+        return self.fields.get(key, default)
+
+    def _start_token(self, index: int) -> None:
+        self._capturing = True
+        self._token_start = index
+        self._token_parts = []
+
+    def _finish_token(self, text: str, end: int) -> None:
+        start = self._token_start or 0
+        self._token_parts.append(text[start:end])
+        raw = "".join(self._token_parts)
+        self._token_parts = []
+        self._token_start = None
+        self._capturing = False
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            self.failed = True
+            return
+
+        if self._state == _KEY:
+            self._pending_key = value
+            self._state = _COLON
+        else:
+            if self._pending_key is not None:
+                self.fields[self._pending_key] = value
+            self._pending_key = None
+            self._state = _COMMA
+
+    def _mark_complete(self) -> None:
+        self._depth = 0
+        self._state = _DONE
+        self.complete = True
+
+
+__all__ = ["ToolArgsParser"]
@@ -0,0 +1,215 @@
+"""Opt-in latency tracing for agent turns.
+
+When enabled with ``--trace`` (``--trace-file PATH``) or the
+``DEEPAGENTS_TRACE`` environment variable,
+``execute_task`` records where the time of each turn goes: waiting for the
+first model chunk, streaming each model message, running each tool, waiting on
+human-in-the-loop approval, and rendering to the terminal. Events are written
+in the Chrome trace-event array format, one file per session, which can be
+opened in ``chrome://tracing`` or https://ui.perfetto.dev. Each save appends
+the events recorded since the previous one; the format allows the closing
+``]`` to be missing, so the file is readable after every turn.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+TRACE_ENV_VAR = "DEEPAGENTS_TRACE"
+
+# Thread ids used to lay out tracks in the trace viewer
+_TRACKS = {
+    "turn": 1,
+    "model": 2,
+    "tools": 3,
+    "hitl": 4,
+    "render": 5,
+    "startup": 6,
+}
+
+
+class SessionTracer:
+    """Collect Chrome trace events for one CLI session.
+
+    A tracer created without a path is disabled: every method is a cheap
+    no-op, so callers never need to check whether tracing is on.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        """Initialize the tracer.
+
+        Args:
+            path: File the trace is written to. None disables tracing.
+        """
+        self.path = path
+        self.enabled = path is not None
+        self._origin = time.perf_counter()
+        # Events recorded since the last save
+        self._events: list[dict[str, Any]] = []
+        self._saved = False
+        self._next_async_id = 0
+        if self.enabled:
+            self._events.extend(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": track},
+                }
+                for track, tid in _TRACKS.items()
+            )
+
+    @staticmethod
+    def now() -> float:
+        """Return a timestamp suitable for ``complete`` and ``async_span``."""
+        return time.perf_counter()
+
+    def _us(self, timestamp: float) -> float:
+        return round((timestamp - self._origin) * 1_000_000, 1)
+
+    def complete(
+        self,
+        name: str,
+        track: str,
+        start: float,
+        end: float | None = None,
+        **args: Any,
+    ) -> None:
+        """Record a finished span on one of the session tracks.
+
+        Args:
+            name: Span name.
+            track: Track (``turn``, ``model``, ``tools``, ``hitl``, ``render``,
+                ``startup``).
+            start: Start timestamp from ``now()``.
+            end: End timestamp from ``now()``. Defaults to the current time.
+            **args: Extra data shown with the span.
+        """
+        if not self.enabled:
+            return
+        end = self.now() if end is None else end
+        self._events.append(
+            {
+                "name": name,
+                "cat": track,
+                "ph": "X",
+                "ts": self._us(start),
+                "dur": round((end - start) * 1_000_000, 1),
+                "pid": 1,
+                "tid": _TRACKS.get(track, 0),
+                "args": args,
+            }
+        )
+
+    def async_span(
+        self,
+        name: str,
+        track: str,
+        start: float,
+        end: float | None = None,
+        **args: Any,
+    ) -> None:
+        """Record a span that may overlap others on the same track (e.g. tools)."""
+        if not self.enabled:
+            return
+        end = self.now() if end is None else end
+        self._next_async_id += 1
+        common = {
+            "name": name,
+            "cat": track,
+            "id": self._next_async_id,
+            "pid": 1,
+            "tid": _TRACKS.get(track, 0),
+        }
+        self._events.append({**common, "ph": "b", "ts": self._us(start), "args": args})
+        self._events.append({**common, "ph": "e", "ts": self._us(end)})
+
+    def instant(self, name: str, track: str, **args: Any) -> None:
+        """Record a point-in-time event."""
+        if not self.enabled:
+            return
+        self._events.append(
+            {
+                "name": name,
+                "cat": track,
+                "ph": "i",
+                "s": "t",
+                "ts": self._us(self.now()),
+                "pid": 1,
+                "tid": _TRACKS.get(track, 0),
+                "args": args,
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str, track: str, **args: Any) -> Iterator[None]:
+        """Context manager recording the enclosed block as a span."""
+        if not self.enabled:
+            yield
+            return
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.complete(name, track, start, **args)
+
+    def save(self) -> None:
+        """Append the events recorded since the last save to the trace file.
+
+        The first save of the session starts the file (replacing an old one).
+        """
+        if not self.enabled or self.path is None or not self._events:
+            return
+        events = ",\n".join(json.dumps(event) for event in self._events)
+        if self._saved:
+            with self.path.open("a") as f:
+                f.write(",\n" + events)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("[\n" + events)
+            self._saved = True
+        self._events.clear()
+
+
+def resolve_trace_path(flag: str | None, traces_dir: Path) -> Path | None:
+    """Decide where (and whether) to write the session trace.
+
+    Args:
+        flag: None if tracing was not requested on the command line, "" for
+            the default location (``--trace``), or an explicit file path
+            (``--trace-file``).
+        traces_dir: Directory for default trace file names.
+
+    Returns:
+        Trace file path, or None if tracing is disabled.
+    """
+    value = flag
+    if value is None:
+        env_value = os.environ.get(TRACE_ENV_VAR, "").strip()
+        if not env_value or env_value.lower() in {"0", "false", "no", "off"}:
+            return None
+        value = "" if env_value.lower() in {"1", "true", "yes", "on"} else env_value
+
+    if value:
+        return Path(value).expanduser()
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return traces_dir / f"trace-{stamp}-{os.getpid()}.json"
+
+
+DISABLED_TRACER = SessionTracer(None)
+
+
+__all__ = [
+    "DISABLED_TRACER",
+    "TRACE_ENV_VAR",
+    "SessionTracer",
+    "resolve_trace_path",
+]
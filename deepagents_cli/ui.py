@@ -1,19 +1,33 @@
 """UI rendering and display utilities for the CLI."""
 
+import itertools
 import json
 import re
 import shutil
+from collections import deque
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 from rich import box
+from rich.console import Group, RenderableType
 from rich.markup import escape
 from rich.panel import Panel
 from rich.text import Text
 
 from .config import COLORS, COMMANDS, DEEP_AGENTS_ASCII, MAX_ARG_LENGTH, console
+from .diff_engine import DiffResult
 from .file_ops import FileOperationRecord
 
+# Diff lines shown after a completed file operation
+FILE_OP_DIFF_MAX_LINES = 100
+
+# Lines of a running shell command's output shown under the spinner
+LIVE_SHELL_OUTPUT_LINES = 8
+
+# Characters of an unfinished line kept for the live shell output panel
+_MAX_LIVE_LINE_CHARS = 1000
+
 
 def truncate_value(value: str, max_length: int = MAX_ARG_LENGTH) -> str:
     """Truncate a string value if it exceeds max_length."""
@@ -177,6 +191,11 @@ class TokenTracker:
         self.baseline_context = 0  # Baseline system context (system + agent.md + tools)
         self.current_context = 0  # Total context including messages
         self.last_output = 0
+        # Prompt cache tokens of the last turn and of the whole session
+        self.last_cache_read = 0
+        self.last_cache_write = 0
+        self.session_cache_read = 0
+        self.session_cache_write = 0
 
     def set_baseline(self, tokens: int) -> None:
         """Set the baseline context token count.
@@ -191,12 +210,34 @@ class TokenTracker:
         """Reset to baseline (for /clear command)."""
         self.current_context = self.baseline_context
         self.last_output = 0
+        self.last_cache_read = 0
+        self.last_cache_write = 0
+
+    def add(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        *,
+        cache_read: int = 0,
+        cache_write: int = 0,
+    ) -> None:
+        """Add tokens from a response.
 
-    def add(self, input_tokens: int, output_tokens: int) -> None:
-        """Add tokens from a response."""
+        Args:
+            input_tokens: Input tokens of the turn's last model call.
+            output_tokens: Output tokens of the turn's last model call.
+            cache_read: Input tokens read from the provider's prompt cache,
+                summed over the turn's model calls.
+            cache_write: Input tokens written to the prompt cache, summed over
+                the turn's model calls.
+        """
         # input_tokens IS the current context size (what was sent to the model)
         self.current_context = input_tokens
         self.last_output = output_tokens
+        self.last_cache_read = cache_read
+        self.last_cache_write = cache_write
+        self.session_cache_read += cache_read
+        self.session_cache_write += cache_write
 
     def display_last(self) -> None:
         """Display current context size after this turn."""
@@ -204,6 +245,11 @@ class TokenTracker:
             console.print(f"  Generated: {self.last_output:,} tokens", style="dim")
         if self.current_context:
             console.print(f"  Current context: {self.current_context:,} tokens", style="dim")
+        if self.last_cache_read or self.last_cache_write:
+            console.print(
+                f"  Prompt cache: {self.last_cache_read:,} read, {self.last_cache_write:,} written",
+                style="dim",
+            )
 
     def display_session(self) -> None:
         """Display current context size."""
@@ -231,6 +277,13 @@ class TokenTracker:
             )
 
         console.print(f"  Total: {self.current_context:,} tokens", style="bold " + COLORS["dim"])
+
+        if self.session_cache_read or self.session_cache_write:
+            console.print(
+                f"  Prompt cache (session): {self.session_cache_read:,} tokens read, "
+                f"{self.session_cache_write:,} written",
+                style=COLORS["dim"],
+            )
         console.print()
 
 
@@ -334,7 +387,7 @@ def render_diff(record: FileOperationRecord) -> None:
     """Render diff for a file operation."""
     if not record.diff:
         return
-    render_diff_block(record.diff, f"Diff {record.display_path}")
+    render_diff_block(record.diff, f"Diff {record.display_path}", max_lines=FILE_OP_DIFF_MAX_LINES)
 
 
 def _wrap_diff_line(
@@ -468,12 +521,71 @@ def format_diff_rich(diff_lines: list[str]) -> str:
     return "\n".join(formatted_lines)
 
 
-def render_diff_block(diff: str, title: str) -> None:
-    """Render a diff string with line numbers and colors."""
+def _diff_rows(diff: DiffResult) -> Iterator[tuple[str, str, int]]:
+    """Yield (marker, code, line number) for every line shown in the hunks."""
+    for hunk in diff.hunks:
+        for tag, i1, i2, j1, j2 in hunk.opcodes:
+            if tag == "equal":
+                for index in range(i1, i2):
+                    yield " ", diff.before[index], index + 1
+                continue
+            if tag in {"replace", "delete"}:
+                for index in range(i1, i2):
+                    yield "-", diff.before[index], index + 1
+            if tag in {"replace", "insert"}:
+                for index in range(j1, j2):
+                    yield "+", diff.after[index], index + 1
+
+
+def format_diff_result_rich(diff: DiffResult, max_lines: int | None = None) -> str:
+    """Format a structured diff with line numbers and colors.
+
+    Args:
+        diff: Diff to format
+        max_lines: Maximum number of diff lines shown (None for unlimited)
+
+    Returns:
+        Rich-formatted diff string with line numbers
+    """
+    if not diff.hunks:
+        return "[dim]No changes detected[/dim]"
+
+    term_width = shutil.get_terminal_size().columns
+    _tag, _i1, old_end, _j1, new_end = diff.hunks[-1].opcodes[-1]
+    width = max(3, len(str(max(old_end, new_end))))
+    colors = {"+": "white on dark_green", "-": "white on dark_red", " ": "dim"}
+
+    rows = _diff_rows(diff)
+    if max_lines is not None:
+        rows = itertools.islice(rows, max_lines + 1)
+    formatted_lines = []
+    for count, (marker, code, line_num) in enumerate(rows):
+        if max_lines is not None and count == max_lines:
+            formatted_lines.append("[dim]...[/dim]")
+            break
+        formatted_lines.extend(
+            _wrap_diff_line(code, marker, colors[marker], line_num, width, term_width)
+        )
+    return "\n".join(formatted_lines)
+
+
+def render_diff_block(diff: DiffResult | str, title: str, *, max_lines: int | None = None) -> None:
+    """Render a diff with line numbers and colors.
+
+    Args:
+        diff: Structured diff, or unified diff text
+        title: Heading printed above the diff
+        max_lines: Maximum number of diff lines shown (None for unlimited)
+    """
     try:
-        # Parse diff into lines and format with line numbers
-        diff_lines = diff.splitlines()
-        formatted_diff = format_diff_rich(diff_lines)
+        if isinstance(diff, DiffResult):
+            formatted_diff = format_diff_result_rich(diff, max_lines)
+        else:
+            # Parse diff into lines and format with line numbers
+            diff_lines = diff.splitlines()
+            if max_lines is not None and len(diff_lines) > max_lines:
+                diff_lines = [*diff_lines[: max_lines - 1], "..."]
+            formatted_diff = format_diff_rich(diff_lines)
 
         # Print with a simple header
         console.print()
@@ -484,10 +596,71 @@ def render_diff_block(diff: str, title: str) -> None:
         # Fallback to simple rendering if formatting fails
         console.print()
         console.print(f"[bold {COLORS['primary']}]{title}[/bold {COLORS['primary']}]")
-        console.print(diff)
+        console.print(diff.text(max_lines) if isinstance(diff, DiffResult) else diff)
         console.print()
 
 
+def _last_redraw(line: str) -> str:
+    """Keep the last state of a line redrawn with carriage returns (progress bars).
+
+    A trailing carriage return is kept so the next redraw still replaces the
+    line, and the result is capped at ``_MAX_LIVE_LINE_CHARS``.
+    """
+    state = line.rstrip("\r").rsplit("\r", 1)[-1]
+    if line.endswith("\r"):
+        state += "\r"
+    return state[-_MAX_LIVE_LINE_CHARS:]
+
+
+class ShellOutputTail:
+    """Last lines of a running shell command's output, for the live panel.
+
+    The panel is drawn under the spinner while the command runs and goes away
+    with the spinner message when the command finishes.
+    """
+
+    def __init__(self, max_lines: int = LIVE_SHELL_OUTPUT_LINES) -> None:
+        self.max_lines = max_lines
+        self.line_count = 0
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self._partial = ""
+
+    def feed(self, text: str) -> None:
+        """Add output text; only the last ``max_lines`` lines are kept."""
+        *complete, partial = text.split("\n")
+        if complete:
+            complete[0] = self._partial + complete[0]
+            self._lines.extend(complete)
+            self.line_count += len(complete)
+            self._partial = _last_redraw(partial)
+        else:
+            self._partial = _last_redraw(self._partial + partial)
+
+    def render(self, message: str) -> RenderableType:
+        """Build the spinner text: the status message above the output tail.
+
+        Args:
+            message: Spinner message markup (e.g. "Executing ...").
+        """
+        lines = [*self._lines, self._partial] if self._partial else list(self._lines)
+        body = Text(no_wrap=True, overflow="ellipsis", style="dim")
+        for index, line in enumerate(lines[-self.max_lines :]):
+            if index:
+                body.append("\n")
+            body.append_text(Text.from_ansi(_last_redraw(line).rstrip("\r")))
+        return Group(
+            Text.from_markup(message),
+            Panel(
+                body,
+                box=box.ROUNDED,
+                border_style="dim",
+                title=f"[dim]output ({self.line_count:,} lines)[/dim]",
+                title_align="left",
+                padding=(0, 1),
+            ),
+        )
+
+
 def show_interactive_help() -> None:
     """Show available commands during interactive session."""
     console.print()
@@ -545,6 +718,7 @@ def show_help() -> None:
     console.print("[bold]Usage:[/bold]", style=COLORS["primary"])
     console.print("  deepagents [OPTIONS]                           Start interactive session")
     console.print("  deepagents list                                List all available agents")
+    console.print("  deepagents run [PROMPT ...] [-f FILE] [-j N]   Run prompts headless (NDJSON)")
     console.print("  deepagents reset --agent AGENT                 Reset agent to default prompt")
     console.print(
         "  deepagents reset --agent AGENT --target SOURCE Reset agent to copy of another agent"
@@ -559,6 +733,15 @@ def show_help() -> None:
         "  --sandbox TYPE                Remote sandbox for execution (modal, runloop, daytona)"
     )
     console.print("  --sandbox-id ID               Reuse existing sandbox (skips creation/cleanup)")
+    console.print("  --sandbox-pool N              Keep N sandboxes warm for faster startup")
+    console.print("  --drain-sandbox-pool          Terminate the pool's warm sandboxes and exit")
+    console.print("  --sandbox-sync                Mirror the project into the sandbox each turn")
+    console.print("  --persistent-shell            Keep shell sessions alive between commands")
+    console.print("  --shell-cache                 Reuse recent results of read-only commands")
+    console.print("  --shell-concurrency N         Max shell commands running at once (default 4)")
+    console.print("  --cache-prompt                Lay out the system prompt for prompt caching")
+    console.print("  --trace                       Write a Chrome trace of per-turn latency")
+    console.print("  --trace-file PATH             Write the latency trace to PATH")
     console.print()
 
     console.print("[bold]Examples:[/bold]", style=COLORS["primary"])
@@ -588,6 +771,10 @@ def show_help() -> None:
     console.print(
         "  deepagents list                         # List all agents", style=COLORS["dim"]
     )
+    console.print(
+        "  deepagents run -f prompts.txt -j 8      # Run prompts concurrently, NDJSON on stdout",
+        style=COLORS["dim"],
+    )
     console.print(
         "  deepagents reset --agent mybot          # Reset mybot to default", style=COLORS["dim"]
     )